@@ -20,7 +20,9 @@ from Vintageous.vi.constants import MODE_VISUAL_LINE
 from Vintageous.vi.constants import MODE_SELECT
 from Vintageous.vi.constants import regions_transformer
 from Vintageous.vi.constants import regions_transformer_reversed
+from Vintageous.vi.constants import replace_sels
 from Vintageous.vi.registers import REG_EXPRESSION
+from Vintageous.vi.registers import next_numbered_register
 from Vintageous.vi.sublime import restoring_sels
 
 import re
@@ -33,16 +35,11 @@ class ViEditAtEol(sublime_plugin.TextCommand):
 
         self.view.run_command('collapse_to_direction')
 
-        sels = list(self.view.sel())
-        self.view.sel().clear()
-
-        new_sels = []
-        for s in sels:
-            hard_eol = self.view.line(s.b).end()
-            new_sels.append(sublime.Region(hard_eol, hard_eol))
+        def f(view, s):
+            hard_eol = view.line(s.b).end()
+            return sublime.Region(hard_eol, hard_eol)
 
-        for s in new_sels:
-            self.view.sel().add(s)
+        regions_transformer(self.view, f)
 
 
 class ViEditAfterCaret(sublime_plugin.TextCommand):
@@ -52,21 +49,16 @@ class ViEditAfterCaret(sublime_plugin.TextCommand):
 
         visual = self.view.has_non_empty_selection_region()
 
-        sels = list(self.view.sel())
-        self.view.sel().clear()
-
-        new_sels = []
-        for s in sels:
+        def f(view, s):
             if visual:
-                new_sels.append(sublime.Region(s.end(), s.end()))
+                return sublime.Region(s.end(), s.end())
             else:
-                if not utils.is_at_eol(self.view, s):
-                    new_sels.append(sublime.Region(s.end() + 1, s.end() + 1))
+                if not utils.is_at_eol(view, s):
+                    return sublime.Region(s.end() + 1, s.end() + 1)
                 else:
-                    new_sels.append(sublime.Region(s.end(), s.end()))
+                    return sublime.Region(s.end(), s.end())
 
-        for s in new_sels:
-            self.view.sel().add(s)
+        regions_transformer(self.view, f)
 
 
 class _vi_big_i(sublime_plugin.TextCommand):
@@ -263,21 +255,16 @@ class ViEnterNormalMode(sublime_plugin.TextCommand):
 
 class ViEnterNormalModeFromInsertMode(sublime_plugin.TextCommand):
     def run(self, edit):
-        sels = list(self.view.sel())
-        self.view.sel().clear()
-
-        new_sels = []
-        for s in sels:
+        def f(view, s):
             if s.a <= s.b:
-                if (self.view.line(s.a).a != s.a):
-                    new_sels.append(sublime.Region(s.a - 1, s.a - 1))
+                if (view.line(s.a).a != s.a):
+                    return sublime.Region(s.a - 1, s.a - 1)
                 else:
-                    new_sels.append(sublime.Region(s.a, s.a))
+                    return sublime.Region(s.a, s.a)
             else:
-                new_sels.append(s)
+                return s
 
-        for s in new_sels:
-            self.view.sel().add(s)
+        regions_transformer(self.view, f)
 
         state = VintageState(self.view)
         state.enter_normal_mode()
@@ -361,15 +348,10 @@ class ViPushDigit(sublime_plugin.TextCommand):
 
 class ViReverseCaret(sublime_plugin.TextCommand):
     def run(self, edit):
-        sels = list(self.view.sel())
-        self.view.sel().clear()
-
-        new_sels = []
-        for s in sels:
-            new_sels.append(sublime.Region(s.b, s.a))
+        def f(view, s):
+            return sublime.Region(s.b, s.a)
 
-        for s in new_sels:
-            self.view.sel().add(s)
+        regions_transformer(self.view, f)
 
 
 class ViEnterNormalInsertMode(sublime_plugin.TextCommand):
@@ -655,7 +637,12 @@ class _vi_repeat(IrreversibleTextCommand):
         elif cmd == 'vi_run':
             args['next_mode'] = MODE_NORMAL
             args['follow_up_mode'] = 'vi_enter_normal_mode'
-            args['count'] = state.count * args['count']
+            args['count'] = state.count * args.get('count', 1)
+            # Like Vim, repeating "1p puts the text in "2, and so on.
+            action_args = (args.get('action') or {}).get('args') or {}
+            if action_args.get('register'):
+                action_args['register'] = next_numbered_register(action_args['register'])
+                args['register'] = action_args['register']
             self.view.run_command(cmd, args)
         elif cmd == 'sequence':
             for i, _ in enumerate(args['commands']):
@@ -857,9 +844,7 @@ class _vi_g_v(IrreversibleTextCommand):
         regs = (self.view.get_regions('vi_visual_selections') or
                 list(self.view.sel()))
 
-        self.view.sel().clear()
-        for r in regs:
-            self.view.sel().add(r)
+        replace_sels(self.view, regs)
 
 
 class _vi_q(IrreversibleTextCommand):
@@ -1,5 +1,7 @@
 import sublime
 
+from Vintageous.vi.lines import get_line_index
+
 # from Vintageous.ex_range import calculate_relative_ref
 
 def get_line_nr(view, point):
@@ -20,29 +22,25 @@ def find_bol(view, point):
 
 # TODO: make this return None for failures.
 def find_line(view, start=0, end=-1, target=0):
-    """Do binary search to find :target: line number.
+    """Find :target: line number within `start`, `end`.
 
     Return: If `target` is found, `Region` comprising entire line no. `target`.
             If `target`is not found, `-1`.
     """
 
+    lines = get_line_index(view)
+
     # Don't bother if sought line is beyond buffer boundaries.
-    if  target < 0 or target > view.rowcol(view.size())[0] + 1:
+    if  target < 1 or target > lines.last_row + 1:
         return -1
 
     if end == -1:
         end = view.size()
 
-    lo, hi = start, end
-    while lo <= hi:
-        middle = lo + (hi - lo) / 2
-        if get_line_nr(view, middle) < target:
-            lo = find_eol(view, middle) + 1
-        elif get_line_nr(view, middle) > target:
-            hi = find_bol(view, middle) - 1
-        else:
-            return view.full_line(middle)
-    return -1
+    line = lines.full_line(lines.text_point(target - 1, 0))
+    if line.a > end or lines.line_end(target - 1) < start:
+        return -1
+    return line
 
 
 def search_in_range(view, what, start, end, flags=0):
@@ -67,17 +65,18 @@ def find_last_match(view, what, start, end, flags=0):
 def reverse_search(view, what, start=0, end=-1, flags=0):
     """Do binary search to find `what` walking backwards in the buffer.
     """
+    lines = get_line_index(view)
     if end == -1:
         end = view.size()
-    end = find_eol(view, view.line(end).a)
+    end = lines.line(end).b
 
     last_match = None
 
     lo, hi = start, end
     while True:
-        middle = (lo + hi) / 2
-        line = view.line(middle)
-        middle, eol = find_bol(view, line.a), find_eol(view, line.a)
+        middle = (lo + hi) // 2
+        line = lines.line(middle)
+        middle, eol = line.a, line.b
 
         if search_in_range(view, what, middle, hi, flags):
             lo = middle
@@ -4,6 +4,8 @@
 from collections import namedtuple
 import sublime
 
+from Vintageous.vi.lines import get_line_index
+
 
 class VimRange(object):
     """Encapsulates calculation of view regions based on supplied raw range info.
@@ -18,15 +20,14 @@ class VimRange(object):
         Returned blocks don't end in a newline char.
         """
         regions, visual_regions = new_calculate_range(self.view, self.range_info)
+        lines = get_line_index(self.view)
         blocks = []
         for a, b in regions:
-            r = sublime.Region(self.view.text_point(a - 1, 0),
-                               self.view.line(self.view.text_point(b - 1, 0)).end())
-            if self.view.substr(r) == '':
-                pass
-            elif self.view.substr(r)[-1] == "\n":
-                if r.begin() != r.end():
-                    r = sublime.Region(r.begin(), r.end() - 1)
+            r = sublime.Region(lines.text_point(a - 1, 0),
+                               lines.line(lines.text_point(b - 1, 0)).end())
+            # Only look at the last character; the block may span the whole buffer.
+            if not r.empty() and self.view.substr(r.end() - 1) == "\n":
+                r = sublime.Region(r.begin(), r.end() - 1)
             blocks.append(r)
         return blocks
 
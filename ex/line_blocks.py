@@ -0,0 +1,112 @@
+"""Whole-line blocks for line-oriented ex commands like :delete, :copy and :move.
+
+   Ranges are widened to whole lines, newline character included, and adjacent or overlapping
+   ones are merged, so that commands touch each stretch of lines once, however many regions or
+   :global matches it's made of.
+"""
+
+import sublime
+
+from Vintageous.vi.lines import get_line_index
+
+
+def merge_spans(spans):
+    """Returns the (begin, end) tuples in `spans` sorted, with adjacent and overlapping spans
+       merged.
+    """
+    merged = []
+    for (begin, end) in sorted(spans):
+        if merged and begin <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+            continue
+        merged.append((begin, end))
+    return merged
+
+
+def get_line_blocks(view, regions):
+    """Returns the full lines that `regions` touch as a sorted list of regions, with adjacent
+       lines merged into a single block. Blocks include the newline character at their end,
+       except for the last line in the buffer.
+    """
+    lines = get_line_index(view)
+    spans = []
+    for r in regions:
+        # Regions ending right after a newline character don't touch the next line.
+        last = r.end() - 1 if r.end() > r.begin() else r.end()
+        spans.append((lines.full_line(r.begin()).begin(), lines.full_line(last).end()))
+    return [sublime.Region(a, b) for (a, b) in merge_spans(spans)]
+
+
+def get_text(view, blocks):
+    """Returns the text in `blocks`, reading each block once.
+    """
+    return ''.join(view.substr(block) for block in blocks)
+
+
+def with_eol_before_last(view, blocks):
+    """Returns `blocks` with the newline character before the last block added to it when the
+       last block has no newline character of its own, because it's empty or ends the buffer
+       without one. Erasing the result then leaves no empty line behind at the end.
+    """
+    if not blocks:
+        return blocks
+    last = blocks[-1]
+    if last.begin() == 0 or (not last.empty() and view.substr(last.end() - 1) == '\n'):
+        return blocks
+    return blocks[:-1] + [sublime.Region(last.begin() - 1, last.end())]
+
+
+def erase_blocks(view, edit, blocks):
+    """Erases `blocks` as returned by `get_line_blocks()`.
+    """
+    # Go backwards so that the blocks still to be erased don't move.
+    for block in reversed(blocks):
+        view.erase(edit, block)
+
+
+def transfer_blocks(view, edit, blocks, dest, move=False):
+    """Copies `blocks` as returned by `get_line_blocks()` to `dest`, or moves them if `move` is
+       true. `dest` must be the start of a line or the end of the buffer, and not inside any of
+       the blocks when moving. Returns the region the lines end up in.
+
+       The blocks are erased once each, last to first, and their text is inserted in one go.
+    """
+    size = view.size()
+    # Lines are handled as if the buffer always ended in a newline character. Without it, the
+    # last line is moved along with the newline character before it, and lines put after the
+    # last line go after a new newline character.
+    missing_eol = size > 0 and view.substr(size - 1) != '\n'
+    end = size + 1 if missing_eol else size
+
+    text = get_text(view, blocks)
+    if not text.endswith('\n'):
+        text += '\n'
+
+    spans = [(b.begin(), b.end()) for b in blocks]
+    if missing_eol:
+        if spans and spans[-1][1] == size:
+            spans[-1] = (spans[-1][0], end)
+        if dest == size:
+            dest = end
+
+    if move:
+        # Lines moved right before or after themselves stay where they are.
+        if len(spans) == 1 and spans[0][0] <= dest <= spans[0][1]:
+            return sublime.Region(spans[0][0], spans[0][0] + len(text))
+
+        for (a, b) in reversed(spans):
+            if missing_eol and b == end:
+                view.erase(edit, sublime.Region(a - 1, b - 1))
+            else:
+                view.erase(edit, sublime.Region(a, b))
+            end -= b - a
+            if b <= dest:
+                dest -= b - a
+
+    if missing_eol and dest == end:
+        view.insert(edit, dest - 1, '\n' + text[:-1])
+    else:
+        view.insert(edit, dest, text)
+
+    return sublime.Region(dest, dest + len(text))
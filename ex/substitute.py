@@ -0,0 +1,96 @@
+"""Search and replace for :substitute.
+
+   Each block of text is read from the buffer once and searched as a whole, so lines without a
+   match cost nothing. Only lines with a match are substituted, one line at a time, which keeps
+   Vim's line-by-line semantics for ^, $ and the count of replacements per line.
+
+   Patterns with string anchors or negative lookarounds can match a line on its own but not the
+   same line inside a block, where a newline character follows it. Those patterns are matched
+   line by line instead.
+"""
+
+import re
+
+import sublime
+
+
+# Escaped characters, \A and \Z anchors and negative lookarounds in a pattern's source.
+_TOKENS = re.compile(r'\\.|\(\?<?!', re.DOTALL)
+
+
+def needs_line_by_line(pattern):
+    """Returns whether `pattern` may match a line on its own but not within a block of lines.
+    """
+    for token in _TOKENS.findall(pattern.pattern):
+        if token in ('\\A', '\\Z') or token.startswith('('):
+            return True
+    return False
+
+
+def substitute_lines(text, pattern, replacement, count=0):
+    """Same as `substitute_text()`, but matches `pattern` against each line on its own.
+    """
+    start = 0
+    for line in text.split('\n'):
+        end = start + len(line)
+        new_line = pattern.sub(replacement, line, count=count)
+        if new_line != line:
+            yield (start, end, new_line)
+        start = end + 1
+
+
+def substitute_text(text, pattern, replacement, count=0):
+    """Yields the lines in `text` that `pattern` changes as (start, end, new_line) tuples, where
+       `start` and `end` are the offsets of the line in `text` without its newline character.
+       `count` is the maximum number of replacements per line; 0 means all of them.
+    """
+    if needs_line_by_line(pattern):
+        yield from substitute_lines(text, pattern, replacement, count)
+        return
+
+    # ^ and $ must match at every line in the block, as they would in each line on its own.
+    # Within a single line, MULTILINE makes no difference.
+    if not pattern.flags & re.MULTILINE:
+        pattern = re.compile(pattern.pattern, pattern.flags | re.MULTILINE)
+    search = pattern.search
+
+    pos = 0
+    while pos <= len(text):
+        match = search(text, pos)
+        if not match:
+            break
+
+        start = text.rfind('\n', 0, match.start()) + 1
+        end = text.find('\n', match.start())
+        if end == -1:
+            end = len(text)
+
+        # A match found in the block may not be a match in the line on its own (for example, one
+        # that runs into the next line). If so, the line is left as is.
+        line = text[start:end]
+        new_line = pattern.sub(replacement, line, count=count)
+        if new_line != line:
+            yield (start, end, new_line)
+
+        pos = end + 1
+
+
+def find_substitutions(view, blocks, pattern, replacement, count=0):
+    """Returns the lines in `blocks` that `pattern` changes as (region, new_line) tuples, in
+       buffer order.
+    """
+    changes = []
+    for block in blocks:
+        text = view.substr(block)
+        for (start, end, new_line) in substitute_text(text, pattern, replacement, count):
+            changes.append((sublime.Region(block.begin() + start, block.begin() + end),
+                            new_line))
+    return changes
+
+
+def apply_substitutions(view, edit, changes):
+    """Replaces the regions in `changes` as returned by `find_substitutions()`.
+    """
+    # Go backwards so that the regions still to be replaced don't move.
+    for (region, new_line) in reversed(changes):
+        view.replace(edit, region, new_line)
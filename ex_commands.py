@@ -10,20 +10,30 @@ from Vintageous.ex import ex_error
 from Vintageous.ex import ex_range
 from Vintageous.ex import parsers
 from Vintageous.ex import shell
+from Vintageous.ex.ex_command_parser import parse_command
+from Vintageous.ex.line_blocks import erase_blocks
+from Vintageous.ex.line_blocks import get_line_blocks
+from Vintageous.ex.line_blocks import get_text
+from Vintageous.ex.line_blocks import transfer_blocks
+from Vintageous.ex.line_blocks import with_eol_before_last
 from Vintageous.ex.plat.windows import get_oem_cp
 from Vintageous.ex.plat.windows import get_startup_info
+from Vintageous.ex.substitute import apply_substitutions
+from Vintageous.ex.substitute import find_substitutions
 from Vintageous.ex_main import FsCompletion
 from Vintageous.state import IrreversibleTextCommand
 from Vintageous.state import VintageState
 from Vintageous.vi.constants import MODE_NORMAL
 from Vintageous.vi.constants import MODE_VISUAL
 from Vintageous.vi.constants import MODE_VISUAL_LINE
+from Vintageous.vi.patterns import get_pattern
+from Vintageous.vi.patterns import uses_vim_syntax
+from Vintageous.vi.registers import preview
 from Vintageous.vi.sublime import has_dirty_buffers
 from Vintageous.vi.settings import set_local
 from Vintageous.vi.settings import set_global
 
 
-GLOBAL_RANGES = []
 CURRENT_LINE_RANGE = {'left_ref': '.', 'left_offset': 0,
                       'left_search_offsets': [], 'right_ref': None,
                       'right_offset': 0, 'right_search_offsets': []}
@@ -75,13 +85,11 @@ def gather_buffer_info(v):
 
 
 def get_region_by_range(view, line_range=None, as_lines=False):
-    # If GLOBAL_RANGES exists, the ExGlobal command has been run right before
-    # the current command, and we know we must process these lines.
-    global GLOBAL_RANGES
-    if GLOBAL_RANGES:
-        rv = GLOBAL_RANGES[:]
-        GLOBAL_RANGES = []
-        return rv
+    # Ranges with marks come from :global and name the regions holding the
+    # lines it matched. Unlike line numbers, regions keep track of the lines
+    # as the buffer changes.
+    if line_range and line_range.get('marks'):
+        return view.get_regions(line_range['marks'])
 
     if line_range:
         vim_range = ex_range.VimRange(view, line_range)
@@ -95,11 +103,6 @@ class ExTextCommandBase(sublime_plugin.TextCommand):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    def line_range_to_text(self, line_range):
-        line_block = get_region_by_range(self.view, line_range=line_range)
-        line_block = [self.view.substr(r) for r in line_block]
-        return '\n'.join(line_block) + '\n'
-
     def serialize_sel(self):
         sels = [(r.a, r.b) for r in list(self.view.sel())]
         self.view.settings().set('ex_data', {'prev_sel': sels})
@@ -137,6 +140,13 @@ class ExAddressableCommandMixin(object):
         address = ex_range.calculate_address(self.view, parsed_address)
         return address
 
+    def get_dest(self, address):
+        """Returns the point where lines put after `address` go.
+        """
+        if address == 0:
+            return 0
+        return self.view.full_line(self.view.text_point(address, 0)).end()
+
 
 class ExGoto(sublime_plugin.TextCommand):
     def run(self, edit, line_range=None):
@@ -512,31 +522,19 @@ class ExMove(ExTextCommandBase, ExAddressableCommandMixin):
             ex_error.display_error(ex_error.ERR_INVALID_ADDRESS)
             return
 
-        if address != 0:
-            dest = self.view.line(self.view.text_point(address, 0)).end() + 1
-        else:
-            dest = 0
+        dest = self.get_dest(address)
+        blocks = get_line_blocks(self.view, get_region_by_range(self.view, line_range))
+        if not blocks:
+            return
 
         # Don't move lines onto themselves.
-        for sel in self.view.sel():
-            if sel.contains(dest):
-                ex_error.display_error(ex_error.ERR_CANT_MOVE_LINES_ONTO_THEMSELVES)
-                return
-
-        text = self.line_range_to_text(line_range)
-        if dest > self.view.size():
-            dest = self.view.size()
-            text = '\n' + text[:-1]
-        self.view.insert(edit, dest, text)
+        if any(b.begin() < dest < b.end() for b in blocks):
+            ex_error.display_error(ex_error.ERR_CANT_MOVE_LINES_ONTO_THEMSELVES)
+            return
 
-        for r in reversed(get_region_by_range(self.view, line_range)):
-            self.view.erase(edit, self.view.full_line(r))
+        r = transfer_blocks(self.view, edit, blocks, dest, move=True)
 
-        new_address = address
-        if address < self.view.rowcol(self.view.sel()[0].b)[0]:
-            new_pt = self.view.text_point(new_address + 1, 0)
-            new_address = self.view.rowcol(new_pt + len(text) - 1)[0]
-        next_sel = self.view.text_point(new_address, 0)
+        next_sel = self.view.line(r.end() - 1).begin()
         self.set_next_sel([(next_sel, next_sel)])
 
 
@@ -551,19 +549,14 @@ class ExCopy(ExTextCommandBase, ExAddressableCommandMixin):
             ex_error.display_error(ex_error.ERR_INVALID_ADDRESS)
             return
 
-        if address != 0:
-            dest = self.view.line(self.view.text_point(address, 0)).end() + 1
-        else:
-            dest = address
-
-        text = self.line_range_to_text(line_range)
-        if dest > self.view.size():
-            dest = self.view.size()
-            text = '\n' + text[:-1]
+        dest = self.get_dest(address)
+        blocks = get_line_blocks(self.view, get_region_by_range(self.view, line_range))
+        if not blocks:
+            return
 
-        self.view.insert(edit, dest, text)
+        r = transfer_blocks(self.view, edit, blocks, dest)
 
-        cursor_dest = self.view.line(dest + len(text) - 1).begin()
+        cursor_dest = self.view.line(r.end() - 1).begin()
         self.set_next_sel([(cursor_dest, cursor_dest)])
 
 
@@ -634,40 +627,31 @@ class ExSubstitute(sublime_plugin.TextCommand):
             ExSubstitute.most_recent_replacement = replacement
             ExSubstitute.most_recent_flags = flags
 
-        computed_flags = 0
+        # ^ and $ must match at every line, because whole blocks are searched at once.
+        computed_flags = re.MULTILINE
         computed_flags |= re.IGNORECASE if (flags and 'i' in flags) else 0
         try:
-            pattern = re.compile(pattern, flags=computed_flags)
+            pattern = get_pattern(pattern, computed_flags, vim_syntax=uses_vim_syntax(self.view))
         except Exception as e:
-            sublime.status_message("Vintageous [regex error]: %s ... in pattern '%s'" % (e.message, pattern))
-            print("Vintageous [regex error]: %s ... in pattern '%s'" % (e.message, pattern))
+            sublime.status_message("Vintageous [regex error]: %s ... in pattern '%s'" % (e, pattern))
+            print("Vintageous [regex error]: %s ... in pattern '%s'" % (e, pattern))
             return
 
         replace_count = 0 if (flags and 'g' in flags) else 1
 
-        target_region = get_region_by_range(self.view, line_range=line_range, as_lines=True)
-        for r in reversed(target_region):
-            line_text = self.view.substr(self.view.line(r))
-            rv = re.sub(pattern, replacement, line_text, count=replace_count)
-            self.view.replace(edit, self.view.line(r), rv)
+        blocks = get_region_by_range(self.view, line_range=line_range)
+        changes = find_substitutions(self.view, blocks, pattern, replacement, replace_count)
+        apply_substitutions(self.view, edit, changes)
 
 
 class ExDelete(ExTextCommandBase):
-    def select(self, regions, register):
-        self.view.sel().clear()
-        to_store = []
-        for r in regions:
-            self.view.sel().add(r)
-            if register:
-                to_store.append(self.view.substr(self.view.full_line(r)))
+    def store(self, blocks, register):
+        text = get_text(self.view, blocks)
+        if not text.endswith('\n'):
+            text = text + '\n'
 
-        if register:
-            text = ''.join(to_store)
-            if not text.endswith('\n'):
-                text = text + '\n'
-
-            state = VintageState(self.view)
-            state.registers[register] = [text]
+        state = VintageState(self.view)
+        state.registers[register] = [text]
 
     def run_ex_command(self, edit, line_range=None, register='', count=''):
         # XXX somewhat different to vim's behavior
@@ -679,14 +663,21 @@ class ExDelete(ExTextCommandBase):
             line_range['text_range'] = '1'
         rs = get_region_by_range(self.view, line_range=line_range)
 
-        self.select(rs, register)
+        # Erase whole stretches of lines at once; :g/pat/d may pass many
+        # adjacent lines.
+        blocks = get_line_blocks(self.view, rs)
+        if not blocks:
+            return
 
-        self.view.run_command('split_selection_into_lines')
-        self.view.run_command(
-                    'run_macro_file',
-                    {'file': 'Packages/Default/Delete Line.sublime-macro'})
+        if register:
+            self.store(blocks, register)
 
-        self.set_next_sel([(rs[0].a, rs[0].a)])
+        # Deleting the last line takes the newline character before it too.
+        blocks = with_eol_before_last(self.view, blocks)
+        erase_blocks(self.view, edit, blocks)
+
+        pt = self.view.line(blocks[0].a).begin()
+        self.set_next_sel([(pt, pt)])
 
 
 class ExGlobal(sublime_plugin.TextCommand):
@@ -714,6 +705,12 @@ class ExGlobal(sublime_plugin.TextCommand):
         :g!/DON'T TOUCH THIS/delete
     """
     most_recent_pat = None
+    # Regions holding the lines to run the subcommand on.
+    MARKS_KEY = 'vi_global_lines'
+    # Subcommands whose result doesn't depend on the order the lines are
+    # visited in. They run once over all the lines, unless given a range.
+    BATCHED_COMMANDS = frozenset(('ex_delete', 'ex_substitute', 'ex_print'))
+
     def run(self, edit, line_range=None, forced=False, pattern=''):
 
         if not line_range['text_range']:
@@ -736,26 +733,89 @@ class ExGlobal(sublime_plugin.TextCommand):
         # Vim does too.
         subcmd = subcmd or 'print'
 
-        rs = get_region_by_range(self.view, line_range=line_range, as_lines=True)
+        try:
+            search = get_pattern(global_pattern, vim_syntax=uses_vim_syntax(self.view)).search
+        except Exception as e:
+            msg = "Vintageous (global): %s ... in pattern '%s'" % (str(e), global_pattern)
+            sublime.status_message(msg)
+            print(msg)
+            return
 
-        for r in rs:
-            try:
-                match = re.search(global_pattern, self.view.substr(r))
-            except Exception as e:
-                msg = "Vintageous (global): %s ... in pattern '%s'" % (str(e), global_pattern)
-                sublime.status_message(msg)
-                print(msg)
-                return
-            if (match and not forced) or (not match and forced):
-                GLOBAL_RANGES.append(r)
+        lines = []
+        size = self.view.size()
+        for block in get_region_by_range(self.view, line_range=line_range):
+            # Read each block once and split it into lines here, rather than
+            # asking the view for every line.
+            pt = block.begin()
+            texts = self.view.substr(block).split('\n')
+            # Like Vim, don't count the empty "line" after a final newline.
+            if block.end() == size and len(texts) > 1 and not texts[-1]:
+                texts.pop()
+            for text in texts:
+                match = search(text)
+                if (match and not forced) or (not match and forced):
+                    lines.append(sublime.Region(pt, pt + len(text)))
+                pt += len(text) + 1
 
         # don't do anything if we didn't found any target ranges
-        if not GLOBAL_RANGES:
+        if not lines:
             return
-        self.view.window().run_command('vi_colon_input',
-                              {'cmd_line': ':' +
-                                    str(self.view.rowcol(r.a)[0] + 1) +
-                                    subcmd})
+
+        # Parse the subcommand once, not once per line.
+        cmd_line = ':' + subcmd
+        ex_cmd = parse_command(cmd_line)
+        if ex_cmd and ex_cmd.parse_errors:
+            ex_error.display_error(ex_cmd.parse_errors[0])
+            return
+        if not (ex_cmd and ex_cmd.name):
+            ex_error.display_error(ex_error.ERR_UNKNOWN_COMMAND, cmd_line)
+            return
+
+        # :g/pat/s//x/ substitutes the pattern :global used.
+        ExSubstitute.most_recent_pat = global_pattern
+
+        if ex_cmd.command in self.BATCHED_COMMANDS and not ex_cmd.line_range['text_range']:
+            self.run_batched(ex_cmd, lines)
+        else:
+            self.run_per_line(ex_cmd, lines)
+
+    def command_args(self, ex_cmd, **line_range):
+        args = dict(ex_cmd.args)
+        if ex_cmd.can_have_range:
+            args['line_range'] = dict(ex_cmd.line_range, **line_range)
+        if ex_cmd.forced:
+            args['forced'] = ex_cmd.forced
+        return args
+
+    def run_batched(self, ex_cmd, lines):
+        """Runs the subcommand once over all the lines.
+        """
+        self.view.add_regions(self.MARKS_KEY, lines, '', '', sublime.HIDDEN)
+        try:
+            args = self.command_args(ex_cmd, marks=self.MARKS_KEY)
+            self.view.window().run_command(ex_cmd.command, args)
+        finally:
+            self.view.erase_regions(self.MARKS_KEY)
+
+    def run_per_line(self, ex_cmd, lines):
+        """Runs the subcommand on each line in turn, with the caret on the line,
+           as Vim does. Lines deleted by an earlier run are skipped.
+        """
+        # Marks span whole lines, newline included, so they're never empty
+        # unless their line has been deleted.
+        marks = [self.view.full_line(r) for r in lines]
+        self.view.add_regions(self.MARKS_KEY, marks, '', '', sublime.HIDDEN)
+        try:
+            for i in range(len(marks)):
+                mark = self.view.get_regions(self.MARKS_KEY)[i]
+                if mark.empty():
+                    continue
+                self.view.sel().clear()
+                self.view.sel().add(sublime.Region(mark.begin()))
+                # Commands may change the range they're given.
+                self.view.window().run_command(ex_cmd.command, self.command_args(ex_cmd))
+        finally:
+            self.view.erase_regions(self.MARKS_KEY)
 
 
 class ExPrint(sublime_plugin.TextCommand):
@@ -936,7 +996,8 @@ class ExListRegisters(sublime_plugin.TextCommand):
 
         state = VintageState(self.view)
         pairs = [(k, v) for (k, v) in state.registers.to_dict().items() if v]
-        pairs = [(k, repr(v[0]), len(v)) for (k, v) in pairs]
+        # Spilled register values are only partially read back to be displayed.
+        pairs = [(k, repr(preview(v)), len(v)) for (k, v) in pairs]
         pairs = ['"{0}\t{1}\t{2}'.format(k, v, show_lines(lines)) for (k, v, lines) in pairs]
 
         self.view.window().show_quick_panel(pairs, self.on_done, flags=sublime.MONOSPACE_FONT)
@@ -11,6 +11,7 @@ from Vintageous.ex.completions import parse
 from Vintageous.ex.completions import parse_for_setting
 from Vintageous.ex.completions import wants_fs_completions
 from Vintageous.ex.completions import wants_setting_completions
+from Vintageous.vi.session import PersistentDict
 from Vintageous.vi.settings import iter_settings
 from Vintageous.vi.sublime import show_ipanel
 from Vintageous.state import VintageState
@@ -26,18 +27,21 @@ def plugin_loaded():
 COMPLETIONS = sorted([x[0] for x in EX_COMMANDS.keys()])
 
 EX_HISTORY_MAX_LENGTH = 20
-EX_HISTORY = {
+EX_HISTORY = PersistentDict('history', {
     'cmdline': [],
     'searches': []
-}
+})
 
 
 def update_command_line_history(item, slot_name):
-    if len(EX_HISTORY[slot_name]) >= EX_HISTORY_MAX_LENGTH:
-        EX_HISTORY[slot_name] = EX_HISTORY[slot_name][1:]
-    if item in EX_HISTORY[slot_name]:
-        EX_HISTORY[slot_name].pop(EX_HISTORY[slot_name].index(item))
-    EX_HISTORY[slot_name].append(item)
+    # Replace the list instead of modifying it so the new history gets saved.
+    history = list(EX_HISTORY[slot_name])
+    if len(history) >= EX_HISTORY_MAX_LENGTH:
+        history = history[1:]
+    if item in history:
+        history.pop(history.index(item))
+    history.append(item)
+    EX_HISTORY[slot_name] = history
 
 
 class ViColonInput(sublime_plugin.WindowCommand):
@@ -67,44 +67,57 @@ import sublime
 import sublime_plugin
 
 from Vintageous.vi.constants import regions_transformer
+from Vintageous.vi.constants import regions_transformer_batch
+from Vintageous.vi.lines import get_line_index
 from Vintageous.vi.constants import MODE_VISUAL, MODE_NORMAL, _MODE_INTERNAL_NORMAL
 from Vintageous.vi.constants import MODE_VISUAL_LINE
 from Vintageous.state import VintageState, IrreversibleTextCommand
 from Vintageous.vi import utils
 from Vintageous.vi.search import reverse_search
-from Vintageous.vi.search import reverse_search_by_pt
 from Vintageous.vi.search import find_in_range
 from Vintageous.vi.search import find_wrapping
 from Vintageous.vi.search import reverse_find_wrapping
 from Vintageous.vi.search import BufferSearchBase
 from Vintageous.vi.search import ExactWordBufferSearchBase
+from Vintageous.vi import hlsearch
+from Vintageous.vi.boundaries import get_boundary_index
+from Vintageous.vi.brackets import get_bracket_index
+from Vintageous.vi.matches import find_next
+from Vintageous.vi.matches import find_previous
+from Vintageous.vi.words import get_word_snapshot
 from Vintageous.vi import units
 
 import Vintageous.state
 
-from itertools import chain
 import re
 
 
+def batched(f):
+    """Turns a transformer for single regions into one for regions_transformer_batch(). All
+       regions are transformed over a text snapshot fetched in a single call, instead of calling
+       into the view for each one of them.
+    """
+    def transform(view, sels):
+        snapshot = get_word_snapshot(view)
+        snapshot.prefetch(sels)
+        return [f(snapshot, s) for s in sels]
+    return transform
+
+
 class ViMoveToHardBol(sublime_plugin.TextCommand):
     def run(self, edit, extend=False):
-        sels = list(self.view.sel())
-        self.view.sel().clear()
-
-        new_sels = []
-        for s in sels:
-            hard_bol = self.view.line(s.b).begin()
-            if s.a < s.b and (self.view.line(s.a) != self.view.line(s.b)) and self.view.full_line(hard_bol - 1).b == hard_bol:
+        def f(view, s):
+            hard_bol = view.line(s.b).begin()
+            if s.a < s.b and (view.line(s.a) != view.line(s.b)) and view.full_line(hard_bol - 1).b == hard_bol:
                 hard_bol += 1
             a, b = (hard_bol, hard_bol) if not extend else (s.a, hard_bol)
             # Avoid ending up with a en empty selection while on visual mode.
 
             if extend and s.a == hard_bol:
                 b = b + 1
-            new_sels.append(sublime.Region(a, b))
+            return sublime.Region(a, b)
 
-        for s in new_sels:
-            self.view.sel().add(s)
+        regions_transformer(self.view, f)
 
 # FIXME: Only find exact char counts. Vim ignores the command when the count is larger than the
 # number of instances of the sought character.
@@ -371,14 +384,14 @@ class ViPercent(sublime_plugin.TextCommand):
         if percent == None:
             def move_to_bracket(view, s):
                 def find_bracket_location(pt):
-                    bracket, brackets, bracket_pt = self.find_a_bracket(pt)
-                    if not bracket:
+                    # The first bracket on the line that isn't in a string or comment, if those
+                    # are ignored.
+                    index = get_bracket_index(view)
+                    bracket_pt = index.first(pt, view.line(pt).b)
+                    if bracket_pt is None:
                         return
 
-                    if bracket == brackets[0]:
-                        return self.find_balanced_closing_bracket(bracket_pt + 1, brackets)
-                    else:
-                        return self.find_balanced_opening_bracket(bracket_pt, brackets)
+                    return index.partner(bracket_pt)
 
                 if mode == MODE_VISUAL:
                     # TODO: Improve handling of s.a < s.b and s.a > s.b cases.
@@ -406,10 +419,10 @@ class ViPercent(sublime_plugin.TextCommand):
 
             return
 
-        row = self.view.rowcol(self.view.size())[0] * (percent / 100)
+        lines = get_line_index(self.view)
+        pt = lines.text_point(lines.last_row * (percent / 100), 0)
 
         def f(view, s):
-            pt = view.text_point(row, 0)
             return sublime.Region(pt, pt)
 
         regions_transformer(self.view, f)
@@ -418,87 +431,6 @@ class ViPercent(sublime_plugin.TextCommand):
         # should have an optional .scroll_selections_into_view() step during command execution.
         self.view.show(self.view.sel()[0])
 
-    def find_a_bracket(self, caret_pt):
-        """Locates the next bracket after the caret in the current line.
-           If None is found, execution must be aborted.
-           Returns: (bracket, brackets, bracket_pt)
-
-           Example: ('(', ('(', ')'), 1337))
-        """
-        caret_row, caret_col = self.view.rowcol(caret_pt)
-        line_text = self.view.substr(sublime.Region(caret_pt,
-                                                    self.view.line(caret_pt).b))
-        try:
-            found_brackets = min([(line_text.index(bracket), bracket)
-                                        for bracket in chain(*self.pairs)
-                                        if bracket in line_text])
-        except ValueError:
-            return None, None, None
-
-        bracket_a, bracket_b = [(a, b) for (a, b) in self.pairs
-                                       if found_brackets[1] in (a, b)][0]
-        return (found_brackets[1], (bracket_a, bracket_b),
-                self.view.text_point(caret_row, caret_col + found_brackets[0]))
-
-    def find_balanced_closing_bracket(self, start, brackets, unbalanced=0):
-        new_start = start
-        for i in range(unbalanced or 1):
-            next_closing_bracket = find_in_range(self.view, brackets[1],
-                                                 start=new_start,
-                                                 end=self.view.size(),
-                                                 flags=sublime.LITERAL)
-            if next_closing_bracket is None:
-                # Unbalanced brackets; nothing we can do.
-                return
-            new_start = next_closing_bracket.end()
-
-        nested = 0
-        while True:
-            next_opening_bracket = find_in_range(self.view, brackets[0],
-                                                 start=start,
-                                                 end=next_closing_bracket.end(),
-                                                 flags=sublime.LITERAL)
-            if not next_opening_bracket:
-                break
-            nested += 1
-            start = next_opening_bracket.end()
-
-        if nested > 0:
-            return self.find_balanced_closing_bracket(next_closing_bracket.end(),
-                                                      brackets, nested)
-        else:
-            return next_closing_bracket.begin()
-
-    def find_balanced_opening_bracket(self, start, brackets, unbalanced=0):
-        new_start = start
-        for i in range(unbalanced or 1):
-            prev_opening_bracket = reverse_search_by_pt(self.view, brackets[0],
-                                                      start=0,
-                                                      end=new_start,
-                                                      flags=sublime.LITERAL)
-            if prev_opening_bracket is None:
-                # Unbalanced brackets; nothing we can do.
-                return
-            new_start = prev_opening_bracket.begin()
-
-        nested = 0
-        while True:
-            next_closing_bracket = reverse_search_by_pt(self.view, brackets[1],
-                                                  start=prev_opening_bracket.a,
-                                                  end=start,
-                                                  flags=sublime.LITERAL)
-            if not next_closing_bracket:
-                break
-            nested += 1
-            start = next_closing_bracket.begin()
-
-        if nested > 0:
-            return self.find_balanced_opening_bracket(prev_opening_bracket.begin(),
-                                                      brackets,
-                                                      nested)
-        else:
-            return prev_opening_bracket.begin()
-
 
 class _vi_big_h(sublime_plugin.TextCommand):
     def run(self, edit, count=None, extend=False, mode=None):
@@ -585,23 +517,7 @@ class ViBigM(sublime_plugin.TextCommand):
 class ViStar(ExactWordBufferSearchBase):
     def run(self, edit, mode=None, extend=False, exact_word=True):
         def f(view, s):
-            pattern = self.build_pattern(query)
-            flags = self.calculate_flags()
-
-            if mode == _MODE_INTERNAL_NORMAL:
-                match = find_wrapping(view,
-                                      term=pattern,
-                                      start=view.word(s.end()).end(),
-                                      end=view.size(),
-                                      flags=flags,
-                                      times=1)
-            else:
-                match = find_wrapping(view,
-                                      term=pattern,
-                                      start=view.word(s.end()).end(),
-                                      end=view.size(),
-                                      flags=flags,
-                                      times=1)
+            match = find_next(view, pattern, view.word(s.end()).end(), flags=flags)
 
             if match:
                 if mode == _MODE_INTERNAL_NORMAL:
@@ -615,6 +531,7 @@ class ViStar(ExactWordBufferSearchBase):
         state = VintageState(self.view)
 
         query = self.get_query()
+        pattern, flags = self.search_pattern(query)
         if query:
             self.hilite(query)
             # Ensure n and N can repeat this search later.
@@ -626,23 +543,7 @@ class ViStar(ExactWordBufferSearchBase):
 class ViOctothorp(ExactWordBufferSearchBase):
     def run(self, edit, mode=None, extend=False, exact_word=True):
         def f(view, s):
-            pattern = self.build_pattern(query)
-            flags = self.calculate_flags()
-
-            if mode == _MODE_INTERNAL_NORMAL:
-                match = reverse_find_wrapping(view,
-                                              term=pattern,
-                                              start=0,
-                                              end=start_sel.a,
-                                              flags=flags,
-                                              times=1)
-            else:
-                match = reverse_find_wrapping(view,
-                                              term=pattern,
-                                              start=0,
-                                              end=start_sel.a,
-                                              flags=flags,
-                                              times=1)
+            match = find_previous(view, pattern, start_sel.a, flags=flags)
 
             if match:
                 if mode == _MODE_INTERNAL_NORMAL:
@@ -656,6 +557,7 @@ class ViOctothorp(ExactWordBufferSearchBase):
         state = VintageState(self.view)
 
         query = self.get_query()
+        pattern, flags = self.search_pattern(query)
         if query:
             self.hilite(query)
             # Ensure n and N can repeat this search later.
@@ -689,11 +591,13 @@ class ViBufferSearch(IrreversibleTextCommand, BufferSearchBase):
         state.eval()
 
     def on_change(self, s):
-        flags = self.calculate_flags()
+        term, flags = self.search_pattern(s)
         self.view.erase_regions('vi_inc_search')
+        # The query has changed; stop highlighting matches for the previous one.
+        hlsearch.cancel(self.view)
         state = VintageState(self.view)
         next_hit = find_wrapping(self.view,
-                                 term=s,
+                                 term=term,
                                  start=self.view.sel()[0].b + 1,
                                  end=self.view.size(),
                                  flags=flags,
@@ -738,11 +642,13 @@ class ViBufferReverseSearch(IrreversibleTextCommand, BufferSearchBase):
         state.eval()
 
     def on_change(self, s):
-        flags = self.calculate_flags()
+        term, flags = self.search_pattern(s)
         self.view.erase_regions('vi_inc_search')
+        # The query has changed; stop highlighting matches for the previous one.
+        hlsearch.cancel(self.view)
         state = VintageState(self.view)
         occurrence = reverse_find_wrapping(self.view,
-                                 term=s,
+                                 term=term,
                                  start=0,
                                  end=self.view.sel()[0].b,
                                  flags=flags,
@@ -787,13 +693,12 @@ class _vi_forward_slash(BufferSearchBase):
         # We want to start searching right after the current selection.
         current_sel = self.view.sel()[0]
         start = current_sel.b if not current_sel.empty() else current_sel.b + 1
-        wrapped_end = self.view.size()
 
         # TODO: What should we do here? Case-sensitive or case-insensitive search? Configurable?
         # Search wrapping around the end of the buffer.
         # flags = sublime.IGNORECASE | sublime.LITERAL
-        flags = self.calculate_flags()
-        match = find_wrapping(self.view, search_string, start, wrapped_end, flags=flags, times=count)
+        term, flags = self.search_pattern(search_string)
+        match = find_next(self.view, term, start, flags=flags, times=count)
         if not match:
             return
 
@@ -824,14 +729,10 @@ class _vi_question_mark(BufferSearchBase):
         if search_string is None:
             return
 
-        flags = self.calculate_flags()
+        term, flags = self.search_pattern(search_string)
         # FIXME: What should we do here? Case-sensitive or case-insensitive search? Configurable?
-        found = reverse_find_wrapping(self.view,
-                                      term=search_string,
-                                      start=0,
-                                      end=self.view.sel()[0].b,
-                                      flags=flags,
-                                      times=count)
+        found = find_previous(self.view, term, self.view.sel()[0].b, flags=flags,
+                              times=count)
 
         if not found:
             print("Vintageous: Pattern not found.")
@@ -841,30 +742,41 @@ class _vi_question_mark(BufferSearchBase):
         self.hilite(search_string)
 
 
+def _caret(s, mode):
+    # In visual modes, the caret sits on the character before .b.
+    if mode in (MODE_VISUAL, MODE_VISUAL_LINE) and s.a < s.b:
+        return s.b - 1
+    return s.b
+
+
 class _vi_right_brace(sublime_plugin.TextCommand):
-    def run(self, edit, mode=None, extend=False):
+    takes_count = True
+
+    def run(self, edit, mode=None, extend=False, count=1):
+        boundaries = get_boundary_index(self.view)
+
         def f(view, s):
-            # TODO: must skip empty paragraphs.
-            start = utils.next_non_white_space_char(view, s.b, white_space='\n \t')
-            par_as_region = view.expand_by_class(start, sublime.CLASS_EMPTY_LINE)
+            target = boundaries.next_paragraph(_caret(s, mode), count)
+            if target is None:
+                target = view.size()
 
             if mode == MODE_NORMAL:
-                min_pt = max(0, min(par_as_region.b, view.size() - 1))
+                min_pt = max(0, min(target, view.size() - 1))
                 return sublime.Region(min_pt, min_pt)
 
             elif mode == MODE_VISUAL:
-                return sublime.Region(s.a, par_as_region.b + 1)
+                return sublime.Region(s.a, target + 1)
 
             elif mode == _MODE_INTERNAL_NORMAL:
-                return sublime.Region(s.a, par_as_region.b - 1)
+                return sublime.Region(s.a, target - 1)
 
             elif mode == MODE_VISUAL_LINE:
                 if s.a <= s.b:
-                    return sublime.Region(s.a, par_as_region.b + 1)
+                    return sublime.Region(s.a, target + 1)
                 else:
-                    if par_as_region.b > s.a:
-                        return sublime.Region(view.line(s.a - 1).a, par_as_region.b + 1)
-                    return sublime.Region(s.a, par_as_region.b)
+                    if target > s.a:
+                        return sublime.Region(view.line(s.a - 1).a, target + 1)
+                    return sublime.Region(s.a, target)
 
             return s
 
@@ -872,32 +784,36 @@ class _vi_right_brace(sublime_plugin.TextCommand):
 
 
 class _vi_left_brace(sublime_plugin.TextCommand):
-    def run(self, edit, mode=None, extend=False):
+    takes_count = True
+
+    def run(self, edit, mode=None, extend=False, count=1):
+        boundaries = get_boundary_index(self.view)
+
         def f(view, s):
-            # TODO: must skip empty paragraphs.
-            start = utils.previous_non_white_space_char(view, s.b - 1, white_space='\n \t')
-            par_as_region = view.expand_by_class(start, sublime.CLASS_EMPTY_LINE)
+            target = boundaries.previous_paragraph(_caret(s, mode), count)
+            if target is None:
+                target = 0
 
             if mode == MODE_NORMAL:
-                return sublime.Region(par_as_region.a, par_as_region.a)
+                return sublime.Region(target, target)
 
             elif mode == MODE_VISUAL:
                 # FIXME: Improve motion when .b end crosses over .a end: must extend .a end
                 # by one.
-                if s.a == par_as_region.a:
+                if s.a == target:
                     return sublime.Region(s.a, s.a + 1)
-                return sublime.Region(s.a, par_as_region.a)
+                return sublime.Region(s.a, target)
 
             elif mode == _MODE_INTERNAL_NORMAL:
-                return sublime.Region(s.a, par_as_region.a)
+                return sublime.Region(s.a, target)
 
             elif mode == MODE_VISUAL_LINE:
                 if s.a <= s.b:
-                    if par_as_region.a < s.a:
-                        return sublime.Region(view.full_line(s.a).b, par_as_region.a)
-                    return sublime.Region(s.a, par_as_region.a + 1)
+                    if target < s.a:
+                        return sublime.Region(view.full_line(s.a).b, target)
+                    return sublime.Region(s.a, target + 1)
                 else:
-                    return sublime.Region(s.a, par_as_region.a)
+                    return sublime.Region(s.a, target)
 
             return s
 
@@ -905,39 +821,25 @@ class _vi_left_brace(sublime_plugin.TextCommand):
 
 
 class _vi_right_parenthesis(sublime_plugin.TextCommand):
-    def find_next_sentence_end(self, r):
-        sen = r
-        non_ws = utils.next_non_white_space_char(self.view, sen.b, '\t \n')
-        sen = sublime.Region(non_ws, non_ws)
-        while True:
-            sen = self.view.expand_by_class(sen, sublime.CLASS_PUNCTUATION_START |
-                                                 sublime.CLASS_LINE_END)
-            if (sen.b == self.view.size() or
-                self.view.substr(sublime.Region(sen.b, sen.b + 2)).endswith(('. ', '.\t')) or
-                self.view.substr(self.view.line(sen.b)).strip() == ''):
-                    if self.view.substr(sen.b) == '.':
-                        return sublime.Region(sen.a, sen.b + 1)
-                    else:
-                        if self.view.line(sen.b).empty():
-                            return sublime.Region(sen.a, sen.b)
-                        else:
-                            return self.view.full_line(sen.b)
+    takes_count = True
+
+    def run(self, edit, mode=None, extend=False, count=1):
+        boundaries = get_boundary_index(self.view)
 
-    def run(self, edit, mode=None, extend=False):
         def f(view, s):
-            # TODO: must skip empty paragraphs.
-            sen = self.find_next_sentence_end(s)
+            target = boundaries.next_sentence(_caret(s, mode), count)
+            if target is None:
+                target = view.size()
 
             if mode == MODE_NORMAL:
-                target = min(sen.b, view.size() - 1)
+                target = max(0, min(target, view.size() - 1))
                 return sublime.Region(target, target)
 
             elif mode == MODE_VISUAL:
-                # TODO: Must encompass new line char too?
-                return sublime.Region(s.a, sen.b)
+                return sublime.Region(s.a, target + 1)
 
             elif mode == _MODE_INTERNAL_NORMAL:
-                return sublime.Region(s.a, sen.b)
+                return sublime.Region(s.a, target)
 
             return s
 
@@ -945,31 +847,24 @@ class _vi_right_parenthesis(sublime_plugin.TextCommand):
 
 
 class _vi_left_parenthesis(sublime_plugin.TextCommand):
-    def find_previous_sentence_end(self, r):
-        sen = r
-        pt = utils.previous_non_white_space_char(self.view, sen.a, white_space='\n \t')
-        sen = sublime.Region(pt, pt)
-        while True:
-            sen = self.view.expand_by_class(sen, sublime.CLASS_LINE_END | sublime.CLASS_PUNCTUATION_END)
-            if sen.a <= 0 or self.view.substr(sen.begin() - 1) in ('.', '\n'):
-                if self.view.substr(sen.begin() - 1) == '.' and not self.view.substr(sen.begin()) == ' ':
-                    continue
-                return sen
+    takes_count = True
 
-    def run(self, edit, mode=None, extend=False):
+    def run(self, edit, mode=None, extend=False, count=1):
+        boundaries = get_boundary_index(self.view)
 
         def f(view, s):
-            # TODO: must skip empty paragraphs.
-            sen = self.find_previous_sentence_end(s)
+            target = boundaries.previous_sentence(_caret(s, mode), count)
+            if target is None:
+                target = 0
 
             if mode == MODE_NORMAL:
-                return sublime.Region(sen.a, sen.a)
+                return sublime.Region(target, target)
 
             elif mode == MODE_VISUAL:
-                return sublime.Region(s.a + 1, sen.a +  1)
+                return sublime.Region(s.a + 1, target + 1)
 
             elif mode == _MODE_INTERNAL_NORMAL:
-                return sublime.Region(s.a, sen.a + 1)
+                return sublime.Region(s.a, target)
 
             return s
 
@@ -1335,7 +1230,7 @@ class _vi_dollar(sublime_plugin.TextCommand):
             target_row = current_row + count - 1
             target_row_pt = self.view.text_point(target_row, 0)
 
-        regions_transformer(self.view, f)
+        regions_transformer_batch(self.view, batched(f))
 
 
 class _vi_cc_motion(sublime_plugin.TextCommand):
@@ -1370,6 +1265,8 @@ class _vi_big_s_motion(sublime_plugin.TextCommand):
 
 
 class _vi_w(sublime_plugin.TextCommand):
+    takes_count = True
+
     def run(self, edit, mode=None, count=1):
         def f(view, s):
             if mode == MODE_NORMAL:
@@ -1396,10 +1293,12 @@ class _vi_w(sublime_plugin.TextCommand):
                 return sublime.Region(a, pt)
             return s
 
-        regions_transformer(self.view, f)
+        regions_transformer_batch(self.view, batched(f))
 
 
 class _vi_big_w(sublime_plugin.TextCommand):
+    takes_count = True
+
     def run(self, edit, mode=None, count=1):
         def f(view, s):
             if mode == MODE_NORMAL:
@@ -1426,10 +1325,12 @@ class _vi_big_w(sublime_plugin.TextCommand):
                 return sublime.Region(a, pt)
             return s
 
-        regions_transformer(self.view, f)
+        regions_transformer_batch(self.view, batched(f))
 
 
 class _vi_e(sublime_plugin.TextCommand):
+    takes_count = True
+
     def run(self, edit, mode=None, count=1):
         def f(view, s):
             if mode == MODE_NORMAL:
@@ -1459,4 +1360,4 @@ class _vi_e(sublime_plugin.TextCommand):
                 return sublime.Region(a, pt + 1)
             return s
 
-        regions_transformer(self.view, f)
+        regions_transformer_batch(self.view, batched(f))
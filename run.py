@@ -8,6 +8,8 @@ from Vintageous.vi import actions
 from Vintageous.vi import motions
 from Vintageous.vi import registers
 from Vintageous.vi import utils
+from Vintageous.vi.cmd_data import CmdData
+from Vintageous.vi.commands import find_direct_command
 from Vintageous.vi.constants import _MODE_INTERNAL_NORMAL
 from Vintageous.vi.constants import digraphs
 from Vintageous.vi.constants import MODE_INSERT
@@ -16,6 +18,8 @@ from Vintageous.vi.constants import MODE_NORMAL_INSERT
 from Vintageous.vi.constants import mode_to_str
 from Vintageous.vi.constants import MODE_VISUAL
 from Vintageous.vi.constants import MODE_VISUAL_LINE
+from Vintageous.vi.constants import regions_transformer
+from Vintageous.vi.constants import replace_sels
 from Vintageous.vi.registers import REG_UNNAMED
 from Vintageous.vi.registers import REG_SMALL_DELETE
 from Vintageous.vi.registers import Registers
@@ -49,10 +53,17 @@ class ViRunCommand(sublime_plugin.TextCommand):
     """Evaluates a full vim command. Everything that happens inside .run() will be left in the
        undo stack so that the "." command works as expected.
     """
+    # Edit object of the current .run() invocation, shared with the hooks we call directly.
+    _edit = None
+
     # TODO: Test me.
     def run(self, edit, **vi_cmd_data):
+        # We only receive the values that differ from the defaults (see CmdData.serialize()).
+        vi_cmd_data = CmdData.from_args(vi_cmd_data)
         self.debug("Data in ViRunCommand:", vi_cmd_data)
 
+        self._edit = edit
+
         state = VintageState(self.view)
 
         try:
@@ -112,7 +123,7 @@ class ViRunCommand(sublime_plugin.TextCommand):
             # TODO: Extract method.
             if vi_cmd_data['scroll_into_view']:
                 if vi_cmd_data['scroll_command']:
-                    self.view.run_command(*vi_cmd_data['scroll_command'])
+                    self.run_hook(*vi_cmd_data['scroll_command'])
                 else:
                     # TODO: If moving by lines, scroll the minimum amount to display the new sels.
                     self.view.show(self.view.sel()[0])
@@ -126,13 +137,28 @@ class ViRunCommand(sublime_plugin.TextCommand):
             state = VintageState(self.view)
             state.next_mode = vi_cmd_data['next_mode']
             state.next_mode_command = vi_cmd_data['follow_up_mode']
+            self._edit = None
+
+    def run_hook(self, cmd, args=None):
+        """Runs a motion, action or hook. Vintageous' own text commands are called directly so
+           that they share our edit object; anything else goes through View.run_command().
+           Either way, all changes end up in the same undo group.
+        """
+        command = find_direct_command(cmd) if self._edit else None
+        if command is None:
+            if args is None:
+                self.view.run_command(cmd)
+            else:
+                self.view.run_command(cmd, args)
+            return
+
+        command(self.view).run(self._edit, **(args or {}))
 
     def reorient_begin_to_end(self):
-        new_sel = []
-        for s in self.view.sel():
-            new_sel.append(sublime.Region(s.begin(), s.end()))
-        self.view.sel().clear()
-        self.view.sel().add_all(new_sel)
+        def f(view, s):
+            return sublime.Region(s.begin(), s.end())
+
+        regions_transformer(self.view, f)
 
     # TODO: Test me.
     def save_caret_pos(self):
@@ -147,6 +173,12 @@ class ViRunCommand(sublime_plugin.TextCommand):
         self.do_pre_motion(vi_cmd_data)
 
         count = vi_cmd_data['count']
+        if count > 1 and self.motion_takes_count(vi_cmd_data):
+            # Let the motion find the target for the whole count in one go.
+            args = vi_cmd_data['motion'].setdefault('args', {})
+            args['count'] = (args.get('count') or 1) * count
+            count = 1
+
         for x in range(count):
             self.reorient_caret(vi_cmd_data)
             self.do_pre_every_motion(vi_cmd_data, x, count)
@@ -161,6 +193,18 @@ class ViRunCommand(sublime_plugin.TextCommand):
         self.reposition_caret(vi_cmd_data)
         self.add_to_jump_list(vi_cmd_data)
 
+    def motion_takes_count(self, vi_cmd_data):
+        """Motion commands declaring `takes_count = True` accept a 'count' argument and move
+           that many times on their own, so we don't need to run them once per count. Hooks that
+           must run between iterations force the loop anyway.
+        """
+        if (vi_cmd_data['pre_every_motion'] or vi_cmd_data['post_every_motion'] or
+            vi_cmd_data['last_motion'] or vi_cmd_data['__reorient_caret']):
+                return False
+
+        command = find_direct_command(vi_cmd_data['motion'].get('command'))
+        return getattr(command, 'takes_count', False)
+
     # TODO: Test me.
     # XXX: Is this method needed?
     def reorient_caret(self, vi_cmd_data):
@@ -173,43 +217,41 @@ class ViRunCommand(sublime_plugin.TextCommand):
                  vi_cmd_data['motion']['args'].get('by') == 'lines' or
                  vi_cmd_data['motion']['args'].get('by') == 'words')):
                     if vi_cmd_data['motion']['args'].get('forward'):
-                        self.view.run_command('reorient_caret', {'mode': vi_cmd_data['mode']})
+                        self.run_hook('reorient_caret', {'mode': vi_cmd_data['mode']})
                     else:
-                        self.view.run_command('reorient_caret', {'forward': False, 'mode': vi_cmd_data['mode']})
+                        self.run_hook('reorient_caret', {'forward': False, 'mode': vi_cmd_data['mode']})
 
     # TODO: Test me.
     def reposition_caret(self, vi_cmd_data):
         if self.view.has_non_empty_selection_region():
             if vi_cmd_data['reposition_caret']:
-                self.view.run_command(*vi_cmd_data['reposition_caret'])
+                self.run_hook(*vi_cmd_data['reposition_caret'])
 
     # TODO: Test me.
     def restore_original_carets_if_needed(self, vi_cmd_data):
         if vi_cmd_data['restore_original_carets'] == True:
-            self.view.sel().clear()
-            for s in self.old_sels:
-                # XXX: If the buffer has changed, this won't work well.
-                self.view.sel().add(s)
+            # XXX: If the buffer has changed, this won't work well.
+            replace_sels(self.view, self.old_sels)
 
     # TODO: Test me.
     def do_modify_selections(self, vi_cmd_data):
         # Gives command a chance to modify the selection after the motion/action. Useful for
         # cases like 3yk, where we need to collapse to .b (== .begin()).
         if vi_cmd_data['selection_modifier']:
-            self.view.run_command(*vi_cmd_data['selection_modifier'])
+            self.run_hook(*vi_cmd_data['selection_modifier'])
 
         if vi_cmd_data['align_with_xpos']:
             state = VintageState(self.view)
-            self.view.run_command('_align_b_with_xpos', {'xpos': state.xpos})
+            self.run_hook('_align_b_with_xpos', {'xpos': state.xpos})
 
     def do_motion(self, vi_cmd_data):
         cmd = vi_cmd_data['motion']['command']
         args = vi_cmd_data['motion']['args']
         self.debug("Vintageous: Motion command: ", cmd, args)
-        self.view.run_command(cmd, args)
+        self.run_hook(cmd, args)
 
     def do_last_motion(self, vi_cmd_data):
-        self.view.run_command(*vi_cmd_data['last_motion'])
+        self.run_hook(*vi_cmd_data['last_motion'])
 
     def do_pre_every_motion(self, vi_cmd_data, current, total):
         """ST command classes used as 'pre_every_motion' hooks need to take
@@ -223,7 +265,7 @@ class ViRunCommand(sublime_plugin.TextCommand):
                 args = {}
 
             args.update({'current_iteration': current, 'total_iterations': total})
-            self.view.run_command(cmd, args)
+            self.run_hook(cmd, args)
 
     def do_post_every_motion(self, vi_cmd_data, current, total):
         """ST command classes used as 'post_every_motion' hooks need to take
@@ -237,15 +279,15 @@ class ViRunCommand(sublime_plugin.TextCommand):
                 args = {}
 
             args.update({'current_iteration': current, 'total_iterations': total})
-            self.view.run_command(cmd, args)
+            self.run_hook(cmd, args)
 
     def do_pre_motion(self, vi_cmd_data):
         if vi_cmd_data['pre_motion']:
-            self.view.run_command(*vi_cmd_data['pre_motion'])
+            self.run_hook(*vi_cmd_data['pre_motion'])
 
     def do_post_motion(self, vi_cmd_data):
         for post_motion in vi_cmd_data['post_motion']:
-            self.view.run_command(*post_motion)
+            self.run_hook(*post_motion)
 
     def do_action(self, vi_cmd_data):
         self.debug("Vintageous: Action command: ", vi_cmd_data['action'])
@@ -261,7 +303,10 @@ class ViRunCommand(sublime_plugin.TextCommand):
             # Some actions that don't take a motion apply the count to the action. For example,
             # > in visual mode.
             i = vi_cmd_data['count'] if vi_cmd_data['_repeat_action'] else 1
-            runner = self.view if not vi_cmd_data['is_window_command'] else self.view.window()
+            if not vi_cmd_data['is_window_command']:
+                run = self.run_hook
+            else:
+                run = self.view.window().run_command
             if (vi_cmd_data['mode'] == _MODE_INTERNAL_NORMAL and
                 vi_cmd_data['has_training_wheels']):
                     # TODO: Make this optional.
@@ -269,11 +314,11 @@ class ViRunCommand(sublime_plugin.TextCommand):
                     sublime.set_timeout(lambda: self.view.erase_regions('vi_training_wheels'), 350)
                     self.view.add_regions('vi_training_wheels', sels, 'comment', '', sublime.DRAW_NO_FILL)
             for t in range(i):
-                runner.run_command(cmd, args)
+                run(cmd, args)
 
     def do_post_action(self, vi_cmd_data):
         if vi_cmd_data['post_action']:
-            self.view.run_command(*vi_cmd_data['post_action'])
+            self.run_hook(*vi_cmd_data['post_action'])
 
     def add_to_jump_list(self, vi_cmd_data):
         if vi_cmd_data['is_jump']:
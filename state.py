@@ -4,12 +4,19 @@ import sublime_plugin
 import threading
 
 from Vintageous.vi import actions
+from Vintageous.vi import clipboard
 from Vintageous.vi import constants
+from Vintageous.vi import hlsearch
 from Vintageous.vi import inputs
 from Vintageous.vi import motions
 from Vintageous.vi import registers
+from Vintageous.vi import session
 from Vintageous.vi import utils
+from Vintageous.vi.boundaries import drop_boundary_index
+from Vintageous.vi.brackets import drop_bracket_index
 from Vintageous.vi.cmd_data import CmdData
+from Vintageous.vi.commands import drop_direct_commands
+from Vintageous.vi.commands import is_own_command
 from Vintageous.vi.constants import _MODE_INTERNAL_NORMAL
 from Vintageous.vi.constants import ACTION_OR_MOTION
 from Vintageous.vi.constants import ACTIONS_EXITING_TO_INSERT_MODE
@@ -31,13 +38,24 @@ from Vintageous.vi.constants import MODE_VISUAL_LINE
 from Vintageous.vi.constants import MODE_VISUAL_BLOCK
 from Vintageous.vi.constants import MOTION_TRANSLATION_TABLE
 from Vintageous.vi.constants import STASH
+from Vintageous.vi.contexts import drop_snapshot
 from Vintageous.vi.contexts import KeyContext
+from Vintageous.vi.contexts import load_keymap
 from Vintageous.vi.extend import PluginManager
+from Vintageous.vi.lines import drop_line_index
 from Vintageous.vi.marks import Marks
+from Vintageous.vi.matches import drop_match_index
+from Vintageous.vi.quotes import drop_quote_positions
 from Vintageous.vi.registers import Registers
+from Vintageous.vi.session import PersistentDict
+from Vintageous.vi.settings import drop_all_vintage_settings
+from Vintageous.vi.settings import drop_vintage_settings
+from Vintageous.vi.settings import flush_vintage_settings
 from Vintageous.vi.settings import SettingsManager
 from Vintageous.vi.settings import SublimeSettings
 from Vintageous.vi.settings import VintageSettings
+from Vintageous.vi.tags import drop_tag_index
+from Vintageous.vi.words import drop_word_snapshot
 
 
 # Some commands gather user input through input panels. An input panel is just a view, so when it
@@ -97,6 +115,12 @@ plugin_manager = None
 def plugin_loaded():
     global plugin_manager
     plugin_manager = PluginManager()
+    drop_direct_commands()
+    try:
+        load_keymap()
+    except IOError:
+        # Context keys will be compiled as they're first queried instead.
+        pass
     view = sublime.active_window().active_view()
     _init_vintageous(view)
 
@@ -108,16 +132,22 @@ def unload_handler():
             v.settings().set('command_mode', False)
             v.settings().set('inverse_caret_state', False)
             v.settings().set('vintage', {})
+    drop_all_vintage_settings()
+    drop_direct_commands()
+    session.flush()
 
 
 class VintageState(object):
     """ Stores per-view state using View.Settings() for storage.
+
+        Reads and writes go to an in-process copy of the view's settings, which is flushed back
+        to View.Settings() after every command (see VintageStateTracker).
     """
 
     registers = Registers()
     context = KeyContext()
     marks = Marks()
-    macros = {}
+    macros = PersistentDict('macros')
     # We maintain a stack of parsers for user input.
     user_input_parsers = []
 
@@ -147,7 +177,7 @@ class VintageState(object):
             self.view.set_overwrite_status(False)
 
         # Clear regions outlined by buffer search commands.
-        self.view.erase_regions('vi_search')
+        hlsearch.clear(self.view)
 
         if not self.buffer_was_changed_in_visual_mode():
             # We've been in some visual mode, but we haven't modified the buffer at all.
@@ -239,7 +269,7 @@ class VintageState(object):
         # Set an upper limit to look-ups in the undo stack.
         for i in range(0, -249, -1):
             cmd_name, args, _ = self.view.command_history(i)
-            if (cmd_name == 'vi_run' and args['action'] and
+            if (cmd_name == 'vi_run' and args.get('action') and
                 args['action']['command'] == visual_cmd):
                     break
 
@@ -764,7 +794,7 @@ class VintageState(object):
             # things depending on the mode we are in.
             if vi_cmd_data['_mark_groups_for_gluing']:
                 self.view.run_command('maybe_mark_undo_groups_for_gluing')
-            self.view.run_command('vi_run', vi_cmd_data)
+            self.view.run_command('vi_run', vi_cmd_data.serialize())
             self.reset()
         else:
             # If we have a digraph start, the global data is in an invalid state because we
@@ -804,7 +834,7 @@ class VintageState(object):
             # things depending on the mode we are in.
             if vi_cmd_data['_mark_groups_for_gluing']:
                 self.view.run_command('maybe_mark_undo_groups_for_gluing')
-            self.view.run_command('vi_run', vi_cmd_data)
+            self.view.run_command('vi_run', vi_cmd_data.serialize())
             self.reset()
 
 
@@ -828,7 +858,7 @@ class VintageState(object):
         # Motion only, like in '3j'.
         elif self.motion:
             vi_cmd_data = self.parse_motion()
-            self.view.run_command('vi_run', vi_cmd_data)
+            self.view.run_command('vi_run', vi_cmd_data.serialize())
             self.reset()
 
         # Action only, like in 'd' or 'esc'. Some actions can be executed without a motion.
@@ -954,9 +984,53 @@ class VintageStateTracker(sublime_plugin.EventListener):
         view.run_command('_vi_adjust_carets', {'mode': state.mode})
 
     def on_query_context(self, view, key, operator, operand, match_all):
+        # Sublime Text asks every plugin about every context key it doesn't know; ours all start
+        # with 'vi_'.
+        if not key.startswith('vi_'):
+            return None
         vintage_state = VintageState(view)
         return vintage_state.context.check(key, operator, operand, match_all)
 
+    def on_text_command(self, view, command_name, args):
+        # Commands from Sublime Text or other plugins (copy, cut, copy_path...) may set the
+        # clipboard, so push our latest write before they run, not after.
+        if not is_own_command(command_name):
+            clipboard.flush()
+
+    def on_window_command(self, window, command_name, args):
+        if not is_own_command(command_name):
+            clipboard.flush()
+
+    def on_post_text_command(self, view, command_name, args):
+        flush_vintage_settings(view)
+        if not is_own_command(command_name):
+            clipboard.reset()
+
+    def on_post_window_command(self, window, command_name, args):
+        view = window.active_view()
+        if view is not None:
+            flush_vintage_settings(view)
+        if not is_own_command(command_name):
+            clipboard.reset()
+
+    def on_deactivated(self, view):
+        flush_vintage_settings(view)
+        # Other applications may read or change the clipboard from now on.
+        clipboard.invalidate()
+
+    def on_close(self, view):
+        flush_vintage_settings(view)
+        drop_vintage_settings(view)
+        drop_snapshot(view)
+        drop_line_index(view)
+        hlsearch.cancel(view)
+        drop_match_index(view)
+        drop_bracket_index(view)
+        drop_tag_index(view)
+        drop_quote_positions(view)
+        drop_boundary_index(view)
+        drop_word_snapshot(view)
+
 
 # TODO: Test me.
 class ViFocusRestorerEvent(sublime_plugin.EventListener):
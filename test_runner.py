@@ -7,6 +7,8 @@ import os
 import unittest
 import tempfile
 
+from Vintageous.vi.settings import drop_vintage_settings
+
 
 # A tuple: (low level file_descriptor, path) as returned by `tempfile.mkstemp()`.
 TEST_DATA_PATH = None
@@ -32,6 +34,7 @@ class TestsState(object):
     @staticmethod
     def reset_view_state():
         TestsState.view.settings().set('vintage', {})
+        drop_vintage_settings(TestsState.view)
         TestsState.view.sel().clear()
         TestsState.view.sel().add(sublime.Region(0, 0))
 
@@ -42,6 +45,18 @@ TESTS_MARKS = 'Vintageous.tests.vi.test_marks'
 TESTS_STATE = 'Vintageous.tests.test_state'
 TESTS_CONSTANTS = 'Vintageous.tests.vi.test_constants'
 TESTS_CMD_DATA = 'Vintageous.tests.vi.test_cmd_data'
+TESTS_CONTEXTS = 'Vintageous.tests.vi.test_contexts'
+TESTS_LINES = 'Vintageous.tests.vi.test_lines'
+TESTS_HLSEARCH = 'Vintageous.tests.vi.test_hlsearch'
+TESTS_MATCHES = 'Vintageous.tests.vi.test_matches'
+TESTS_BRACKETS = 'Vintageous.tests.vi.test_brackets'
+TESTS_TAGS = 'Vintageous.tests.vi.test_tags'
+TESTS_QUOTES = 'Vintageous.tests.vi.test_quotes'
+TESTS_BOUNDARIES = 'Vintageous.tests.vi.test_boundaries'
+TESTS_WORDS = 'Vintageous.tests.vi.test_words'
+TESTS_CLIPBOARD = 'Vintageous.tests.vi.test_clipboard'
+TESTS_SESSION = 'Vintageous.tests.vi.test_session'
+TESTS_PATTERNS = 'Vintageous.tests.vi.test_patterns'
 TESTS_KEYMAP = 'Vintageous.tests.test_keymap'
 TESTS_RUN = 'Vintageous.tests.test_run'
 
@@ -62,11 +77,22 @@ TESTS_CMDS_ACTION_VI_BIG_S = 'Vintageous.tests.commands.test__vi_big_s'
 TESTS_EX_CMDS_COPY = 'Vintageous.tests.ex.test_copy'
 TESTS_EX_CMDS_MOVE = 'Vintageous.tests.ex.test_move'
 TESTS_EX_CMDS_DELETE = 'Vintageous.tests.ex.test_delete'
+TESTS_EX_CMDS_SUBSTITUTE = 'Vintageous.tests.ex.test_substitute'
+TESTS_EX_CMDS_GLOBAL = 'Vintageous.tests.ex.test_global'
+TESTS_EX_CMDS_LINE_BLOCKS = 'Vintageous.tests.ex.test_line_blocks'
 
 TESTS_UNITS_WORD = 'Vintageous.tests.vi.test_word'
 TESTS_UNITS_BIG_WORD = 'Vintageous.tests.vi.test_big_word'
 TESTS_UNITS_WORD_END = 'Vintageous.tests.vi.test_word_end'
 
+TESTS_BENCH_STATE_SETTINGS = 'Vintageous.tests.bench.test_state_settings'
+TESTS_BENCH_KEYMAP_CONTEXTS = 'Vintageous.tests.bench.test_keymap_contexts'
+TESTS_BENCH_LINE_INDEX = 'Vintageous.tests.bench.test_line_index'
+TESTS_BENCH_WORD_MOTIONS = 'Vintageous.tests.bench.test_word_motions'
+TESTS_BENCH_BATCH_MOTIONS = 'Vintageous.tests.bench.test_batch_motions'
+TESTS_BENCH_SUBSTITUTE = 'Vintageous.tests.bench.test_substitute'
+TESTS_BENCH_MOVE = 'Vintageous.tests.bench.test_move'
+
 TESTS_CMDS_ALL_SUPPORT = [TESTS_CMDS_SET_ACTION, TESTS_CMDS_SET_MOTION]
 
 TESTS_CMDS_ALL_ACTIONS = [TESTS_CMDS_ACTION_CTRL_X,
@@ -88,6 +114,9 @@ TESTS_EX_CMDS = [
     TESTS_EX_CMDS_COPY,
     TESTS_EX_CMDS_MOVE,
     TESTS_EX_CMDS_DELETE,
+    TESTS_EX_CMDS_SUBSTITUTE,
+    TESTS_EX_CMDS_GLOBAL,
+    TESTS_EX_CMDS_LINE_BLOCKS,
 ]
 
 TESTS_UNITS_ALL = [TESTS_UNITS_WORD,
@@ -95,6 +124,15 @@ TESTS_UNITS_ALL = [TESTS_UNITS_WORD,
                    TESTS_UNITS_WORD_END,
                   ]
 
+TESTS_BENCH_ALL = [TESTS_BENCH_STATE_SETTINGS,
+                   TESTS_BENCH_KEYMAP_CONTEXTS,
+                   TESTS_BENCH_LINE_INDEX,
+                   TESTS_BENCH_WORD_MOTIONS,
+                   TESTS_BENCH_BATCH_MOTIONS,
+                   TESTS_BENCH_SUBSTITUTE,
+                   TESTS_BENCH_MOVE,
+                  ]
+
 TESTS_CMDS_ALL = TESTS_CMDS_ALL_MOTIONS + TESTS_CMDS_ALL_ACTIONS + TESTS_CMDS_ALL_SUPPORT
 
 
@@ -112,6 +150,30 @@ test_suites = {
 
         'cmd_data': ['_pt_run_tests', [TESTS_CMD_DATA]],
 
+        'contexts': ['_pt_run_tests', [TESTS_CONTEXTS]],
+
+        'lines': ['_pt_run_tests', [TESTS_LINES]],
+
+        'hlsearch': ['_pt_run_tests', [TESTS_HLSEARCH]],
+
+        'matches': ['_pt_run_tests', [TESTS_MATCHES]],
+
+        'brackets': ['_pt_run_tests', [TESTS_BRACKETS]],
+
+        'tags': ['_pt_run_tests', [TESTS_TAGS]],
+
+        'quotes': ['_pt_run_tests', [TESTS_QUOTES]],
+
+        'boundaries': ['_pt_run_tests', [TESTS_BOUNDARIES]],
+
+        'words': ['_pt_run_tests', [TESTS_WORDS]],
+
+        'clipboard': ['_pt_run_tests', [TESTS_CLIPBOARD]],
+
+        'session': ['_pt_run_tests', [TESTS_SESSION]],
+
+        'patterns': ['_pt_run_tests', [TESTS_PATTERNS]],
+
         'keymap': ['_pt_run_tests', [TESTS_KEYMAP]],
 
         'commands': ['_pt_run_tests', TESTS_CMDS_ALL],
@@ -119,6 +181,8 @@ test_suites = {
         'units': ['_pt_run_tests', TESTS_UNITS_ALL],
 
         'ex_cmds': ['_pt_run_tests', TESTS_EX_CMDS],
+
+        '_bench_': ['_pt_run_tests', TESTS_BENCH_ALL],
 }
 
 
@@ -1,6 +1,11 @@
 import sublime
 import unittest
 
+import itertools
+import re
+
+from unittest import mock
+
 from Vintageous.test_runner import TestsState
 
 
@@ -44,3 +49,44 @@ def get_sel(view, num):
 
 def first_sel(view):
     return get_sel(view, 0)
+
+
+_fake_view_ids = itertools.count(-1000, -1)
+
+
+def make_fake_view(text, view_id=None, change_count=1, visible=(0, 0), skipped=()):
+    """Returns a mock view over `text` for tests that don't need a real buffer.
+
+       Supports id(), size(), change_count(), substr(), line(), visible_region(), find(),
+       find_all() and find_by_selector(), which returns the `skipped` (a, b) spans. Patterns are
+       run with Python's re module. Each view gets its own id unless `view_id` is given.
+    """
+    view = mock.Mock()
+    view.id.return_value = next(_fake_view_ids) if view_id is None else view_id
+    view.size.return_value = len(text)
+    view.change_count.return_value = change_count
+    view.visible_region.return_value = sublime.Region(*visible)
+    view.find_by_selector.return_value = [sublime.Region(a, b) for (a, b) in skipped]
+
+    def substr(x):
+        if isinstance(x, int):
+            return text[x:x + 1]
+        return text[x.begin():x.end()]
+
+    def line(pt):
+        a = text.rfind('\n', 0, pt) + 1
+        b = text.find('\n', pt)
+        return sublime.Region(a, len(text) if b == -1 else b)
+
+    def find(pattern, start, flags=0):
+        m = re.compile(pattern).search(text, start)
+        return sublime.Region(m.start(), m.end()) if m else sublime.Region(-1, -1)
+
+    def find_all(pattern, flags=0):
+        return [sublime.Region(m.start(), m.end()) for m in re.finditer(pattern, text)]
+
+    view.substr.side_effect = substr
+    view.line.side_effect = line
+    view.find.side_effect = find
+    view.find_all.side_effect = find_all
+    return view
@@ -0,0 +1,79 @@
+"""Benchmarks.
+
+   Benchmarks run through the regular test runner (see the '_bench_' suite in test_runner.py), but
+   they aren't part of '_all_'. They report their figures to the Sublime Text console.
+"""
+
+import time
+
+
+def report(name, **figures):
+    data = ', '.join('{0}={1}'.format(k, v) for (k, v) in sorted(figures.items()))
+    print("Vintageous (bench): {0}: {1}".format(name, data))
+
+
+def timed(f, *args, repeat=1, **kwargs):
+    """Returns the best wall time in seconds out of `repeat` runs of `f`.
+    """
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        f(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if (best is None or elapsed < best) else best
+    return best
+
+
+class CountingSettings(object):
+    """Wraps a sublime.Settings object and counts calls to .get() and .set().
+    """
+    def __init__(self, settings, counter):
+        self._settings = settings
+        self._counter = counter
+
+    def get(self, *args):
+        self._counter['get'] += 1
+        return self._settings.get(*args)
+
+    def set(self, *args):
+        self._counter['set'] += 1
+        return self._settings.set(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._settings, name)
+
+
+class CountingWindow(object):
+    def __init__(self, window, counter):
+        self._window = window
+        self._counter = counter
+
+    def settings(self):
+        return CountingSettings(self._window.settings(), self._counter)
+
+    def __getattr__(self, name):
+        return getattr(self._window, name)
+
+
+class CountingView(object):
+    """Wraps a sublime.View so that calls made through its (and its window's) settings can be
+       counted. Everything else is delegated to the actual view.
+    """
+    def __init__(self, view):
+        self._view = view
+        self.counter = {'get': 0, 'set': 0}
+
+    def settings(self):
+        return CountingSettings(self._view.settings(), self.counter)
+
+    def window(self):
+        return CountingWindow(self._view.window(), self.counter)
+
+    def calls(self):
+        return self.counter['get'] + self.counter['set']
+
+    def reset_counter(self):
+        self.counter['get'] = self.counter['set'] = 0
+
+    def __getattr__(self, name):
+        return getattr(self._view, name)
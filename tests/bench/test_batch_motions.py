@@ -0,0 +1,77 @@
+import unittest
+from unittest import mock
+
+import sublime
+
+from Vintageous.test_runner import TestsState
+from Vintageous.tests import set_text
+from Vintageous.tests.bench import report
+from Vintageous.tests.bench import timed
+from Vintageous.vi.constants import MODE_NORMAL
+from Vintageous.vi.constants import MODE_VISUAL
+from Vintageous.vi.words import drop_word_snapshot
+
+
+LINES = 5000
+TEXT = ''.join('    call_{0}(arg, other.attr) # comment\n'.format(i) for i in range(LINES))
+
+MOTIONS = (
+    ('_vi_w', {'count': 1}),
+    ('_vi_big_w', {'count': 1}),
+    ('_vi_e', {'count': 1}),
+    ('_vi_dollar', {'count': 1}),
+)
+
+
+def per_region(f):
+    def transform(view, sels):
+        return [f(view, s) for s in sels]
+    return transform
+
+
+# Transforms each region through the Sublime Text API, as the motions did before batching.
+patch_batched = mock.patch('Vintageous.motions.batched', per_region)
+patch_units = mock.patch('Vintageous.vi.units.get_word_snapshot', lambda view: view)
+
+
+class TestBatchMotions(unittest.TestCase):
+    def setUp(self):
+        TestsState.reset_view_state()
+        self.view = TestsState.view
+        set_text(self.view, TEXT)
+
+    def tearDown(self):
+        set_text(self.view, '')
+        drop_word_snapshot(self.view)
+
+    def carets(self, n, mode):
+        step = LINES // n
+        if mode == MODE_VISUAL:
+            regions = [sublime.Region(self.view.text_point(row, 4), self.view.text_point(row, 5))
+                       for row in range(0, LINES, step)]
+        else:
+            regions = [sublime.Region(self.view.text_point(row, 4))
+                       for row in range(0, LINES, step)]
+        self.view.sel().clear()
+        self.view.sel().add_all(regions[:n])
+
+    def run_motion(self, name, args, n, mode):
+        drop_word_snapshot(self.view)
+        self.carets(n, mode)
+        args = dict(args, mode=mode)
+        self.view.run_command(name, args)
+        return list(self.view.sel())
+
+    def testMotionsWithManyCarets(self):
+        for name, args in MOTIONS:
+            for n in (1, 100, 500):
+                for mode in (MODE_NORMAL, MODE_VISUAL):
+                    batched = timed(self.run_motion, name, args, n, mode, repeat=3)
+                    result = self.run_motion(name, args, n, mode)
+                    with patch_batched, patch_units:
+                        unbatched = timed(self.run_motion, name, args, n, mode, repeat=3)
+                        self.assertEqual(self.run_motion(name, args, n, mode), result)
+
+                    report('{0} ({1} carets, mode={2})'.format(name, n, mode),
+                           batched=batched,
+                           unbatched=unbatched)
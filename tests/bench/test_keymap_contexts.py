@@ -0,0 +1,60 @@
+import unittest
+
+from Vintageous.state import VintageState
+from Vintageous.test_runner import TestsState
+from Vintageous.tests.bench import report
+from Vintageous.tests.bench import timed
+from Vintageous.vi.constants import MODE_NORMAL
+from Vintageous.vi.contexts import compile_binding
+from Vintageous.vi.contexts import get_snapshot
+from Vintageous.vi.contexts import load_keymap
+from Vintageous.vi.contexts import OPERATORS
+
+
+class TestKeymapReplay(unittest.TestCase):
+    """Replays every context query in the key map, as Sublime Text does on each key press.
+    """
+    def setUp(self):
+        TestsState.reset_view_state()
+        VintageState(TestsState.view).mode = MODE_NORMAL
+        self.bindings = load_keymap()
+        self.queries = [(item['key'], OPERATORS[item.get('operator', 'equal')],
+                         item.get('operand', True), item.get('match_all', False))
+                        for binding in self.bindings
+                        for item in binding.get('context', [])
+                        if item['key'].startswith('vi_')]
+
+    def tearDown(self):
+        TestsState.reset_view_state()
+
+    def replay_by_name(self):
+        context = VintageState(TestsState.view).context
+        context.snapshot = get_snapshot(context.state)
+        for (key, operator, operand, match_all) in self.queries:
+            func = getattr(context, key, None)
+            if func:
+                func(key, operator, operand, match_all)
+
+    def replay_compiled(self):
+        for (key, operator, operand, match_all) in self.queries:
+            VintageState(TestsState.view).context.check(key, operator, operand, match_all)
+
+    def replay_bindings(self, predicates):
+        context = VintageState(TestsState.view).context
+        context.snapshot = get_snapshot(context.state)
+        for predicate in predicates:
+            predicate(context)
+
+    def testReportsQueriesPerSecond(self):
+        predicates = [compile_binding(b.get('context', [])) for b in self.bindings]
+
+        by_name = timed(self.replay_by_name, repeat=10)
+        compiled = timed(self.replay_compiled, repeat=10)
+        bindings = timed(self.replay_bindings, predicates, repeat=10)
+
+        n = len(self.queries)
+        report('key map replay', queries=n,
+               by_name_qps=int(n / by_name),
+               compiled_qps=int(n / compiled),
+               binding_predicates_per_s=int(len(predicates) / bindings))
+        self.assertTrue(n > 0)
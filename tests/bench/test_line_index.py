@@ -0,0 +1,102 @@
+import unittest
+from unittest import mock
+
+import sublime
+
+from Vintageous.ex_commands import CURRENT_LINE_RANGE
+from Vintageous.test_runner import TestsState
+from Vintageous.tests import set_text
+from Vintageous.tests.bench import report
+from Vintageous.tests.bench import timed
+from Vintageous.vi.constants import MODE_NORMAL
+from Vintageous.vi.lines import drop_line_index
+
+
+LINES = 200000
+TEXT = ''.join('line {0} with some text\n'.format(i) for i in range(LINES))
+
+
+class ApiLines(object):
+    """Same interface as LineIndex, but every call goes through the Sublime Text API, as the code
+       did before the index existed.
+    """
+    def __init__(self, view):
+        self.view = view
+
+    @property
+    def last_row(self):
+        return self.view.rowcol(self.view.size())[0]
+
+    def row(self, pt):
+        return self.view.rowcol(pt)[0]
+
+    def rowcol(self, pt):
+        return self.view.rowcol(pt)
+
+    def line_end(self, row):
+        return self.view.line(self.view.text_point(row, 0)).b
+
+    def text_point(self, row, col):
+        return self.view.text_point(row, col)
+
+    def line(self, pt):
+        return self.view.line(pt)
+
+    def full_line(self, pt):
+        return self.view.full_line(pt)
+
+
+patch_transformers = mock.patch('Vintageous.transformers_visual.get_line_index', ApiLines)
+patch_ex_range = mock.patch('Vintageous.ex.ex_range.get_line_index', ApiLines)
+
+
+class TestLineIndex(unittest.TestCase):
+    def setUp(self):
+        TestsState.reset_view_state()
+        self.view = TestsState.view
+        set_text(self.view, TEXT)
+        drop_line_index(self.view)
+
+    def tearDown(self):
+        set_text(self.view, '')
+        drop_line_index(self.view)
+
+    def carets(self, step):
+        self.view.sel().clear()
+        self.view.sel().add_all([sublime.Region(self.view.text_point(row, 0))
+                                 for row in range(0, LINES // 2, step)])
+
+    def vi_j(self, step):
+        self.carets(step)
+        self.view.run_command('_vi_j', {'mode': MODE_NORMAL, 'count': 10000, 'xpos': 0})
+
+    def substitute_all(self):
+        line_range = CURRENT_LINE_RANGE.copy()
+        line_range['left_ref'] = '%'
+        line_range['text_range'] = '%'
+        self.view.run_command('ex_substitute', {'line_range': line_range,
+                                                'pattern': '/some/any/'})
+
+    def testVerticalMotion(self):
+        for carets, step in ((1, LINES), (1000, LINES // 2000)):
+            with_index_cold = timed(self.vi_j, step)
+            with_index = timed(self.vi_j, step, repeat=3)
+            with patch_transformers:
+                without_index = timed(self.vi_j, step, repeat=3)
+
+            report('10000j ({0} carets, {1} lines)'.format(carets, LINES),
+                   with_index_cold=with_index_cold,
+                   with_index=with_index,
+                   without_index=without_index)
+
+    def testSubstituteWholeBuffer(self):
+        with_index = timed(self.substitute_all)
+
+        set_text(self.view, TEXT)
+        with patch_ex_range:
+            without_index = timed(self.substitute_all)
+
+        report(':%s ({0} lines)'.format(LINES),
+               with_index=with_index,
+               without_index=without_index)
+        self.assertEqual(self.view.substr(self.view.line(0)), 'line 0 with any text')
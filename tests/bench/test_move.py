@@ -0,0 +1,86 @@
+import unittest
+from unittest import mock
+
+import sublime
+
+from Vintageous.ex_commands import CURRENT_LINE_RANGE
+from Vintageous.test_runner import TestsState
+from Vintageous.tests import set_text
+from Vintageous.tests.bench import report
+from Vintageous.tests.bench import timed
+
+
+LINES = 100000
+TEXT = ''.join('line {0}\n'.format(i) for i in range(LINES))
+
+MARKS_KEY = 'bench_ex_move'
+
+
+def per_block_transfer(view, edit, blocks, dest, move=False):
+    """Same interface as transfer_blocks(), but inserts and erases the text one block at a time,
+       as :copy and :move did before. Assumes the buffer ends in a newline character.
+    """
+    inserted = 0
+    for block in reversed(blocks):
+        # Blocks after the destination have moved by the text inserted so far.
+        if block.begin() >= dest:
+            block = sublime.Region(block.begin() + inserted, block.end() + inserted)
+        text = view.substr(block)
+        if move:
+            view.erase(edit, block)
+            if block.end() <= dest:
+                dest -= len(text)
+        view.insert(edit, dest, text)
+        inserted += len(text)
+    return sublime.Region(dest, dest + inserted)
+
+
+def full_lines(view, regions):
+    """Same interface as get_line_blocks(), but doesn't merge adjacent lines.
+    """
+    return [view.full_line(r) for r in regions]
+
+
+patch_transfer = mock.patch('Vintageous.ex_commands.transfer_blocks', per_block_transfer)
+patch_blocks = mock.patch('Vintageous.ex_commands.get_line_blocks', full_lines)
+
+
+class TestMove(unittest.TestCase):
+    def setUp(self):
+        TestsState.reset_view_state()
+        self.view = TestsState.view
+
+    def tearDown(self):
+        self.view.erase_regions(MARKS_KEY)
+        set_text(self.view, '')
+
+    def transfer(self, command, regions, address):
+        set_text(self.view, TEXT)
+        self.view.add_regions(MARKS_KEY, regions(self.view))
+        line_range = dict(CURRENT_LINE_RANGE, text_range='', marks=MARKS_KEY)
+        self.view.run_command(command, {'line_range': line_range, 'address': address})
+        return self.view.substr(self.view.line(self.view.text_point(100, 0)))
+
+    def compare(self, name, command, regions, address):
+        blocks = timed(self.transfer, command, regions, address)
+        result = self.transfer(command, regions, address)
+        with patch_transfer, patch_blocks:
+            per_block = timed(self.transfer, command, regions, address)
+            self.assertEqual(self.transfer(command, regions, address), result)
+
+        report('{0} ({1} lines)'.format(name, LINES), blocks=blocks, per_block=per_block)
+
+    def testMoveEveryTenthLineToBof(self):
+        regions = lambda view: [view.line(view.text_point(row, 0))
+                                for row in range(0, LINES, 10)]
+        self.compare(':m0, every tenth line', 'ex_move', regions, '0')
+
+    def testMoveAdjacentLinesToBof(self):
+        regions = lambda view: [view.line(view.text_point(row, 0))
+                                for row in range(LINES // 2, LINES)]
+        self.compare(':m0, second half as single lines', 'ex_move', regions, '0')
+
+    def testCopyEveryTenthLineToBof(self):
+        regions = lambda view: [view.line(view.text_point(row, 0))
+                                for row in range(0, LINES, 10)]
+        self.compare(':t0, every tenth line', 'ex_copy', regions, '0')
@@ -0,0 +1,80 @@
+import unittest
+from unittest import mock
+
+from Vintageous.state import VintageState
+from Vintageous.test_runner import TestsState
+from Vintageous.tests.bench import CountingView
+from Vintageous.tests.bench import report
+from Vintageous.tests.bench import timed
+from Vintageous.vi.settings import drop_vintage_settings
+from Vintageous.vi.settings import flush_vintage_settings
+from Vintageous.vi.settings import get_option
+from Vintageous.vi.settings import SettingsManager
+from Vintageous.vi.settings import VI_OPTIONS
+from Vintageous.vi.settings import VintageSettings
+from Vintageous.vi.settings import WINDOW_SETTINGS
+
+
+class RoundTrippingVintageSettings(VintageSettings):
+    """VintageSettings as it worked before the in-process cache: every access goes through
+       View.Settings() and copies the whole 'vintage' dict.
+    """
+    def __init__(self, view=None):
+        self.view = view
+
+    def __get__(self, instance, owner):
+        if instance is not None:
+            return RoundTrippingVintageSettings(instance.v)
+        return RoundTrippingVintageSettings()
+
+    def _target(self, key):
+        return self.view if (key not in WINDOW_SETTINGS) else self.view.window()
+
+    def __getitem__(self, key):
+        if key in VI_OPTIONS:
+            return get_option(self.view, key)
+        return (self._target(key).settings().get('vintage') or {}).get(key)
+
+    def __setitem__(self, key, value):
+        target = self._target(key)
+        setts = target.settings().get('vintage') or {}
+        setts[key] = value
+        target.settings().set('vintage', setts)
+
+
+def type_3dj(view):
+    state = VintageState(view)
+    state.push_action_digit('3')
+    state.action = 'vi_d'
+    state.motion = 'vi_j'
+    vi_cmd_data = state.parse_motion()
+    state.parse_action(vi_cmd_data)
+    state.reset()
+
+
+class TestSettingsCallsPerKeystroke(unittest.TestCase):
+    def setUp(self):
+        TestsState.reset_view_state()
+        self.view = CountingView(TestsState.view)
+
+    def tearDown(self):
+        drop_vintage_settings(TestsState.view)
+        TestsState.reset_view_state()
+
+    def count_calls(self):
+        self.view.reset_counter()
+        type_3dj(self.view)
+        flush_vintage_settings(self.view)
+        return self.view.calls()
+
+    def testCachedStateMakesFewerSettingsCalls(self):
+        with mock.patch.object(SettingsManager, 'vi', RoundTrippingVintageSettings()):
+            before = self.count_calls()
+            before_time = timed(type_3dj, self.view, repeat=20)
+
+        after = self.count_calls()
+        after_time = timed(type_3dj, self.view, repeat=20)
+
+        report('settings calls for 3dj', before=before, after=after,
+               before_ms=round(before_time * 1000, 3), after_ms=round(after_time * 1000, 3))
+        self.assertLess(after, before)
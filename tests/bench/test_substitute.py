@@ -0,0 +1,62 @@
+import unittest
+from unittest import mock
+
+import re
+
+from Vintageous.ex_commands import CURRENT_LINE_RANGE
+from Vintageous.test_runner import TestsState
+from Vintageous.tests import set_text
+from Vintageous.tests.bench import report
+from Vintageous.tests.bench import timed
+
+
+LINES = 500000
+# Only one line in a hundred matches.
+TEXT = ''.join(('line {0} with some text\n' if i % 100 else 'line {0} with a match\n').format(i)
+               for i in range(LINES))
+
+
+def per_line_substitutions(view, blocks, pattern, replacement, count=0):
+    """Same interface as find_substitutions(), but substitutes every line through the Sublime Text
+       API, as :substitute did before.
+    """
+    changes = []
+    for block in blocks:
+        for r in view.split_by_newlines(block):
+            line_text = view.substr(view.line(r))
+            rv = re.sub(pattern, replacement, line_text, count=count)
+            changes.append((view.line(r), rv))
+    return changes
+
+
+patch_substitutions = mock.patch('Vintageous.ex_commands.find_substitutions',
+                                 per_line_substitutions)
+
+
+class TestSubstitute(unittest.TestCase):
+    def setUp(self):
+        TestsState.reset_view_state()
+        self.view = TestsState.view
+
+    def tearDown(self):
+        set_text(self.view, '')
+
+    def substitute_all(self, pattern):
+        set_text(self.view, TEXT)
+        line_range = CURRENT_LINE_RANGE.copy()
+        line_range['left_ref'] = '%'
+        line_range['text_range'] = '%'
+        self.view.run_command('ex_substitute', {'line_range': line_range, 'pattern': pattern})
+        return self.view.substr(self.view.full_line(self.view.text_point(100, 0)))
+
+    def testSubstituteWholeBuffer(self):
+        for pattern in ('/match/hit/g', '/some/any/g'):
+            single_pass = timed(self.substitute_all, pattern)
+            result = self.substitute_all(pattern)
+            with patch_substitutions:
+                per_line = timed(self.substitute_all, pattern)
+                self.assertEqual(self.substitute_all(pattern), result)
+
+            report(':%s{0} ({1} lines)'.format(pattern, LINES),
+                   single_pass=single_pass,
+                   per_line=per_line)
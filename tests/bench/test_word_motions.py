@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+
+import sublime
+
+from Vintageous.test_runner import TestsState
+from Vintageous.tests import set_text
+from Vintageous.tests.bench import report
+from Vintageous.tests.bench import timed
+from Vintageous.vi import units
+from Vintageous.vi.constants import MODE_NORMAL
+from Vintageous.vi.words import drop_word_snapshot
+
+
+LINES = 20000
+TEXT = ''.join('word_{0}.attr(arg, "str") + other  \n'.format(i) for i in range(LINES))
+
+
+# Sends every call straight to the Sublime Text API, as the code did before word snapshots.
+patch_units = mock.patch('Vintageous.vi.units.get_word_snapshot', lambda view: view)
+
+
+class TestWordMotions(unittest.TestCase):
+    def setUp(self):
+        TestsState.reset_view_state()
+        self.view = TestsState.view
+        set_text(self.view, TEXT)
+        drop_word_snapshot(self.view)
+
+    def tearDown(self):
+        set_text(self.view, '')
+        drop_word_snapshot(self.view)
+
+    def counted(self, f, count):
+        drop_word_snapshot(self.view)
+        return f(self.view, 0, count=count)
+
+    def vi_w(self, step):
+        drop_word_snapshot(self.view)
+        self.view.sel().clear()
+        self.view.sel().add_all([sublime.Region(self.view.text_point(row, 0))
+                                 for row in range(0, LINES, step)])
+        self.view.run_command('_vi_w', {'mode': MODE_NORMAL, 'count': 5})
+
+    def testCountedMotions(self):
+        for name, f in (('w', units.word_starts),
+                        ('W', units.big_word_starts),
+                        ('e', units.word_ends)):
+            with_snapshot = timed(self.counted, f, 10000, repeat=3)
+            target = self.counted(f, 10000)
+            with patch_units:
+                without_snapshot = timed(self.counted, f, 10000, repeat=3)
+                self.assertEqual(self.counted(f, 10000), target)
+
+            report('10000{0}'.format(name),
+                   with_snapshot=with_snapshot,
+                   without_snapshot=without_snapshot,
+                   words_per_second=int(10000 / with_snapshot))
+
+    def testManyCarets(self):
+        with_snapshot = timed(self.vi_w, 20, repeat=3)
+        with patch_units:
+            without_snapshot = timed(self.vi_w, 20, repeat=3)
+
+        report('5w ({0} carets)'.format(LINES // 20),
+               with_snapshot=with_snapshot,
+               without_snapshot=without_snapshot)
@@ -84,3 +84,20 @@ class Test_vi_ctrl_x_InNormalMode(BufferTest):
 
         self.view.run_command('_vi_ctrl_x', {'mode': _MODE_INTERNAL_NORMAL, 'count': 1})
         self.assertEqual(self.view.substr(self.R(0, self.view.size())), 'foo 100\nfoo bar\nfoo 300\n')
+
+
+class Test_vi_ctrl_a_InNormalMode(BufferTest):
+    def testIncreasesDigitsUnderSelection(self):
+        set_text(self.view, 'foo 9\nfoo 9\n')
+        add_sel(self.view, self.R((0, 4), (0, 4)))
+        add_sel(self.view, self.R((1, 4), (1, 4)))
+
+        self.view.run_command('_vi_ctrl_a', {'mode': _MODE_INTERNAL_NORMAL, 'count': 1})
+        self.assertEqual(self.view.substr(self.R(0, self.view.size())), 'foo 10\nfoo 10\n')
+
+    def testKeepsCaretInPlace(self):
+        set_text(self.view, 'foo 9\n')
+        add_sel(self.view, self.R((0, 4), (0, 4)))
+
+        self.view.run_command('_vi_ctrl_a', {'mode': _MODE_INTERNAL_NORMAL, 'count': 1})
+        self.assertEqual(self.R((0, 4), (0, 4)), first_sel(self.view))
@@ -3,6 +3,7 @@ import unittest
 import sublime
 
 from Vintageous.test_runner import TestsState
+from Vintageous.vi.settings import flush_vintage_settings
 
 
 class TestSetAction(unittest.TestCase):
@@ -11,6 +12,7 @@ class TestSetAction(unittest.TestCase):
 
     def testCanSetAction(self):
         TestsState.view.run_command('set_action', {'action': 'vi_d'})
+        flush_vintage_settings(TestsState.view)
         actual = TestsState.view.settings().get('vintage')['action']
         self.assertEqual('vi_d', actual)
 
@@ -1,6 +1,7 @@
 import unittest
 
 from Vintageous.test_runner import TestsState
+from Vintageous.vi.settings import flush_vintage_settings
 
 
 class TestSetMotion(unittest.TestCase):
@@ -11,5 +12,6 @@ class TestSetMotion(unittest.TestCase):
     # TODO: Mock .eval() so it does not reset the state.
     def testCanSetMotion(self):
         TestsState.view.run_command('set_motion', {'motion': 'vi_l'})
+        flush_vintage_settings(TestsState.view)
         actual = TestsState.view.settings().get('vintage')['motion']
         self.assertEqual('vi_l', actual)
@@ -68,6 +68,38 @@ class Test_ex_copy_Copying_InNormalMode_SingleLine_DefaultStart(BufferTest):
         self.assertEqual(expected, actual)
 
 
+class Test_ex_copy_Copying_Marks(BufferTest):
+    def setUp(self):
+        super().setUp()
+        self.range = dict(CURRENT_LINE_RANGE, text_range='', marks='test_ex_copy')
+
+    def tearDown(self):
+        self.view.erase_regions('test_ex_copy')
+        super().tearDown()
+
+    def testCanCopyScatteredLines(self):
+        set_text(self.view, 'abc\nxxx\nabc\nyyy\nabc')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+        self.view.add_regions('test_ex_copy', [self.R((1, 0), (1, 3)), self.R((3, 0), (3, 3))])
+
+        self.view.run_command('ex_copy', {'address': '0', 'line_range': self.range})
+
+        expected = 'xxx\nyyy\nabc\nxxx\nabc\nyyy\nabc'
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual(expected, actual)
+
+    def testCanCopyLastLineToEof(self):
+        set_text(self.view, 'abc\nxxx')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+        self.view.add_regions('test_ex_copy', [self.R((1, 0), (1, 3))])
+
+        self.view.run_command('ex_copy', {'address': '2', 'line_range': self.range})
+
+        expected = 'abc\nxxx\nxxx'
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual(expected, actual)
+
+
 class Test_ex_copy_Copying_InNormalMode_MultipleLines(BufferTest):
     def setUp(self):
         super().setUp()
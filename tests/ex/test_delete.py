@@ -36,7 +36,7 @@ class Test_ex_delete_Deleting_InNormalMode_SingleLine_DefaultStart(BufferTest):
         self.view.run_command('ex_delete', {'line_range': r})
 
         actual = self.view.substr(self.R(0, self.view.size()))
-        expected = 'abc\nabc\nabc\n'
+        expected = 'abc\nabc\nabc'
         self.assertEqual(expected, actual)
 
     def testCanDeleteAtEof_NewLine(self):
@@ -51,6 +51,32 @@ class Test_ex_delete_Deleting_InNormalMode_SingleLine_DefaultStart(BufferTest):
         expected = 'abc\nabc\nabc\n'
         self.assertEqual(expected, actual)
 
+    def testCanDeleteLastLineAfterNewLine(self):
+        set_text(self.view, 'abc\nxxx\n')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        r = CURRENT_LINE_RANGE.copy()
+        r['left_ref'] = '3'
+        self.view.run_command('ex_delete', {'line_range': r, 'register': 'a'})
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        expected = 'abc\nxxx'
+        self.assertEqual(expected, actual)
+        self.assertEqual(['\n'], VintageState(self.view).registers['a'])
+
+    def testCanStoreLastLineWithoutNewLine(self):
+        set_text(self.view, 'abc\nxxx')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        r = CURRENT_LINE_RANGE.copy()
+        r['left_ref'] = '2'
+        self.view.run_command('ex_delete', {'line_range': r, 'register': 'a'})
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        expected = 'abc'
+        self.assertEqual(expected, actual)
+        self.assertEqual(['xxx\n'], VintageState(self.view).registers['a'])
+
     def testCanDeleteZeroLineRange(self):
         set_text(self.view, 'xxx\nabc\nabc\nabc')
         add_sel(self.view, self.R((1, 0), (1, 0)))
@@ -81,6 +107,41 @@ class Test_ex_delete_Deleting_InNormalMode_SingleLine_DefaultStart(BufferTest):
         self.assertEqual(expected, actual)
 
 
+class Test_ex_delete_Deleting_Marks(BufferTest):
+    def setUp(self):
+        super().setUp()
+        self.range = dict(CURRENT_LINE_RANGE, text_range='', marks='test_ex_delete')
+
+    def tearDown(self):
+        self.view.erase_regions('test_ex_delete')
+        super().tearDown()
+
+    def testCanDeleteMarkedLines(self):
+        set_text(self.view, 'abc\nxxx\nxxx\nabc\nxxx')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+        self.view.add_regions('test_ex_delete', [self.R((1, 0), (1, 3)),
+                                                 self.R((2, 0), (2, 3)),
+                                                 self.R((4, 0), (4, 3))])
+
+        self.view.run_command('ex_delete', {'line_range': self.range})
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        expected = 'abc\nabc'
+        self.assertEqual(expected, actual)
+
+    def testCanStoreMarkedLinesInRegister(self):
+        set_text(self.view, 'abc\nxxx\nxxx\nabc\nxxx')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+        self.view.add_regions('test_ex_delete', [self.R((1, 0), (1, 3)),
+                                                 self.R((2, 0), (2, 3)),
+                                                 self.R((4, 0), (4, 3))])
+
+        self.view.run_command('ex_delete', {'line_range': self.range, 'register': 'a'})
+
+        state = VintageState(self.view)
+        self.assertEqual(['xxx\nxxx\nxxx\n'], state.registers['a'])
+
+
 @unittest.skip("Fixme")
 class Test_ex_delete_Deleting_InNormalMode_MultipleLines(BufferTest):
     def setUp(self):
@@ -145,6 +206,18 @@ class Test_ex_delete_InNormalMode_CaretPosition(BufferTest):
         self.range['text_range'] = '2,4'
         self.view.run_command('ex_delete', {'line_range': self.range})
 
+        actual = list(self.view.sel())
+        expected = [self.R((0, 0), (0, 0))]
+        self.assertEqual(expected, actual)
+
+    def testPutsCaretAtStartOfNextLine(self):
+        set_text(self.view, 'abc\nxxx\nabc\nabc')
+        add_sel(self.view, self.R((3, 0), (3, 0)))
+
+        self.range['left_offset'] = 2
+        self.range['text_range'] = '2,3'
+        self.view.run_command('ex_delete', {'line_range': self.range})
+
         actual = list(self.view.sel())
         expected = [self.R((1, 0), (1, 0))]
         self.assertEqual(expected, actual)
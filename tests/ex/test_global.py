@@ -1,6 +1,12 @@
 import unittest
 
 from Vintageous.ex.parsers.g_cmd import GlobalLexer
+from Vintageous.ex_commands import CURRENT_LINE_RANGE
+from Vintageous.ex_commands import ExGlobal
+
+from Vintageous.tests import set_text
+from Vintageous.tests import add_sel
+from Vintageous.tests import BufferTest
 
 
 class TestGlobalLexer(unittest.TestCase):
@@ -24,5 +30,115 @@ class TestGlobalLexer(unittest.TestCase):
         self.assertEqual(actual, ['\\', 'p#'])
 
 
+class Test_ex_global(BufferTest):
+    def run_global(self, pattern):
+        r = dict(CURRENT_LINE_RANGE, text_range='')
+        self.view.run_command('ex_global', {'line_range': r, 'pattern': pattern})
+
+    def testCanDeleteMatchingLines(self):
+        set_text(self.view, 'abc\nxxx\nabc\nxxx\nxxx\nabc')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.run_global('/xxx/d')
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual('abc\nabc\nabc', actual)
+
+    def testCanDeleteNonMatchingLines(self):
+        set_text(self.view, 'abc\nxxx\nabc\nxxx')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        r = dict(CURRENT_LINE_RANGE, text_range='')
+        self.view.run_command('ex_global', {'line_range': r, 'pattern': '/xxx/d',
+                                            'forced': True})
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual('xxx\nxxx', actual)
+
+    def testTakesPatternsAsTheyAre(self):
+        set_text(self.view, 'a=b\nab\nb')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.run_global(r'/a\=b/d')
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual('ab\nb', actual)
+
+    def testCanUseVimSyntax(self):
+        set_text(self.view, 'color\ncolour\ncolr')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.view.settings().set('vintageous_vim_regex', True)
+        try:
+            self.run_global(r'/colou\=r/d')
+        finally:
+            self.view.settings().erase('vintageous_vim_regex')
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual('colr', actual)
+
+    def testCanSubstituteWithGlobalPattern(self):
+        set_text(self.view, 'abc\nxxx\nabc xxx\nxxx xxx')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.run_global('/xxx/s//yy/g')
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual('abc\nyy\nabc yy\nyy yy', actual)
+
+    def testCanReverseLines(self):
+        set_text(self.view, 'abc\nxxx\nyyy')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.run_global('/^/m0')
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual('yyy\nxxx\nabc', actual)
+
+    def testCanCopyEachLine(self):
+        set_text(self.view, 'xxx\nabc\nxxx\n')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.run_global('/xxx/t.')
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual('xxx\nxxx\nabc\nxxx\nxxx\n', actual)
+
+    def testResolvesSubcommandRangeAgainstEachLine(self):
+        set_text(self.view, 'xxx\na\nb\nxxx\nc\nd')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.run_global('/xxx/.,+1d')
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual('b\nd', actual)
+
+    def testSkipsLinesDeletedByEarlierRuns(self):
+        set_text(self.view, 'xxx\nxxx\nabc\nabc')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.run_global('/xxx/.,+1d')
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual('abc\nabc', actual)
+
+    def testErasesMarks(self):
+        set_text(self.view, 'abc\nxxx')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.run_global('/xxx/d')
+
+        self.assertEqual([], self.view.get_regions(ExGlobal.MARKS_KEY))
+
+    def testDoesNothingWithoutMatches(self):
+        set_text(self.view, 'abc\nabc')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.run_global('/xxx/d')
+
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual('abc\nabc', actual)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from Vintageous.ex.line_blocks import get_line_blocks
+from Vintageous.ex.line_blocks import get_text
+from Vintageous.ex.line_blocks import merge_spans
+from Vintageous.ex.line_blocks import with_eol_before_last
+
+from Vintageous.tests import set_text
+from Vintageous.tests import BufferTest
+
+
+class TestMergeSpans(unittest.TestCase):
+    def testReturnsEmptyListForNoSpans(self):
+        self.assertEqual([], merge_spans([]))
+
+    def testSortsSpans(self):
+        self.assertEqual([(0, 2), (5, 8)], merge_spans([(5, 8), (0, 2)]))
+
+    def testMergesAdjacentSpans(self):
+        self.assertEqual([(0, 8)], merge_spans([(0, 4), (4, 8)]))
+
+    def testMergesOverlappingSpans(self):
+        self.assertEqual([(0, 8)], merge_spans([(0, 6), (2, 8)]))
+
+    def testMergesContainedSpans(self):
+        self.assertEqual([(0, 8)], merge_spans([(0, 8), (2, 4)]))
+
+    def testKeepsSeparateSpans(self):
+        self.assertEqual([(0, 4), (5, 8)], merge_spans([(0, 4), (5, 8)]))
+
+
+class TestGetLineBlocks(BufferTest):
+    def testWidensRegionsToFullLines(self):
+        set_text(self.view, 'abc\nxxx\nabc')
+
+        actual = get_line_blocks(self.view, [self.R((1, 1), (1, 2))])
+        self.assertEqual([self.R((1, 0), (2, 0))], actual)
+
+    def testMergesAdjacentLines(self):
+        set_text(self.view, 'abc\nxxx\nxxx\nabc\nxxx')
+
+        regions = [self.R((2, 0), (2, 3)), self.R((1, 0), (1, 3)), self.R((4, 0), (4, 3))]
+        actual = get_line_blocks(self.view, regions)
+        self.assertEqual([self.R((1, 0), (3, 0)), self.R((4, 0), (4, 3))], actual)
+
+    def testDoesNotTouchLineAfterNewLine(self):
+        set_text(self.view, 'abc\nxxx\nabc')
+
+        actual = get_line_blocks(self.view, [self.R((1, 0), (2, 0))])
+        self.assertEqual([self.R((1, 0), (2, 0))], actual)
+
+    def testCanHandleEmptyLines(self):
+        set_text(self.view, 'abc\n\nabc')
+
+        actual = get_line_blocks(self.view, [self.R((1, 0), (1, 0))])
+        self.assertEqual([self.R((1, 0), (2, 0))], actual)
+
+
+class TestWithEolBeforeLast(BufferTest):
+    def testKeepsBlocksEndingInNewLine(self):
+        set_text(self.view, 'abc\nxxx\nabc\n')
+        blocks = [self.R((1, 0), (2, 0))]
+
+        self.assertEqual(blocks, with_eol_before_last(self.view, blocks))
+
+    def testTakesNewLineBeforeLastLineWithoutNewLine(self):
+        set_text(self.view, 'abc\nxxx\nabc')
+        blocks = [self.R((0, 0), (1, 0)), self.R((2, 0), (2, 3))]
+
+        actual = with_eol_before_last(self.view, blocks)
+        self.assertEqual([self.R((0, 0), (1, 0)), self.R((1, 3), (2, 3))], actual)
+
+    def testTakesNewLineBeforeEmptyLastLine(self):
+        set_text(self.view, 'abc\nxxx\n')
+        blocks = [self.R((2, 0), (2, 0))]
+
+        self.assertEqual([self.R((1, 3), (2, 0))], with_eol_before_last(self.view, blocks))
+
+    def testKeepsBlockStartingAtBof(self):
+        set_text(self.view, 'abc')
+        blocks = [self.R((0, 0), (0, 3))]
+
+        self.assertEqual(blocks, with_eol_before_last(self.view, blocks))
+
+
+class TestGetText(BufferTest):
+    def testReturnsTextInBlocks(self):
+        set_text(self.view, 'abc\nxxx\nxxx\nabc\nxxx')
+        blocks = get_line_blocks(self.view, [self.R((1, 0), (2, 3)), self.R((4, 0), (4, 3))])
+
+        self.assertEqual('xxx\nxxx\nxxx', get_text(self.view, blocks))
@@ -126,6 +126,75 @@ class Test_ex_move_Moveing_InNormalMode_MultipleLines(BufferTest):
         self.assertEqual(expected, actual)
 
 
+class Test_ex_move_Moving_Marks(BufferTest):
+    def setUp(self):
+        super().setUp()
+        self.range = dict(CURRENT_LINE_RANGE, text_range='', marks='test_ex_move')
+
+    def tearDown(self):
+        self.view.erase_regions('test_ex_move')
+        super().tearDown()
+
+    def mark_lines(self, *rows):
+        self.view.add_regions('test_ex_move', [self.view.line(self.view.text_point(row, 0))
+                                               for row in rows])
+
+    def testCanMoveScatteredLinesToBof(self):
+        set_text(self.view, 'abc\nxxx\nabc\nyyy\nabc')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+        self.mark_lines(1, 3)
+
+        self.view.run_command('ex_move', {'address': '0', 'line_range': self.range})
+
+        expected = 'xxx\nyyy\nabc\nabc\nabc'
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual(expected, actual)
+
+    def testCanMoveLinesOnBothSidesOfAddress(self):
+        set_text(self.view, 'xxx\nabc\nabc\nyyy\nabc')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+        self.mark_lines(0, 3)
+
+        self.view.run_command('ex_move', {'address': '2', 'line_range': self.range})
+
+        expected = 'abc\nxxx\nyyy\nabc\nabc'
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual(expected, actual)
+
+    def testCanMoveLastLineWithoutNewLine(self):
+        set_text(self.view, 'abc\nxxx\nabc\nyyy')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+        self.mark_lines(1, 3)
+
+        self.view.run_command('ex_move', {'address': '0', 'line_range': self.range})
+
+        expected = 'xxx\nyyy\nabc\nabc'
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual(expected, actual)
+
+    def testCanMergeOverlappingRanges(self):
+        set_text(self.view, 'abc\nxxx\nyyy\nabc')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+        self.view.add_regions('test_ex_move', [self.R((1, 0), (2, 3)), self.R((2, 0), (2, 3))])
+
+        self.view.run_command('ex_move', {'address': '4', 'line_range': self.range})
+
+        expected = 'abc\nabc\nxxx\nyyy'
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual(expected, actual)
+
+    def testCannotMoveLinesIntoThemselves(self):
+        set_text(self.view, 'abc\nxxx\nyyy\nabc')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+        self.view.add_regions('test_ex_move', [self.R((1, 0), (2, 3))])
+
+        self.view.run_command('ex_move', {'address': '2', 'line_range': self.range})
+
+        expected = 'abc\nxxx\nyyy\nabc'
+        actual = self.view.substr(self.R(0, self.view.size()))
+        self.assertEqual(expected, actual)
+
+
 class Test_ex_move_InNormalMode_CaretPosition(BufferTest):
     def testCanRepositionCaret(self):
         set_text(self.view, 'abc\nxxx\nabc\nabc')
@@ -1,9 +1,18 @@
 import unittest
 
+import re
+
 from Vintageous.ex.parsers.s_cmd import SubstituteLexer
 from Vintageous.ex.parsers.parsing import RegexToken
 from Vintageous.ex.parsers.parsing import Lexer
 from Vintageous.ex.parsers.parsing import EOF
+from Vintageous.ex.substitute import needs_line_by_line
+from Vintageous.ex.substitute import substitute_text
+from Vintageous.ex_commands import CURRENT_LINE_RANGE
+
+from Vintageous.tests import set_text
+from Vintageous.tests import add_sel
+from Vintageous.tests import BufferTest
 
 
 class TestRegexToken(unittest.TestCase):
@@ -143,3 +152,90 @@ class TestSubstituteLexer(unittest.TestCase):
         actual = self.lexer.parse(r"/foo\//hello")
 
         self.assertEqual(actual, ['foo/', 'hello', '', ''])
+
+
+class Test_substitute_text(unittest.TestCase):
+    def substitute(self, text, pattern, replacement, count=0, flags=0):
+        return list(substitute_text(text, re.compile(pattern, flags), replacement, count))
+
+    def testSkipsLinesWithoutMatches(self):
+        actual = self.substitute('abc\nfoo\nxyz', 'foo', 'bar')
+        self.assertEqual(actual, [(4, 7, 'bar')])
+
+    def testCanReplaceFirstMatchOnlyInEveryLine(self):
+        actual = self.substitute('foo foo\nfoo foo', 'foo', 'bar', count=1)
+        self.assertEqual(actual, [(0, 7, 'bar foo'), (8, 15, 'bar foo')])
+
+    def testCanReplaceAllMatches(self):
+        actual = self.substitute('foo foo\nfoo foo', 'foo', 'bar')
+        self.assertEqual(actual, [(0, 7, 'bar bar'), (8, 15, 'bar bar')])
+
+    def testAnchorsMatchInEveryLine(self):
+        actual = self.substitute('a\n\nb', '^', '# ')
+        self.assertEqual(actual, [(0, 1, '# a'), (2, 2, '# '), (3, 4, '# b')])
+
+        actual = self.substitute('a\nb', '$', ';')
+        self.assertEqual(actual, [(0, 1, 'a;'), (2, 3, 'b;')])
+
+    def testMatchesDoNotSpanLines(self):
+        actual = self.substitute('foo\nbar', r'o\s+b', 'X')
+        self.assertEqual(actual, [])
+
+    def testMatchesSpanningLinesDoNotHideLaterMatches(self):
+        actual = self.substitute('ab\nab', r'b\s*a|b$', 'X')
+        self.assertEqual(actual, [(0, 2, 'aX'), (3, 5, 'aX')])
+
+    def testHonorsPatternFlags(self):
+        actual = self.substitute('FOO', 'foo', 'bar', flags=re.IGNORECASE)
+        self.assertEqual(actual, [(0, 3, 'bar')])
+
+    def testCanUseGroupsInReplacement(self):
+        actual = self.substitute('foo = 1', r'(\w+) = (\d)', r'\2 = \1')
+        self.assertEqual(actual, [(0, 7, '1 = foo')])
+
+    def testMatchesStringAnchorsInEveryLine(self):
+        actual = self.substitute('ax\nbx', r'x\Z', 'y')
+        self.assertEqual(actual, [(0, 2, 'ay'), (3, 5, 'by')])
+
+        actual = self.substitute('ab\nab', r'\Aa', 'x')
+        self.assertEqual(actual, [(0, 2, 'xb'), (3, 5, 'xb')])
+
+    def testMatchesNegativeLookaroundsAsInLineOnItsOwn(self):
+        actual = self.substitute('ax\nbx', r'x(?!\s)', 'y')
+        self.assertEqual(actual, [(0, 2, 'ay'), (3, 5, 'by')])
+
+        actual = self.substitute('a\nb', r'(?<!\s)b', 'x')
+        self.assertEqual(actual, [(2, 3, 'x')])
+
+
+class Test_needs_line_by_line(unittest.TestCase):
+    def testDetectsStringAnchorsAndNegativeLookarounds(self):
+        for pattern in (r'\Afoo', r'foo\Z', r'foo(?!\n)', r'(?<!\s)foo'):
+            self.assertTrue(needs_line_by_line(re.compile(pattern)), pattern)
+
+    def testIgnoresEscapedCharacters(self):
+        for pattern in (r'foo', r'^foo$', r'\\A', r'\(?!', r'foo(?=\n)'):
+            self.assertFalse(needs_line_by_line(re.compile(pattern)), pattern)
+
+
+class Test_ex_substitute(BufferTest):
+    def substitute(self, pattern):
+        line_range = dict(CURRENT_LINE_RANGE, left_ref='%', text_range='%')
+        self.view.run_command('ex_substitute', {'line_range': line_range, 'pattern': pattern})
+        return self.view.substr(self.R(0, self.view.size()))
+
+    def testTakesPatternsAsTheyAre(self):
+        set_text(self.view, 'a=b ab\nab')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.assertEqual('x ab\nab', self.substitute(r'/a\=b/x/g'))
+
+    def testCanUseVimSyntax(self):
+        set_text(self.view, 'a=b ab\nab')
+        add_sel(self.view, self.R((0, 0), (0, 0)))
+
+        self.view.settings().set('vintageous_vim_regex', True)
+        try:
+            self.assertEqual('a=x x\nx', self.substitute(r'/a\=b/x/g'))
+        finally:
+            self.view.settings().erase('vintageous_vim_regex')
@@ -210,6 +210,33 @@ class Test_do_last_motion(unittest.TestCase):
         self.vi_run.view.run_command.assert_called_once_with('foo', {'bar': 100})
 
 
+class Test_run_hook(unittest.TestCase):
+    def setUp(self):
+        self.vi_run = ViRunCommand(mock.Mock())
+
+    def testFallsBackToRunCommandOutsideRun(self):
+        with mock.patch('Vintageous.run.find_direct_command') as fdc:
+            self.vi_run.run_hook('foo', {'bar': 100})
+            self.assertEqual(fdc.call_count, 0)
+            self.vi_run.view.run_command.assert_called_once_with('foo', {'bar': 100})
+
+    def testFallsBackToRunCommandForUnknownCommands(self):
+        self.vi_run._edit = mock.Mock()
+        with mock.patch('Vintageous.run.find_direct_command') as fdc:
+            fdc.return_value = None
+            self.vi_run.run_hook('foo')
+            self.vi_run.view.run_command.assert_called_once_with('foo')
+
+    def testCallsKnownCommandsDirectly(self):
+        edit = self.vi_run._edit = mock.Mock()
+        with mock.patch('Vintageous.run.find_direct_command') as fdc:
+            self.vi_run.run_hook('foo', {'bar': 100})
+            fdc.assert_called_once_with('foo')
+            fdc.return_value.assert_called_once_with(self.vi_run.view)
+            fdc.return_value.return_value.run.assert_called_once_with(edit, bar=100)
+            self.assertEqual(self.vi_run.view.run_command.call_count, 0)
+
+
 class Test_do_motion(unittest.TestCase):
     def setUp(self):
         self.vi_run = ViRunCommand(mock.Mock())
@@ -258,7 +285,7 @@ class Test_restore_original_carets_if_needed(unittest.TestCase):
         self.vi_run.view.sel.return_value = sel
         self.vi_run.restore_original_carets_if_needed(vi_cmd_data)
         sel.clear.assert_called_once_with()
-        sel.add.assert_called_with(100)
+        sel.add_all.assert_called_once_with([100])
 
 
 class Test_reposition_caret(unittest.TestCase):
@@ -376,6 +403,54 @@ class Test_do_whole_motion(unittest.TestCase):
             self.assertEqual(addtjl.call_count, 1)
 
 
+    def testRunsMotionOnceIfItTakesCount(self):
+        vi_cmd_data = { '_repeat_action': False,
+                        'count': 10000,
+                        'last_motion': None,
+                        'motion': {'command': '_vi_j', 'args': {'count': 1}},
+                      }
+
+        with mock.patch.object(self.vi_run, 'motion_takes_count') as mtc, \
+             mock.patch.object(self.vi_run, 'reorient_caret'), \
+             mock.patch.object(self.vi_run, 'do_pre_motion'), \
+             mock.patch.object(self.vi_run, 'do_pre_every_motion'), \
+             mock.patch.object(self.vi_run, 'do_motion') as dm, \
+             mock.patch.object(self.vi_run, 'do_post_every_motion'), \
+             mock.patch.object(self.vi_run, 'do_post_motion'), \
+             mock.patch.object(self.vi_run, 'reposition_caret'), \
+             mock.patch.object(self.vi_run, 'add_to_jump_list'):
+            mtc.return_value = True
+
+            self.vi_run.do_whole_motion(vi_cmd_data)
+
+            self.assertEqual(dm.call_count, 1)
+            self.assertEqual(vi_cmd_data['motion']['args']['count'], 10000)
+
+    def testMotionDoesNotTakeCountIfHooksMustRunEveryTime(self):
+        vi_cmd_data = { 'pre_every_motion': None,
+                        'post_every_motion': ['foo'],
+                        'last_motion': None,
+                        '__reorient_caret': False,
+                        'motion': {'command': '_vi_j'},
+                      }
+        with mock.patch('Vintageous.run.find_direct_command') as fdc:
+            fdc.return_value.takes_count = True
+            self.assertFalse(self.vi_run.motion_takes_count(vi_cmd_data))
+
+            vi_cmd_data['post_every_motion'] = None
+            self.assertTrue(self.vi_run.motion_takes_count(vi_cmd_data))
+
+    def testMotionDoesNotTakeCountUnlessDeclared(self):
+        vi_cmd_data = { 'pre_every_motion': None,
+                        'post_every_motion': None,
+                        'last_motion': None,
+                        '__reorient_caret': False,
+                        'motion': {'command': 'move'},
+                      }
+        with mock.patch('Vintageous.run.find_direct_command') as fdc:
+            fdc.return_value = None
+            self.assertFalse(self.vi_run.motion_takes_count(vi_cmd_data))
+
 class Test_run(unittest.TestCase):
     def setUp(self):
         self.vi_run = ViRunCommand(mock.Mock())
@@ -23,6 +23,8 @@ from Vintageous.tests import set_text
 from Vintageous.tests import add_sel
 from Vintageous.tests import make_region
 import Vintageous.state
+from Vintageous.vi.settings import drop_vintage_settings
+from Vintageous.vi.settings import flush_vintage_settings
 
 
 class TestCaseUsingView(unittest.TestCase):
@@ -31,6 +33,7 @@ class TestCaseUsingView(unittest.TestCase):
     def setUp(self):
         TestsState.view.settings().erase('vintage')
         TestsState.view.window().settings().erase('vintage')
+        drop_vintage_settings(TestsState.view)
         TestsState.view.settings().erase('is_widget')
         self.state = VintageState(TestsState.view)
         self.state.view.set_overwrite_status(False)
@@ -242,6 +245,7 @@ class Test_update_repeat_command(TestCaseUsingView):
 class TestVintageStateProperties(TestCaseUsingView):
     def testCantSetAction(self):
         self.state.action = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['action'], 'foo')
 
     def testCantGetAction(self):
@@ -250,6 +254,7 @@ class TestVintageStateProperties(TestCaseUsingView):
 
     def testCantSetMotion(self):
         self.state.motion = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['motion'], 'foo')
 
     def testCantGetMotion(self):
@@ -258,6 +263,7 @@ class TestVintageStateProperties(TestCaseUsingView):
 
     def testCantSetRegister(self):
         self.state.register = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['register'], 'foo')
 
     def testCantGetRegister(self):
@@ -268,6 +274,7 @@ class TestVintageStateProperties(TestCaseUsingView):
         self.state.user_input_parsers.append(lambda x: True)
         self.state.motion = 'bogus'
         self.state.user_input = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['user_motion_input'], 'foo')
 
     def testCantGetUserInput(self):
@@ -278,6 +285,7 @@ class TestVintageStateProperties(TestCaseUsingView):
 
     def testCantSetExpectingRegister(self):
         self.state.expecting_register = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['expecting_register'], 'foo')
 
     def testCantGetExpectingRegister(self):
@@ -286,6 +294,7 @@ class TestVintageStateProperties(TestCaseUsingView):
 
     def testCantSetExpectingUserInput(self):
         self.state.expecting_user_input = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['expecting_user_input'], 'foo')
 
     def testCantGetExpectingUserInput(self):
@@ -294,6 +303,7 @@ class TestVintageStateProperties(TestCaseUsingView):
 
     def testCantSetExpectingCancelAction(self):
         self.state.cancel_action = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['cancel_action'], 'foo')
 
     def testCantGetExpectingCancelAction(self):
@@ -302,6 +312,7 @@ class TestVintageStateProperties(TestCaseUsingView):
 
     def testCantSetMode(self):
         self.state.mode = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['mode'], 'foo')
 
     def testCantGetMode(self):
@@ -310,6 +321,7 @@ class TestVintageStateProperties(TestCaseUsingView):
 
     def testCantSetMotionDigits(self):
         self.state.motion_digits = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['motion_digits'], 'foo')
 
     def testCantGetMotionDigits(self):
@@ -318,6 +330,7 @@ class TestVintageStateProperties(TestCaseUsingView):
 
     def testCantSetActionDigits(self):
         self.state.action_digits = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['action_digits'], 'foo')
 
     def testCantGetActionDigits(self):
@@ -326,6 +339,7 @@ class TestVintageStateProperties(TestCaseUsingView):
 
     def testCantSetNextMode(self):
         self.state.next_mode = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['next_mode'], 'foo')
 
     def testCantGetNextMode(self):
@@ -337,6 +351,7 @@ class TestVintageStateProperties(TestCaseUsingView):
 
     def testCantSetNextModeCommand(self):
         self.state.next_mode_command = 'foo'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['next_mode_command'], 'foo')
 
     def testCantGetNextModeCommand(self):
@@ -543,6 +558,7 @@ class Test_push_action_digit(unittest.TestCase):
     def setUp(self):
         TestsState.view.settings().erase('vintage')
         TestsState.view.window().settings().erase('vintage')
+        drop_vintage_settings(TestsState.view)
         TestsState.view.settings().erase('is_widget')
         self.state = VintageState(TestsState.view)
 
@@ -590,18 +606,21 @@ class Test_user_input_Setter(TestCaseUsingView):
 class Test_last_buffer_search(TestCaseUsingView):
     def testCanSet(self):
         self.state.last_buffer_search = 'xxx'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.window().settings().get('vintage')['last_buffer_search'], 'xxx')
 
 
 class Test_last_character_search(TestCaseUsingView):
     def testCanSet(self):
         self.state.last_character_search = 'x'
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['last_character_search'], 'x')
 
 
 class Test_xpos(TestCaseUsingView):
     def testCanSet(self):
         self.state.xpos = 100
+        flush_vintage_settings(self.state.view)
         self.assertEqual(self.state.view.settings().get('vintage')['xpos'], 100)
 
     def testCanGet(self):
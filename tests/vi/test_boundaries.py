@@ -0,0 +1,69 @@
+import unittest
+from unittest import mock
+
+from Vintageous.vi.boundaries import BoundaryIndex
+
+from Vintageous.tests import make_fake_view
+
+
+def make_index(text):
+    return BoundaryIndex(make_fake_view(text))
+
+
+class Test_BoundaryIndex_paragraphs(unittest.TestCase):
+    def setUp(self):
+        #                         0 1 2 3 4 5 67 8
+        self.index = make_index('a\nb\n\n\nc\n\nd')
+
+    def testFindsNextParagraph(self):
+        self.assertEqual(self.index.next_paragraph(0), 4)
+        self.assertEqual(self.index.next_paragraph(4), 8)
+
+    def testFindsPreviousParagraph(self):
+        self.assertEqual(self.index.previous_paragraph(7), 5)
+        self.assertEqual(self.index.previous_paragraph(5), None)
+
+    def testSupportsCounts(self):
+        self.assertEqual(self.index.next_paragraph(0, count=2), 8)
+        self.assertIsNone(self.index.next_paragraph(0, count=3))
+        self.assertEqual(self.index.previous_paragraph(10, count=2), 5)
+
+    @mock.patch('Vintageous.vi.boundaries.BLOCK_SIZE', 3)
+    def testWorksAcrossBlocks(self):
+        index = make_index('a\nb\n\n\nc\n\nd')
+        self.assertEqual(index.next_paragraph(0, count=2), 8)
+        self.assertEqual(index.previous_paragraph(10, count=2), 5)
+
+    @mock.patch('Vintageous.vi.boundaries.BLOCK_SIZE', 4)
+    def testScansOnlyTheBlocksNeeded(self):
+        index = make_index('a\n\nb' * 4)
+        index.next_paragraph(0)
+        self.assertEqual(list(index.blocks), [0])
+
+
+class Test_BoundaryIndex_sentences(unittest.TestCase):
+    def setUp(self):
+        #                         0         1         2
+        #                         0123456789012345678901234
+        self.index = make_index('One. Two!  "Three?" Four\n\nFive')
+
+    def testFindsNextSentence(self):
+        self.assertEqual(self.index.next_sentence(0), 5)
+        self.assertEqual(self.index.next_sentence(5), 11)
+        self.assertEqual(self.index.next_sentence(11), 20)
+
+    def testEmptyLinesDelimitSentences(self):
+        self.assertEqual(self.index.next_sentence(20), 25)
+        self.assertEqual(self.index.next_sentence(25), 26)
+
+    def testFindsPreviousSentence(self):
+        self.assertEqual(self.index.previous_sentence(8), 5)
+        self.assertIsNone(self.index.previous_sentence(3))
+
+    def testSupportsCounts(self):
+        self.assertEqual(self.index.next_sentence(0, count=3), 20)
+        self.assertEqual(self.index.previous_sentence(26, count=2), 20)
+
+    def testIgnoresPeriodsInsideWords(self):
+        index = make_index('See e.g.this one. Next')
+        self.assertEqual(index.next_sentence(0), 18)
@@ -0,0 +1,94 @@
+import unittest
+
+from Vintageous.vi.brackets import BracketIndex
+
+from Vintageous.tests import make_fake_view
+
+
+class Test_BracketIndex_partner(unittest.TestCase):
+    def testMatchesNestedBrackets(self):
+        #                                    0123456789
+        index = BracketIndex(make_fake_view('a(b(c)d)e'))
+        self.assertEqual(index.partner(1), 7)
+        self.assertEqual(index.partner(7), 1)
+        self.assertEqual(index.partner(3), 5)
+
+    def testBalancesEachKindOnItsOwn(self):
+        index = BracketIndex(make_fake_view('([)]'))
+        self.assertEqual(index.partner(0), 2)
+        self.assertEqual(index.partner(1), 3)
+
+    def testReturnsNoneForUnbalancedBrackets(self):
+        index = BracketIndex(make_fake_view('(()'))
+        self.assertIsNone(index.partner(0))
+        self.assertEqual(index.partner(1), 2)
+
+    def testReturnsNoneForNonBrackets(self):
+        index = BracketIndex(make_fake_view('(a)'))
+        self.assertIsNone(index.partner(1))
+
+    def testHandlesDeepNesting(self):
+        text = '(' * 5000 + ')' * 5000
+        index = BracketIndex(make_fake_view(text))
+        self.assertEqual(index.partner(0), 9999)
+        self.assertEqual(index.partner(4999), 5000)
+
+    def testCanSkipBracketsInStrings(self):
+        text = '("(")'
+        index = BracketIndex(make_fake_view(text, skipped=[(1, 4)]), skip=True)
+        self.assertEqual(index.partner(0), 4)
+        self.assertIsNone(index.partner(2))
+
+    def testDoesNotSkipBracketsInStringsByDefault(self):
+        index = BracketIndex(make_fake_view('("(")', skipped=[(1, 4)]))
+        self.assertEqual(index.partner(2), 4)
+        self.assertIsNone(index.partner(0))
+
+
+class Test_BracketIndex_first(unittest.TestCase):
+    def testFindsFirstBracketInRange(self):
+        #                                    0123456789
+        index = BracketIndex(make_fake_view('a(b[c]d)e{'))
+        self.assertEqual(index.first(0, 10), 1)
+        self.assertEqual(index.first(2, 10), 3)
+        self.assertEqual(index.first(8, 10), 9)
+
+    def testReturnsNoneWithoutBracketsInRange(self):
+        index = BracketIndex(make_fake_view('a(b)c'))
+        self.assertIsNone(index.first(4, 5))
+        self.assertIsNone(index.first(2, 3))
+
+    def testCanSkipBracketsInStrings(self):
+        #                                    0123456
+        index = BracketIndex(make_fake_view('"(" (x)', skipped=[(0, 3)]), skip=True)
+        self.assertEqual(index.first(0, 7), 4)
+        self.assertEqual(index.partner(index.first(0, 7)), 6)
+
+
+class Test_BracketIndex_enclosing(unittest.TestCase):
+    def setUp(self):
+        #                                         0123456789012
+        self.index = BracketIndex(make_fake_view('a(b(c)d)e{f}'))
+
+    def testFindsInnermostPair(self):
+        self.assertEqual(self.index.enclosing(4, '('), (3, 5))
+
+    def testSkipsClosedPairs(self):
+        self.assertEqual(self.index.enclosing(6, '('), (1, 7))
+
+    def testCountsBracketsAtPointAsEnclosing(self):
+        self.assertEqual(self.index.enclosing(3, '('), (3, 5))
+        self.assertEqual(self.index.enclosing(7, '('), (1, 7))
+
+    def testReturnsNoneOutsideOfAnyPair(self):
+        self.assertIsNone(self.index.enclosing(0, '('))
+        self.assertIsNone(self.index.enclosing(8, '('))
+
+    def testLooksForTheRequestedKindOnly(self):
+        self.assertEqual(self.index.enclosing(10, '{'), (9, 11))
+        self.assertIsNone(self.index.enclosing(10, '('))
+
+    def testIgnoresUnbalancedOpeningBrackets(self):
+        index = BracketIndex(make_fake_view('((a)b'))
+        self.assertIsNone(index.enclosing(4, '('))
+        self.assertEqual(index.enclosing(2, '('), (1, 3))
@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+
+import sublime
+
+from Vintageous.vi import clipboard
+
+
+class TestClipboard(unittest.TestCase):
+    def setUp(self):
+        sublime.set_clipboard('')
+        clipboard.reset()
+
+    def tearDown(self):
+        clipboard.reset()
+
+    def testWritesAreDeferred(self):
+        with mock.patch.object(sublime, 'set_timeout'):
+            clipboard.set_clipboard('foo')
+            self.assertEqual(sublime.get_clipboard(), '')
+
+    def testReadsSeePendingWrites(self):
+        with mock.patch.object(sublime, 'set_timeout'):
+            clipboard.set_clipboard('foo')
+            self.assertEqual(clipboard.get_clipboard(), 'foo')
+
+    def testOnlyLastWriteIsPushed(self):
+        with mock.patch.object(sublime, 'set_timeout') as st, \
+             mock.patch.object(sublime, 'set_clipboard') as sc:
+                clipboard.set_clipboard('foo')
+                clipboard.set_clipboard('bar')
+                for (callback, delay), _ in st.call_args_list:
+                    callback()
+                sc.assert_called_once_with('bar')
+
+    def testCanFlush(self):
+        with mock.patch.object(sublime, 'set_timeout'):
+            clipboard.set_clipboard('foo')
+            clipboard.flush()
+            self.assertEqual(sublime.get_clipboard(), 'foo')
+
+    def testReadsAreCached(self):
+        sublime.set_clipboard('foo')
+        self.assertEqual(clipboard.get_clipboard(), 'foo')
+        with mock.patch.object(sublime, 'get_clipboard') as gc:
+            self.assertEqual(clipboard.get_clipboard(), 'foo')
+            self.assertFalse(gc.called)
+
+    def testInvalidatingRereadsClipboard(self):
+        sublime.set_clipboard('foo')
+        clipboard.get_clipboard()
+        sublime.set_clipboard('bar')
+        clipboard.invalidate()
+        self.assertEqual(clipboard.get_clipboard(), 'bar')
+
+    def testInvalidatingPushesPendingWrites(self):
+        with mock.patch.object(sublime, 'set_timeout'):
+            clipboard.set_clipboard('foo')
+            clipboard.invalidate()
+            self.assertEqual(sublime.get_clipboard(), 'foo')
+
+    def testResettingDropsPendingWrites(self):
+        with mock.patch.object(sublime, 'set_timeout') as st:
+            clipboard.set_clipboard('foo')
+            sublime.set_clipboard('bar')
+            clipboard.reset()
+            for (callback, delay), _ in st.call_args_list:
+                callback()
+            self.assertEqual(sublime.get_clipboard(), 'bar')
+            self.assertEqual(clipboard.get_clipboard(), 'bar')
@@ -10,6 +10,7 @@ from Vintageous.vi.constants import MODE_REPLACE
 from Vintageous.vi.constants import MODE_VISUAL
 from Vintageous.vi.constants import MODE_VISUAL_LINE
 from Vintageous.vi.constants import MODE_NORMAL_INSERT
+from Vintageous.vi.cmd_data import CMD_DATA_DEFAULTS
 from Vintageous.vi.cmd_data import CmdData
 
 
@@ -25,6 +26,7 @@ known_keys = [
     'post_every_motion',
     'post_motion',
     'can_yank',
+    'is_yank',
     'yanks_linewise',
     'register',
     'mode',
@@ -59,6 +61,7 @@ known_keys = [
     'is_window_command',
     'user_motion_input',
     'user_action_input',
+    'has_training_wheels',
 ]
 
 
@@ -78,7 +81,7 @@ class Test_CmdData(unittest.TestCase):
         self.cmd_data = CmdData(self.state)
 
     def testHasExpectedAmountOfKeys(self):
-        self.assertEqual(len(known_keys), len(self.cmd_data))
+        self.assertEqual(len(known_keys), len(CMD_DATA_DEFAULTS))
 
     def testHasExpectedKeys(self):
         for k in known_keys:
@@ -104,6 +107,7 @@ class Test_CmdData(unittest.TestCase):
         self.assertEqual(self.cmd_data['post_every_motion'], None)
         self.assertEqual(self.cmd_data['post_motion'], [])
         self.assertEqual(self.cmd_data['can_yank'], False)
+        self.assertEqual(self.cmd_data['is_yank'], False)
         self.assertEqual(self.cmd_data['yanks_linewise'], False)
         self.assertEqual(self.cmd_data['reposition_caret'], None)
         self.assertEqual(self.cmd_data['follow_up_mode'], None)
@@ -138,3 +142,33 @@ class Test_CmdData(unittest.TestCase):
         self.state.mode = MODE_VISUAL_LINE
         cmd_data = CmdData(self.state)
         self.assertEqual(cmd_data['mode'], MODE_VISUAL_LINE)
+
+    def testStoresOnlyValuesThatDifferFromDefaults(self):
+        self.state.count = 1
+        self.state.mode = MODE_NORMAL
+        cmd_data = CmdData(self.state)
+        args = cmd_data.serialize()
+        self.assertNotIn('count', args)
+        self.assertNotIn('mode', args)
+        self.assertNotIn('motion', args)
+        self.assertEqual(args['register'], 300)
+
+    def testCopiesMutableDefaultsOnFirstAccess(self):
+        self.cmd_data['motion']['command'] = 'foo'
+        other = CmdData(self.state)
+        self.assertEqual(other['motion'], {})
+        self.assertEqual(CMD_DATA_DEFAULTS['motion'], {})
+
+    def testGetReturnsDefaults(self):
+        self.assertEqual(self.cmd_data.get('must_update_xpos'), True)
+        self.assertEqual(self.cmd_data.get('foo', 'bar'), 'bar')
+
+    def testCanRoundTripThroughArgs(self):
+        self.cmd_data['motion']['command'] = 'foo'
+        self.cmd_data['can_yank'] = True
+        cmd_data = CmdData.from_args(self.cmd_data.serialize())
+        self.assertEqual(cmd_data['motion'], {'command': 'foo'})
+        self.assertEqual(cmd_data['can_yank'], True)
+        self.assertEqual(cmd_data['count'], 100)
+        self.assertEqual(cmd_data['post_motion'], [])
+        self.assertEqual(cmd_data['next_mode'], MODE_NORMAL)
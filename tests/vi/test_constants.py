@@ -19,6 +19,9 @@ from Vintageous.vi.constants import ACTIONS_EXITING_TO_INSERT_MODE
 from Vintageous.vi.constants import digraphs
 from Vintageous.vi.constants import mode_to_str
 from Vintageous.vi.constants import regions_transformer
+from Vintageous.vi.constants import regions_transformer_reversed
+from Vintageous.vi.constants import regions_transformer_batch
+from Vintageous.vi.constants import _transform_regions
 from Vintageous.vi.constants import ACTION_OR_MOTION
 from Vintageous.vi.constants import ACTION_ONLY
 
@@ -189,3 +192,69 @@ class Test_regions_transformer(unittest.TestCase):
 
         for r in regions:
             self.assertEqual(r.size(), 1)
+
+    def testDoesNotRewriteUnchangedSelections(self):
+        view = mock.Mock()
+        sel = view.sel.return_value
+        sel.__iter__ = mock.Mock(side_effect=lambda: iter([sublime.Region(0, 10), sublime.Region(20, 30)]))
+
+        regions_transformer(view, lambda view, x: x)
+
+        self.assertEqual(sel.clear.call_count, 0)
+        self.assertEqual(sel.add_all.call_count, 0)
+
+    def testReplacesSelectionsInOneCall(self):
+        view = mock.Mock()
+        sel = view.sel.return_value
+        sel.__iter__ = mock.Mock(side_effect=lambda: iter([sublime.Region(0, 10), sublime.Region(20, 30)]))
+
+        regions_transformer(view, lambda view, x: sublime.Region(x.b))
+
+        sel.clear.assert_called_once_with()
+        sel.add_all.assert_called_once_with([sublime.Region(10), sublime.Region(30)])
+        self.assertEqual(sel.add.call_count, 0)
+
+    def testReversedTransformerVisitsLastRegionFirst(self):
+        view = mock.Mock()
+        sel = view.sel.return_value
+        sel.__iter__ = mock.Mock(side_effect=lambda: iter([sublime.Region(0, 10), sublime.Region(20, 30)]))
+        seen = []
+
+        def f(view, x):
+            seen.append(x)
+            return sublime.Region(x.b)
+
+        regions_transformer_reversed(view, f)
+
+        self.assertEqual(seen, [sublime.Region(20, 30), sublime.Region(0, 10)])
+        sel.add_all.assert_called_once_with([sublime.Region(30), sublime.Region(10)])
+
+    def testBatchTransformerPassesAllRegionsAtOnce(self):
+        view = mock.Mock()
+        sel = view.sel.return_value
+        sel.__iter__ = mock.Mock(side_effect=lambda: iter([sublime.Region(0, 10), sublime.Region(20, 30)]))
+        f = mock.Mock(return_value=[sublime.Region(10), sublime.Region(30)])
+
+        regions_transformer_batch(view, f)
+
+        f.assert_called_once_with(view, [sublime.Region(0, 10), sublime.Region(20, 30)])
+        sel.add_all.assert_called_once_with([sublime.Region(10), sublime.Region(30)])
+
+    def testBatchTransformerDoesNotRewriteUnchangedSelections(self):
+        view = mock.Mock()
+        sel = view.sel.return_value
+        sel.__iter__ = mock.Mock(side_effect=lambda: iter([sublime.Region(0, 10)]))
+
+        regions_transformer_batch(view, lambda view, sels: list(sels))
+
+        self.assertEqual(sel.add_all.call_count, 0)
+
+    def testRestoresSelectionsMovedByTransformer(self):
+        view = mock.Mock()
+        sel = view.sel.return_value
+        # The transformer has edited the buffer and moved the caret to 12.
+        sel.__iter__ = mock.Mock(side_effect=lambda: iter([sublime.Region(12)]))
+
+        _transform_regions(view, lambda view, x: sublime.Region(10), [sublime.Region(10)])
+
+        sel.add_all.assert_called_once_with([sublime.Region(10)])
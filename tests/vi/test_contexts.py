@@ -0,0 +1,90 @@
+import unittest
+
+import sublime
+
+from Vintageous.state import VintageState
+from Vintageous.test_runner import TestsState
+from Vintageous.vi.constants import MODE_INSERT
+from Vintageous.vi.constants import MODE_NORMAL
+from Vintageous.vi.constants import MODE_VISUAL
+from Vintageous.vi.constants import MODE_VISUAL_LINE
+from Vintageous.vi.contexts import compile_binding
+from Vintageous.vi.contexts import drop_snapshot
+from Vintageous.vi.contexts import get_snapshot
+
+
+class Test_get_snapshot(unittest.TestCase):
+    def setUp(self):
+        TestsState.reset_view_state()
+        drop_snapshot(TestsState.view)
+        self.state = VintageState(TestsState.view)
+
+    def tearDown(self):
+        TestsState.reset_view_state()
+
+    def testCapturesState(self):
+        self.state.mode = MODE_VISUAL
+        self.state.motion_digits = ['2']
+        snapshot = get_snapshot(self.state)
+        self.assertEqual(snapshot.mode, MODE_VISUAL)
+        self.assertEqual(snapshot.motion_digits, ('2',))
+
+    def testReusesSnapshotWhileStateIsUnchanged(self):
+        first = get_snapshot(self.state)
+        second = get_snapshot(VintageState(TestsState.view))
+        self.assertIs(first, second)
+
+    def testRebuildsSnapshotAfterStateChanges(self):
+        self.state.mode = MODE_NORMAL
+        first = get_snapshot(self.state)
+        self.state.mode = MODE_VISUAL
+        second = get_snapshot(self.state)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.mode, MODE_VISUAL)
+
+
+class TestModeContexts(unittest.TestCase):
+    def setUp(self):
+        TestsState.reset_view_state()
+        self.state = VintageState(TestsState.view)
+
+    def tearDown(self):
+        TestsState.reset_view_state()
+
+    def check(self, key, operand=True):
+        return self.state.context.check(key, sublime.OP_EQUAL, operand, False)
+
+    def testNormalOrVisualExcludesVisualLine(self):
+        self.state.mode = MODE_VISUAL_LINE
+        self.assertFalse(self.check('vi_mode_normal_or_visual'))
+        self.assertTrue(self.check('vi_mode_normal_or_any_visual'))
+
+    def testCanNegateCompositeModes(self):
+        self.state.mode = MODE_INSERT
+        self.assertTrue(self.check('vi_mode_normal_or_any_visual', operand=False))
+        self.state.mode = MODE_NORMAL
+        self.assertFalse(self.check('vi_mode_normal_or_any_visual', operand=False))
+
+    def testReturnsNoneForUnknownKeys(self):
+        self.assertIsNone(self.check('vi_foo_bar'))
+
+
+class Test_compile_binding(unittest.TestCase):
+    def setUp(self):
+        TestsState.reset_view_state()
+        self.state = VintageState(TestsState.view)
+
+    def tearDown(self):
+        TestsState.reset_view_state()
+
+    def testEvaluatesAllViKeys(self):
+        predicate = compile_binding([{'key': 'setting.command_mode'},
+                                     {'key': 'vi_mode_visual_any', 'operand': False},
+                                     {'key': 'vi_has_action', 'operator': 'not_equal'}])
+        self.state.mode = MODE_NORMAL
+        self.state.context.check('vi_mode_normal', sublime.OP_EQUAL, True, False)
+        self.assertTrue(predicate(self.state.context))
+
+        self.state.mode = MODE_VISUAL
+        self.state.context.check('vi_mode_normal', sublime.OP_EQUAL, True, False)
+        self.assertFalse(predicate(self.state.context))
@@ -0,0 +1,117 @@
+import unittest
+from unittest import mock
+
+import sublime
+
+from Vintageous.vi import hlsearch
+
+from Vintageous.tests import make_fake_view
+
+
+class Test_find_all_in_range(unittest.TestCase):
+    def testFindsMatchesBeginningInRange(self):
+        view = make_fake_view('foo bar foo bar foo')
+        regs, ahead = hlsearch.find_all_in_range(view, 'foo', 0, 16)
+        self.assertEqual(regs, [sublime.Region(0, 3), sublime.Region(8, 11)])
+        self.assertEqual(ahead, sublime.Region(16, 19))
+
+    def testDoesNotGetStuckOnEmptyMatches(self):
+        view = make_fake_view('abc')
+        regs, ahead = hlsearch.find_all_in_range(view, 'x*', 0, 3)
+        self.assertEqual(len(regs), 3)
+
+    def testReportsThatThereAreNoMoreMatches(self):
+        view = make_fake_view('foo bar')
+        regs, ahead = hlsearch.find_all_in_range(view, 'foo', 0, 5)
+        self.assertEqual(regs, [sublime.Region(0, 3)])
+        self.assertEqual(ahead.a, -1)
+
+    def testCanStartFromMatchFoundBefore(self):
+        view = make_fake_view('foo bar foo bar')
+        regs, ahead = hlsearch.find_all_in_range(view, 'foo', 8, 12, first=sublime.Region(8, 11))
+        self.assertEqual(regs, [sublime.Region(8, 11)])
+        self.assertEqual(view.find.call_count, 1)
+
+
+@mock.patch('Vintageous.vi.hlsearch.CHUNK_SIZE', 10)
+@mock.patch('Vintageous.vi.hlsearch.MARGIN', 0)
+class Test_highlight(unittest.TestCase):
+    def setUp(self):
+        self.view = make_fake_view('foo ' * 10, visible=(0, 10))
+
+    def tearDown(self):
+        hlsearch.cancel(self.view)
+
+    def testHighlightsVisibleMatchesFirst(self):
+        with mock.patch('sublime.set_timeout_async') as sta:
+            hlsearch.highlight(self.view, 'foo')
+            regs = self.view.add_regions.call_args[0][1]
+            self.assertEqual(regs, [sublime.Region(0, 3), sublime.Region(4, 7), sublime.Region(8, 11)])
+            self.assertEqual(sta.call_count, 1)
+
+    def testFillsInTheRestInTheBackground(self):
+        with mock.patch('sublime.set_timeout_async') as sta:
+            hlsearch.highlight(self.view, 'foo')
+            while sta.call_count:
+                step = sta.call_args[0][0]
+                sta.reset_mock()
+                step()
+            self.assertEqual(len(self.view.add_regions.call_args[0][1]), 10)
+
+    def testNewQueryCancelsPendingJob(self):
+        with mock.patch('sublime.set_timeout_async') as sta:
+            hlsearch.highlight(self.view, 'foo')
+            step = sta.call_args[0][0]
+            hlsearch.highlight(self.view, 'bar')
+            self.view.add_regions.reset_mock()
+            step()
+            self.assertEqual(self.view.add_regions.call_count, 0)
+
+    def testClearCancelsPendingJob(self):
+        with mock.patch('sublime.set_timeout_async') as sta:
+            hlsearch.highlight(self.view, 'foo')
+            step = sta.call_args[0][0]
+            hlsearch.clear(self.view)
+            self.view.add_regions.reset_mock()
+            step()
+            self.assertEqual(self.view.add_regions.call_count, 0)
+            self.view.erase_regions.assert_called_with('vi_search')
+
+    def testAddsBackgroundMatchesOnce(self):
+        with mock.patch('sublime.set_timeout_async') as sta:
+            hlsearch.highlight(self.view, 'foo')
+            self.view.add_regions.reset_mock()
+            while sta.call_count:
+                step = sta.call_args[0][0]
+                sta.reset_mock()
+                step()
+            self.assertEqual(self.view.add_regions.call_count, 1)
+
+    def testSearchesWithViewFind(self):
+        with mock.patch('sublime.set_timeout_async') as sta:
+            hlsearch.highlight(self.view, 'foo')
+            while sta.call_count:
+                step = sta.call_args[0][0]
+                sta.reset_mock()
+                step()
+            self.assertFalse(self.view.find_all.called)
+            self.assertFalse(self.view.substr.called)
+
+    def testReusesMatchFoundPastChunkEnd(self):
+        with mock.patch('sublime.set_timeout_async') as sta:
+            hlsearch.highlight(self.view, 'foo')
+            while sta.call_count:
+                step = sta.call_args[0][0]
+                sta.reset_mock()
+                step()
+            self.assertEqual(self.view.find.call_count, 11)
+
+    def testStopsSearchingAfterLastMatch(self):
+        view = make_fake_view('foo' + ' ' * 50, visible=(0, 10))
+        with mock.patch('sublime.set_timeout_async') as sta:
+            hlsearch.highlight(view, 'foo')
+            while sta.call_count:
+                step = sta.call_args[0][0]
+                sta.reset_mock()
+                step()
+            self.assertEqual(view.find.call_count, 2)
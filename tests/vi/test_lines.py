@@ -0,0 +1,68 @@
+import unittest
+
+import sublime
+
+from Vintageous.vi.lines import drop_line_index
+from Vintageous.vi.lines import get_line_index
+from Vintageous.vi.lines import LineIndex
+
+from Vintageous.tests import make_fake_view
+
+
+class Test_LineIndex(unittest.TestCase):
+    def setUp(self):
+        self.lines = LineIndex(make_fake_view('abc\n\nxy\nlast'))
+
+    def testCollectsLineStarts(self):
+        self.assertEqual(self.lines.starts, [0, 4, 5, 8])
+        self.assertEqual(self.lines.last_row, 3)
+
+    def testCanConvertPointsToRowCol(self):
+        self.assertEqual(self.lines.rowcol(0), (0, 0))
+        self.assertEqual(self.lines.rowcol(3), (0, 3))
+        self.assertEqual(self.lines.rowcol(4), (1, 0))
+        self.assertEqual(self.lines.rowcol(9), (3, 1))
+        self.assertEqual(self.lines.rowcol(12), (3, 4))
+
+    def testCanConvertRowColToPoints(self):
+        self.assertEqual(self.lines.text_point(0, 0), 0)
+        self.assertEqual(self.lines.text_point(2, 1), 6)
+        self.assertEqual(self.lines.text_point(3, 2), 10)
+
+    def testClampsTextPoint(self):
+        self.assertEqual(self.lines.text_point(0, 100), 3)
+        self.assertEqual(self.lines.text_point(-1, 0), 0)
+        self.assertEqual(self.lines.text_point(100, 0), 12)
+
+    def testCanFindLines(self):
+        self.assertEqual(self.lines.line(1), sublime.Region(0, 3))
+        self.assertEqual(self.lines.line(4), sublime.Region(4, 4))
+        self.assertEqual(self.lines.full_line(1), sublime.Region(0, 4))
+        self.assertEqual(self.lines.full_line(4), sublime.Region(4, 5))
+        self.assertEqual(self.lines.full_line(10), sublime.Region(8, 12))
+
+    def testTrailingNewLineStartsAnEmptyLastLine(self):
+        lines = LineIndex(make_fake_view('abc\n'))
+        self.assertEqual(lines.last_row, 1)
+        self.assertEqual(lines.line(4), sublime.Region(4, 4))
+
+
+class Test_get_line_index(unittest.TestCase):
+    def setUp(self):
+        self.view = make_fake_view('abc\ndef', view_id=-100)
+
+    def tearDown(self):
+        drop_line_index(self.view)
+
+    def testReusesIndexWhileBufferIsUnchanged(self):
+        self.assertIs(get_line_index(self.view), get_line_index(self.view))
+
+    def testRebuildsIndexWhenBufferChanges(self):
+        lines = get_line_index(self.view)
+        self.view.change_count.return_value = 2
+        self.assertIsNot(get_line_index(self.view), lines)
+
+    def testCanDropIndex(self):
+        lines = get_line_index(self.view)
+        drop_line_index(self.view)
+        self.assertIsNot(get_line_index(self.view), lines)
@@ -0,0 +1,81 @@
+import unittest
+
+import sublime
+
+from Vintageous.vi import matches
+
+from Vintageous.tests import make_fake_view
+
+
+class Test_MatchIndex(unittest.TestCase):
+    def setUp(self):
+        # Matches at 0, 8 and 16.
+        self.index = matches.MatchIndex(make_fake_view('foo bar foo bar foo'), 'foo')
+
+    def testNextFindsMatchAtOrAfterPoint(self):
+        self.assertEqual(self.index.next(1), sublime.Region(8, 11))
+        self.assertEqual(self.index.next(8), sublime.Region(8, 11))
+
+    def testNextWrapsAround(self):
+        self.assertEqual(self.index.next(17), sublime.Region(0, 3))
+
+    def testNextCanSkipMatches(self):
+        self.assertEqual(self.index.next(1, times=2), sublime.Region(16, 19))
+        self.assertEqual(self.index.next(1, times=3), sublime.Region(0, 3))
+
+    def testPreviousFindsMatchEndingAtOrBeforePoint(self):
+        self.assertEqual(self.index.previous(16), sublime.Region(8, 11))
+        self.assertEqual(self.index.previous(11), sublime.Region(8, 11))
+
+    def testPreviousWrapsAround(self):
+        self.assertEqual(self.index.previous(2), sublime.Region(16, 19))
+
+    def testPreviousCanSkipMatches(self):
+        self.assertEqual(self.index.previous(19, times=2), sublime.Region(8, 11))
+
+    def testNextDoesNotSearchBufferOutsideMatches(self):
+        self.index.next(4)
+        self.index.next(11, times=2)
+        self.assertFalse(self.index.view.find.called)
+
+    def testNextFindsMatchesOverlappingScannedOnes(self):
+        # The scan finds matches at 0 and 2 only.
+        index = matches.MatchIndex(make_fake_view('aaaa'), 'aa')
+        self.assertEqual(index.next(1), sublime.Region(1, 3))
+        self.assertEqual(index.next(1, times=2), sublime.Region(0, 2))
+
+    def testNextCanSkipMatchesAfterOverlappingOne(self):
+        # The scan finds matches at 0 and 4.
+        index = matches.MatchIndex(make_fake_view('aaa aaa'), 'aa')
+        self.assertEqual(index.next(1, times=2), sublime.Region(4, 6))
+        self.assertEqual(index.next(1, times=3), sublime.Region(0, 2))
+
+    def testReturnsNoneIfThereAreNoMatches(self):
+        index = matches.MatchIndex(make_fake_view('bar'), 'foo')
+        self.assertIsNone(index.next(0))
+        self.assertIsNone(index.previous(3))
+
+
+class Test_get_match_index(unittest.TestCase):
+    def setUp(self):
+        self.view = make_fake_view('foo bar foo')
+
+    def tearDown(self):
+        matches.drop_match_index(self.view)
+
+    def testReusesIndexForSamePattern(self):
+        matches.find_next(self.view, 'foo', 0)
+        matches.find_next(self.view, 'foo', 4)
+        matches.find_previous(self.view, 'foo', 8)
+        self.assertEqual(self.view.find_all.call_count, 1)
+
+    def testRebuildsIndexWhenPatternChanges(self):
+        matches.find_next(self.view, 'foo', 0)
+        matches.find_next(self.view, 'bar', 0)
+        self.assertEqual(self.view.find_all.call_count, 2)
+
+    def testRebuildsIndexWhenBufferChanges(self):
+        matches.find_next(self.view, 'foo', 0)
+        self.view.change_count.return_value = 2
+        matches.find_next(self.view, 'foo', 0)
+        self.assertEqual(self.view.find_all.call_count, 2)
@@ -0,0 +1,95 @@
+import unittest
+
+import re
+
+import sublime
+
+from Vintageous.vi import patterns
+
+
+class Test_translate(unittest.TestCase):
+    def testLeavesPythonSyntaxAlone(self):
+        self.assertEqual(patterns.translate(r'(\w+)\s*=\s*\d+|x\+'), (r'(\w+)\s*=\s*\d+|x\+', None))
+
+    def testTranslatesWordBoundaries(self):
+        self.assertEqual(patterns.translate(r'\<foo\>'), (r'\bfoo\b', None))
+
+    def testLeavesWordBoundariesAloneForSublime(self):
+        actual = patterns.translate(r'\<foo\>', patterns.ENGINE_SUBLIME)
+        self.assertEqual(actual, (r'\<foo\>', None))
+
+    def testTranslatesNonGreedyRepetition(self):
+        self.assertEqual(patterns.translate(r'a\{-}b'), (r'a*?b', None))
+        self.assertEqual(patterns.translate(r'a\{-1,3}b'), (r'a{1,3}?b', None))
+
+    def testTranslatesZeroOrOne(self):
+        self.assertEqual(patterns.translate(r'colou\=r'), (r'colou?r', None))
+
+    def testTranslatesCaseFlags(self):
+        self.assertEqual(patterns.translate(r'\cfoo'), ('foo', True))
+        self.assertEqual(patterns.translate(r'foo\C'), ('foo', False))
+
+    def testLeavesCharacterClassesAlone(self):
+        self.assertEqual(patterns.translate(r'[\<\]>]\<'), (r'[\<\]>]\b', None))
+        self.assertEqual(patterns.translate(r'[]\<]'), (r'[]\<]', None))
+
+    def testLeavesTrailingBackslashAlone(self):
+        self.assertEqual(patterns.translate('foo\\'), ('foo\\', None))
+
+
+class Test_escape(unittest.TestCase):
+    def testEscapesSpecialCharacters(self):
+        self.assertEqual(patterns.escape('a.b*(c)'), r'a\.b\*\(c\)')
+
+    def testLeavesOtherCharactersAlone(self):
+        self.assertEqual(patterns.escape('<=>'), '<=>')
+
+
+class Test_get_pattern(unittest.TestCase):
+    def setUp(self):
+        patterns.clear_cache()
+
+    def tearDown(self):
+        patterns.clear_cache()
+
+    def testCompilesPythonPatterns(self):
+        rx = patterns.get_pattern(r'\<foo\>', re.IGNORECASE, vim_syntax=True)
+        self.assertEqual(rx.pattern, r'\bfoo\b')
+        self.assertTrue(rx.flags & re.IGNORECASE)
+
+    def testCaseFlagsOverrideFlags(self):
+        rx = patterns.get_pattern(r'\Cfoo', re.IGNORECASE, vim_syntax=True)
+        self.assertFalse(rx.flags & re.IGNORECASE)
+
+    def testTranslatesSublimePatterns(self):
+        actual = patterns.get_pattern(r'\cfoo\{-}', 0, patterns.ENGINE_SUBLIME, vim_syntax=True)
+        self.assertEqual(actual, ('foo*?', sublime.IGNORECASE))
+
+    def testLeavesLiteralSublimePatternsAlone(self):
+        actual = patterns.get_pattern(r'\<foo', sublime.LITERAL, patterns.ENGINE_SUBLIME, True)
+        self.assertEqual(actual, (r'\<foo', sublime.LITERAL))
+
+    def testLeavesPatternsAloneByDefault(self):
+        rx = patterns.get_pattern(r'\<a\=b')
+        self.assertEqual(rx.pattern, r'\<a\=b')
+
+        actual = patterns.get_pattern(r'\cA\=', 0, patterns.ENGINE_SUBLIME)
+        self.assertEqual(actual, (r'\cA\=', 0))
+
+    def testKeysOnVimSyntax(self):
+        self.assertEqual(patterns.get_pattern(r'a\=b').pattern, r'a\=b')
+        self.assertEqual(patterns.get_pattern(r'a\=b', vim_syntax=True).pattern, 'a?b')
+
+    def testReusesPatterns(self):
+        self.assertIs(patterns.get_pattern('foo'), patterns.get_pattern('foo'))
+        info = patterns.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def testKeysOnFlagsAndEngine(self):
+        patterns.get_pattern('foo')
+        patterns.get_pattern('foo', re.IGNORECASE)
+        patterns.get_pattern('foo', 0, patterns.ENGINE_SUBLIME)
+        self.assertEqual(patterns.cache_info().misses, 3)
+
+    def testRaisesOnBadPatterns(self):
+        self.assertRaises(re.error, patterns.get_pattern, '(foo')
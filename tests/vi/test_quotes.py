@@ -0,0 +1,51 @@
+import unittest
+
+from Vintageous.vi import quotes
+
+from Vintageous.tests import make_fake_view
+
+
+class Test_find_quotes(unittest.TestCase):
+    def testFindsQuotes(self):
+        self.assertEqual(quotes.find_quotes('a "b" c', '"'), [2, 4])
+
+    def testSkipsEscapedQuotes(self):
+        self.assertEqual(quotes.find_quotes(r'"a\"b"', '"'), [0, 5])
+
+    def testDoesNotSkipQuotesAfterEscapedBackslashes(self):
+        self.assertEqual(quotes.find_quotes(r'"a\\"b"', '"'), [0, 4, 6])
+
+
+class Test_find_quote_pair(unittest.TestCase):
+    def setUp(self):
+        #                        0         1
+        #                           012345678901234567
+        self.view = make_fake_view('x "ab" "cd"\n"e"')
+
+    def tearDown(self):
+        quotes.drop_quote_positions(self.view)
+
+    def testFindsQuotesAroundPoint(self):
+        self.assertEqual(quotes.find_quote_pair(self.view, 3, '"'), (2, 5))
+
+    def testUsesNextQuotedTextIfNotInsideQuotes(self):
+        self.assertEqual(quotes.find_quote_pair(self.view, 0, '"'), (2, 5))
+
+    def testPairsQuotesFromLineStartWhenOnQuote(self):
+        self.assertEqual(quotes.find_quote_pair(self.view, 7, '"'), (7, 10))
+        self.assertEqual(quotes.find_quote_pair(self.view, 5, '"'), (2, 5))
+
+    def testOnlyLooksAtCurrentLine(self):
+        self.assertIsNone(quotes.find_quote_pair(self.view, 11, '"'))
+        self.assertEqual(quotes.find_quote_pair(self.view, 13, '"'), (12, 14))
+
+    def testScansEachLineOnce(self):
+        quotes.find_quote_pair(self.view, 3, '"')
+        quotes.find_quote_pair(self.view, 8, '"')
+        self.assertEqual(self.view.substr.call_count, 1)
+
+    def testRescansAfterBufferChanges(self):
+        quotes.find_quote_pair(self.view, 3, '"')
+        self.view.change_count.return_value = 2
+        quotes.find_quote_pair(self.view, 3, '"')
+        self.assertEqual(self.view.substr.call_count, 2)
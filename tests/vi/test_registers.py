@@ -5,10 +5,12 @@ import sublime
 
 from unittest import mock
 from Vintageous.test_runner import TestsState
+from Vintageous.vi import clipboard
 from Vintageous.vi import registers
 from Vintageous.vi.registers import Registers
 from Vintageous.vi.settings import SettingsManager
 from Vintageous.state import VintageState
+from Vintageous.vi.settings import drop_vintage_settings
 
 
 class TestCaseRegistersConstants(unittest.TestCase):
@@ -73,8 +75,11 @@ class TestCaseRegistersConstants(unittest.TestCase):
 class TestCaseRegisters(unittest.TestCase):
     def setUp(self):
         sublime.set_clipboard('')
+        clipboard.reset()
         registers._REGISTER_DATA = {}
+        registers._NUMBERED_REGISTERS.clear()
         TestsState.view.settings().erase('vintage')
+        drop_vintage_settings(TestsState.view)
         TestsState.view.settings().erase('vintageous_use_sys_clipboard')
         # self.regs = Registers(view=TestsState.view,
                               # settings=SettingsManager(view=TestsState.view))
@@ -129,8 +134,9 @@ class TestCaseRegisters(unittest.TestCase):
         for name in registers.REG_VALID_NAMES:
             self.assertEqual(registers._REGISTER_DATA[name], [name])
 
-        for number in registers.REG_VALID_NUMBERS:
-            self.assertEqual(registers._REGISTER_DATA[number], [number])
+        self.assertEqual(registers._REGISTER_DATA['0'], ['0'])
+        for number in registers.REG_VALID_NUMBERS[1:]:
+            self.assertEqual(registers._NUMBERED_REGISTERS[int(number)], [number])
 
     def testSettingNormalRegisterSetsUnnamedRegisterToo(self):
         self.regs.set('a', [100])
@@ -142,6 +148,7 @@ class TestCaseRegisters(unittest.TestCase):
     def testSettingRegisterSetsClipboardIfNeeded(self):
         self.regs.settings.view['vintageous_use_sys_clipboard'] = True
         self.regs.set('a', [100])
+        clipboard.flush()
         self.assertEqual(sublime.get_clipboard(), '100')
 
     def testCanAppendToSingleValue(self):
@@ -174,6 +181,7 @@ class TestCaseRegisters(unittest.TestCase):
         self.regs.settings.view['vintageous_use_sys_clipboard'] = True
         self.regs.set('a', ['foo'])
         self.regs.append_to('A', ['bar'])
+        clipboard.flush()
         self.assertEqual(sublime.get_clipboard(), 'foobar')
 
     def testGetDefaultToUnnamedRegister(self):
@@ -203,7 +211,7 @@ class TestCaseRegisters(unittest.TestCase):
         self.assertEqual(registers._REGISTER_DATA[registers.REG_EXPRESSION], '')
 
     def testCanGetNumberRegister(self):
-        registers._REGISTER_DATA['5'] = ['foo']
+        registers._NUMBERED_REGISTERS[5] = ['foo']
         self.assertEqual(self.regs.get('5'), ['foo'])
 
     def testCanGetRegisterEvenIfRequestingItThroughACapitalLetter(self):
@@ -242,11 +250,181 @@ class TestCaseRegisters(unittest.TestCase):
         self.assertEqual(self.regs.get(registers.REG_SMALL_DELETE), ['foo'])
 
 
+class TestCaseNumberedRegisters(unittest.TestCase):
+    def setUp(self):
+        self.ring = registers.NumberedRegisters()
+
+    def testStartsEmpty(self):
+        self.assertEqual(self.ring.values(), [None] * 9)
+
+    def testPushingShiftsValues(self):
+        self.ring.push(['foo'])
+        self.ring.push(['bar'])
+        self.assertEqual(self.ring[1], ['bar'])
+        self.assertEqual(self.ring[2], ['foo'])
+        self.assertEqual(self.ring[3], None)
+
+    def testOldestValueFallsOff(self):
+        for i in range(10):
+            self.ring.push([str(i)])
+        self.assertEqual(self.ring[1], ['9'])
+        self.assertEqual(self.ring[9], ['1'])
+        self.assertEqual(len(self.ring.values()), 9)
+
+    def testCanSetValuesWithoutShifting(self):
+        self.ring.push(['foo'])
+        self.ring[2] = ['bar']
+        self.assertEqual(self.ring.values()[:2], [['foo'], ['bar']])
+
+    def testNextNumberedRegister(self):
+        self.assertEqual(registers.next_numbered_register('1'), '2')
+        self.assertEqual(registers.next_numbered_register('8'), '9')
+        self.assertEqual(registers.next_numbered_register('9'), '9')
+        self.assertEqual(registers.next_numbered_register('0'), '0')
+        self.assertEqual(registers.next_numbered_register('a'), 'a')
+
+
+class TestCaseRegisterStore(unittest.TestCase):
+    def setUp(self):
+        sublime.set_clipboard('')
+        clipboard.reset()
+        registers._REGISTER_DATA = {}
+        registers._NUMBERED_REGISTERS.clear()
+        TestsState.view.settings().erase('vintage')
+        drop_vintage_settings(TestsState.view)
+        TestsState.view.settings().erase('vintageous_use_sys_clipboard')
+        TestsState.view.settings().set('vintageous_register_spill_threshold', 8)
+        self.regs = VintageState(TestsState.view).registers
+
+    def tearDown(self):
+        TestsState.view.settings().erase('vintageous_register_spill_threshold')
+
+    def testRegistersShareTheSamePayloads(self):
+        self.regs['a'] = ['foo', 'bar']
+        self.assertIs(registers._REGISTER_DATA['a'], registers._REGISTER_DATA['"'])
+
+    def testSmallValuesAreKeptInMemory(self):
+        self.regs['a'] = ['foo']
+        self.assertFalse(registers._REGISTER_DATA['a'].payloads[0].spilled)
+
+    def testLargeValuesAreSpilledToDisk(self):
+        self.regs['a'] = ['foo', 'x' * 100]
+        payloads = registers._REGISTER_DATA['a'].payloads
+        self.assertFalse(payloads[0].spilled)
+        self.assertTrue(payloads[1].spilled)
+        self.assertEqual(self.regs['a'], ['foo', 'x' * 100])
+
+    def testSpilledValuesAreReadBackAsText(self):
+        self.regs['a'] = ['\u00e9' * 100]
+        self.assertEqual(self.regs['a'][0], '\u00e9' * 100)
+
+    def testCanAppendToSpilledValues(self):
+        self.regs['a'] = ['x' * 100]
+        self.regs['A'] = ['y']
+        self.assertEqual(self.regs['a'], ['x' * 100 + 'y'])
+
+    def testMemoryUsageCountsSharedPayloadsOnce(self):
+        self.regs['a'] = ['foo', 'x' * 100]
+        self.assertEqual(registers.memory_usage(), (3, 100))
+
+    def testMemoryUsageCountsPlainLists(self):
+        registers._REGISTER_DATA['a'] = ['foo']
+        self.assertEqual(registers.memory_usage(), (3, 0))
+
+
+class TestCaseRegisterPersistence(unittest.TestCase):
+    def setUp(self):
+        sublime.set_clipboard('')
+        clipboard.reset()
+        registers._REGISTER_DATA = {}
+        registers._NUMBERED_REGISTERS.clear()
+        TestsState.view.settings().erase('vintage')
+        drop_vintage_settings(TestsState.view)
+        TestsState.view.settings().erase('vintageous_use_sys_clipboard')
+        self.regs = VintageState(TestsState.view).registers
+
+        registers._saved_keys.clear()
+
+    def tearDown(self):
+        registers._restored = True
+        registers._saved_keys.clear()
+
+    def testRestoresSavedRegistersOnFirstUse(self):
+        saved = {'values': {'1': ['foo'], '2': ['bar']},
+                 'registers': {'a': '1'},
+                 'numbered': {'0': '2', 'offset': 0}}
+        registers._restored = False
+        with mock.patch.object(registers.session, 'enabled', return_value=True), \
+             mock.patch.object(registers.session, 'get', side_effect=saved.get):
+                self.assertEqual(self.regs.get('a'), ['foo'])
+                self.assertEqual(self.regs.get('1'), ['bar'])
+
+    def testRestoresSavedRegistersOnceEnabled(self):
+        saved = {'values': {'1': ['foo']}, 'registers': {'a': '1'}}
+        registers._restored = False
+        with mock.patch.object(registers.session, 'enabled', return_value=False), \
+             mock.patch.object(registers.session, 'get', side_effect=saved.get):
+                self.assertEqual(self.regs.get('a'), None)
+                registers.session.enabled.return_value = True
+                self.assertEqual(self.regs.get('a'), ['foo'])
+
+    def testDoesNotRestoreSavedRegistersTwice(self):
+        registers._restored = True
+        with mock.patch.object(registers.session, 'get') as get:
+            self.regs.get('a')
+            self.assertFalse(get.called)
+
+    def testSavesRegisters(self):
+        with mock.patch.object(registers.session, 'enabled', return_value=True), \
+             mock.patch.object(registers.session, 'put') as put:
+                self.regs.set('a', ['foo'])
+                key = registers._REGISTER_DATA['a'].session_key
+                put.assert_any_call('registers', 'a', key)
+                put.assert_any_call('registers', '"', key)
+
+    def testSavesEachValueOnce(self):
+        with mock.patch.object(registers.session, 'enabled', return_value=True), \
+             mock.patch.object(registers.session, 'put') as put:
+                self.regs.set('a', ['foo'])
+                key = registers._REGISTER_DATA['a'].session_key
+                values = [c for c in put.call_args_list if c[0][0] == 'values']
+                self.assertEqual(values, [mock.call('values', key, ['foo'])])
+
+    def testDropsValuesNoRegisterHolds(self):
+        with mock.patch.object(registers.session, 'enabled', return_value=True), \
+             mock.patch.object(registers.session, 'put') as put:
+                self.regs.set('a', ['foo'])
+                key = registers._REGISTER_DATA['a'].session_key
+                self.regs.set('a', ['bar'])
+                put.assert_any_call('values', key, None)
+
+    def testDoesNotSaveLargeValues(self):
+        with mock.patch.object(registers, 'MAX_SAVED_SIZE', 8), \
+             mock.patch.object(registers.session, 'enabled', return_value=True), \
+             mock.patch.object(registers.session, 'put') as put:
+                self.regs.set('a', ['x' * 100])
+                put.assert_any_call('registers', 'a', None)
+                self.assertFalse([c for c in put.call_args_list if c[0][0] == 'values'])
+
+    def testDoesNotSaveSpilledValues(self):
+        TestsState.view.settings().set('vintageous_register_spill_threshold', 8)
+        try:
+            with mock.patch.object(registers.session, 'enabled', return_value=True), \
+                 mock.patch.object(registers.session, 'put') as put:
+                    self.regs.set('a', ['x' * 100])
+                    put.assert_any_call('registers', 'a', None)
+        finally:
+            TestsState.view.settings().erase('vintageous_register_spill_threshold')
+
+
 class Test_get_selected_text(unittest.TestCase):
     def setUp(self):
         sublime.set_clipboard('')
+        clipboard.reset()
         registers._REGISTER_DATA = {}
+        registers._NUMBERED_REGISTERS.clear()
         TestsState.view.settings().erase('vintage')
+        drop_vintage_settings(TestsState.view)
         TestsState.view.settings().erase('vintageous_use_sys_clipboard')
         self.regs = VintageState(TestsState.view).registers
         self.regs.view = mock.Mock()
@@ -354,8 +532,11 @@ class Test_get_selected_text(unittest.TestCase):
 class Test_yank(unittest.TestCase):
     def setUp(self):
         sublime.set_clipboard('')
+        clipboard.reset()
         registers._REGISTER_DATA = {}
+        registers._NUMBERED_REGISTERS.clear()
         TestsState.view.settings().erase('vintage')
+        drop_vintage_settings(TestsState.view)
         TestsState.view.settings().erase('vintageous_use_sys_clipboard')
         self.regs = VintageState(TestsState.view).registers
         self.regs.view = mock.Mock()
@@ -421,3 +602,46 @@ class Test_yank(unittest.TestCase):
                 self.regs.yank(vi_cmd_data)
                 self.assertEqual(registers._REGISTER_DATA, {})
 
+    def testYankPopulatesRegisterZero(self):
+        vi_cmd_data = {
+            'can_yank': True,
+            'is_yank': True,
+            'register': None,
+            'populates_small_delete_register': False,
+            }
+
+        with mock.patch.object(self.regs, 'get_selected_text') as gst:
+            gst.return_value = ['foo\n']
+            self.regs.yank(vi_cmd_data)
+            self.assertEqual(registers._REGISTER_DATA, {'"': ['foo\n'], '0': ['foo\n']})
+            self.assertEqual(registers._NUMBERED_REGISTERS[1], None)
+
+    def testDeletingLinesShiftsNumberedRegisters(self):
+        vi_cmd_data = {
+            'can_yank': True,
+            'register': None,
+            'yanks_linewise': True,
+            'populates_small_delete_register': False,
+            }
+
+        with mock.patch.object(self.regs, 'get_selected_text') as gst:
+            gst.return_value = ['foo\n']
+            self.regs.yank(vi_cmd_data)
+            gst.return_value = ['bar\n']
+            self.regs.yank(vi_cmd_data)
+            self.assertEqual(self.regs['1'], ['bar\n'])
+            self.assertEqual(self.regs['2'], ['foo\n'])
+            self.assertTrue('0' not in registers._REGISTER_DATA)
+
+    def testDeletingWithinLineDoesNotShiftNumberedRegisters(self):
+        vi_cmd_data = {
+            'can_yank': True,
+            'register': None,
+            'populates_small_delete_register': False,
+            }
+
+        with mock.patch.object(self.regs, 'get_selected_text') as gst:
+            gst.return_value = ['foo']
+            self.regs.yank(vi_cmd_data)
+            self.assertEqual(registers._NUMBERED_REGISTERS[1], None)
+
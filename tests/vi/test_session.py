@@ -0,0 +1,131 @@
+import unittest
+from unittest import mock
+
+import os
+import shutil
+import tempfile
+
+from Vintageous.vi import session
+
+
+class SessionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, session.FILE_NAME)
+        self.patches = [mock.patch.object(session, '_path', return_value=self.path),
+                        mock.patch.object(session, 'enabled', return_value=True),
+                        mock.patch.object(session.sublime, 'set_timeout_async')]
+        for p in self.patches:
+            p.start()
+        session.forget()
+
+    def tearDown(self):
+        session.forget()
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.dir)
+
+    def read_records(self):
+        with open(self.path, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+
+class Test_put(SessionTestCase):
+    def testWritesInTheBackground(self):
+        session.put('registers', 'a', ['foo'])
+        self.assertFalse(os.path.exists(self.path))
+        session.sublime.set_timeout_async.assert_called_once_with(session.flush, session.DELAY)
+        session.flush()
+        self.assertEqual(self.read_records(), ['["registers","a",["foo"]]'])
+
+    def testSchedulesOneWriteForManyChanges(self):
+        session.put('registers', 'a', ['foo'])
+        session.put('registers', 'b', ['bar'])
+        self.assertEqual(session.sublime.set_timeout_async.call_count, 1)
+
+    def testWritesLatestChangeToEachKeyOnly(self):
+        session.put('registers', 'a', ['foo'])
+        session.put('registers', 'a', ['bar'])
+        session.flush()
+        session.put('registers', 'a', ['baz'])
+        session.flush()
+        self.assertEqual(self.read_records(), ['["registers","a",["bar"]]',
+                                               '["registers","a",["baz"]]'])
+
+    def testReadsPendingChanges(self):
+        session.put('registers', 'a', ['foo'])
+        self.assertEqual(session.get('registers'), {'a': ['foo']})
+
+    def testLatestRecordWins(self):
+        session.put('registers', 'a', ['foo'])
+        session.put('registers', 'a', ['bar'])
+        session.forget()
+        self.assertEqual(session.get('registers'), {'a': ['bar']})
+
+    def testNoneRemovesKeys(self):
+        session.put('registers', 'a', ['foo'])
+        session.put('registers', 'a', None)
+        session.forget()
+        self.assertEqual(session.get('registers'), {})
+
+    def testDoesNothingIfDisabled(self):
+        session.enabled.return_value = False
+        session.put('registers', 'a', ['foo'])
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(session.get('registers'), {})
+
+
+class Test_get(SessionTestCase):
+    def testReturnsEmptyDictWithoutSessionFile(self):
+        self.assertEqual(session.get('marks'), {})
+
+    def testSkipsBrokenRecords(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('["marks","a",["foo.txt",[1,2]]]\n["marks","b"')
+        self.assertEqual(session.get('marks'), {'a': ['foo.txt', [1, 2]]})
+
+
+class Test_compact(SessionTestCase):
+    def testKeepsLiveEntriesOnly(self):
+        session.put('registers', 'a', ['foo'])
+        session.put('registers', 'a', ['bar'])
+        session.put('registers', 'b', ['baz'])
+        session.flush()
+        session.put('registers', 'b', None)
+        session.compact()
+        self.assertEqual(self.read_records(), ['["registers","a",["bar"]]'])
+
+    def testRunsAutomatically(self):
+        with mock.patch.object(session, 'MIN_RECORDS_TO_COMPACT', 8):
+            for i in range(8):
+                session.put('history', 'cmdline', [str(i)])
+                session.flush()
+        self.assertEqual(self.read_records(), ['["history","cmdline",["7"]]'])
+
+
+class TestPersistentDict(SessionTestCase):
+    def testSavesItems(self):
+        d = session.PersistentDict('macros')
+        d['q'] = [{'command': 'foo', 'args': None}]
+        session.forget()
+        self.assertEqual(session.get('macros'), {'q': [{'command': 'foo', 'args': None}]})
+
+    def testRestoresItemsOnFirstUse(self):
+        session.put('macros', 'q', [])
+        d = session.PersistentDict('macros')
+        self.assertEqual(dict.__len__(d), 0)
+        self.assertEqual(d['q'], [])
+
+    def testRestoredItemsReplaceDefaults(self):
+        session.put('history', 'cmdline', ['ls'])
+        d = session.PersistentDict('history', {'cmdline': [], 'searches': []})
+        self.assertEqual(d['cmdline'], ['ls'])
+        self.assertEqual(d['searches'], [])
+
+    def testRestoresItemsOnceEnabled(self):
+        session.put('macros', 'q', [])
+        d = session.PersistentDict('macros')
+        session.enabled.return_value = False
+        self.assertNotIn('q', d)
+        session.enabled.return_value = True
+        self.assertEqual(d['q'], [])
@@ -13,6 +13,8 @@ from Vintageous.vi.settings import set_generic_view_setting
 from Vintageous.vi.settings import opt_bool_parser
 from Vintageous.vi.settings import set_minimap
 from Vintageous.vi.settings import opt_rulers_parser
+from Vintageous.vi.settings import drop_vintage_settings
+from Vintageous.vi.settings import flush_vintage_settings
 
 
 class TestSublimeSettings(unittest.TestCase):
@@ -41,16 +43,19 @@ class TestSublimeSettings(unittest.TestCase):
 class TestVintageSettings(unittest.TestCase):
 	def setUp(self):
 		TestsState.view.settings().erase('vintage')
+		drop_vintage_settings(TestsState.view)
 		self.setts = VintageSettings(view=TestsState.view)
 
 	def testCanInitializeClass(self):
 		self.assertEqual(self.setts.view, TestsState.view)
+		flush_vintage_settings(TestsState.view)
 		self.assertEqual(TestsState.view.settings().get('vintage'), {})
 
 	def testCanSetSetting(self):
 		self.assertEqual(self.setts['foo'], None)
 
 		self.setts['foo'] = 100
+		flush_vintage_settings(TestsState.view)
 		self.assertEqual(TestsState.view.settings().get('vintage')['foo'], 100)
 
 	def testCanGetSetting(self):
@@ -60,10 +65,27 @@ class TestVintageSettings(unittest.TestCase):
 	def testCanGetNonexistingKey(self):
 		self.assertEqual(self.setts['foo'], None)
 
+	def testDefersWritesUntilFlushed(self):
+		self.setts['foo'] = 100
+		self.assertEqual(TestsState.view.settings().get('vintage').get('foo'), None)
+		flush_vintage_settings(TestsState.view)
+		self.assertEqual(TestsState.view.settings().get('vintage')['foo'], 100)
+
+	def testSharesStateBetweenInstancesForSameView(self):
+		self.setts['foo'] = 100
+		other = VintageSettings(view=TestsState.view)
+		self.assertEqual(other['foo'], 100)
+
+	def testCanDropState(self):
+		self.setts['foo'] = 100
+		drop_vintage_settings(TestsState.view)
+		self.assertEqual(VintageSettings(view=TestsState.view)['foo'], None)
+
 
 class TestSettingsManager(unittest.TestCase):
 	def setUp(self):
 		TestsState.view.settings().erase('vintage')
+		drop_vintage_settings(TestsState.view)
 		self.settsman = SettingsManager(view=TestsState.view)
 
 	def testCanInitializeClass(self):
@@ -80,6 +102,7 @@ class TestSettingsManager(unittest.TestCase):
 class TestViEditorSettings(unittest.TestCase):
 	def setUp(self):
 		TestsState.view.settings().erase('vintage')
+		drop_vintage_settings(TestsState.view)
 		TestsState.view.settings().erase('vintageous_hlsearch')
 		TestsState.view.settings().erase('vintageous_foo')
 		TestsState.view.window().settings().erase('vintageous_foo')
@@ -137,6 +160,7 @@ class TestViEditorSettings(unittest.TestCase):
 class Test_get_option(unittest.TestCase):
 	def setUp(self):
 		TestsState.view.settings().erase('vintage')
+		drop_vintage_settings(TestsState.view)
 		TestsState.view.settings().erase('vintageous_foo')
 		self.vi_settings = VintageSettings(view=TestsState.view)
 
@@ -0,0 +1,63 @@
+import unittest
+
+import sublime
+
+from Vintageous.vi.tags import TagIndex
+
+from Vintageous.tests import make_fake_view
+
+
+def make_index(text):
+    return TagIndex(make_fake_view(text))
+
+
+class Test_TagIndex(unittest.TestCase):
+    def setUp(self):
+        #                              0         1         2
+        #                              012345678901234567890123456789
+        self.index = make_index('<div><p>hi</p></div>')
+
+    def testFindsInnermostElement(self):
+        element = self.index.element(9)
+        self.assertEqual(self.index.inner(element), sublime.Region(8, 10))
+        self.assertEqual(self.index.outer(element), sublime.Region(5, 14))
+
+    def testCountsSelectEnclosingElements(self):
+        element = self.index.element(9, count=2)
+        self.assertEqual(self.index.outer(element), sublime.Region(0, 20))
+        self.assertIsNone(self.index.element(9, count=3))
+
+    def testTagsBelongToTheirElement(self):
+        self.assertEqual(self.index.outer(self.index.element(5)), sublime.Region(5, 14))
+        self.assertEqual(self.index.outer(self.index.element(12)), sublime.Region(5, 14))
+        self.assertEqual(self.index.outer(self.index.element(14)), sublime.Region(0, 20))
+
+    def testReturnsNoneOutsideOfAnyElement(self):
+        self.assertIsNone(self.index.element(20))
+
+
+class Test_TagIndex_Tokenizer(unittest.TestCase):
+    def testIgnoresCase(self):
+        index = make_index('<DIV>x</div>')
+        self.assertEqual(index.inner(index.element(5)), sublime.Region(5, 6))
+
+    def testSkipsEmptyElementsAndComments(self):
+        index = make_index('<a><br/><!-- <b> --><img src="x/"></a>')
+        self.assertEqual(index.starts, [0, 20])
+        self.assertEqual(index.outer(index.element(10)), sublime.Region(0, 38))
+
+    def testSkipsElementsNeverClosed(self):
+        index = make_index('<a><img src="x/"></a>')
+        self.assertEqual(index.outer(index.element(5)), sublime.Region(0, 21))
+
+    def testClosesElementsLeftOpen(self):
+        index = make_index('<ul><li>a<li>b</ul>')
+        self.assertEqual(index.outer(index.element(13)), sublime.Region(0, 19))
+
+    def testIgnoresStrayClosingTags(self):
+        index = make_index('<a>x</b>y</a>')
+        self.assertEqual(index.inner(index.element(6)), sublime.Region(3, 9))
+
+    def testDoesNotParseScripts(self):
+        index = make_index('<script>if (a<b) {}</script>')
+        self.assertEqual(index.inner(index.element(10)), sublime.Region(8, 19))
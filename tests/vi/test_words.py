@@ -0,0 +1,121 @@
+from unittest import mock
+
+import sublime
+
+from Vintageous.tests import BufferTest
+from Vintageous.tests import set_text
+
+from Vintageous.vi import words
+from Vintageous.vi.words import WordSnapshot
+from Vintageous.vi.words import SUPPORTED_CLASSES
+
+
+SAMPLES = (
+    '',
+    'foo',
+    '  foo bar\n',
+    '  (foo)\n',
+    'foo(bar) baz.qux\n\n  last_word, ok\n',
+    '  \n  \n\n',
+    'a.,b -- c\t\td\n e\n',
+)
+
+CLASSES = (
+    sublime.CLASS_WORD_START,
+    sublime.CLASS_WORD_END,
+    sublime.CLASS_PUNCTUATION_START,
+    sublime.CLASS_PUNCTUATION_END,
+    sublime.CLASS_LINE_START,
+    sublime.CLASS_LINE_END,
+    sublime.CLASS_EMPTY_LINE,
+    sublime.CLASS_WORD_START | sublime.CLASS_PUNCTUATION_START | sublime.CLASS_LINE_END,
+)
+
+
+class Test_WordSnapshot_MatchesTheApi(BufferTest):
+    def testClassify(self):
+        for text in SAMPLES:
+            set_text(self.view, text)
+            snapshot = WordSnapshot(self.view)
+            for pt in range(len(text) + 1):
+                self.assertEqual(snapshot.classify(pt) & SUPPORTED_CLASSES,
+                                 self.view.classify(pt) & SUPPORTED_CLASSES,
+                                 (text, pt))
+
+    def testFindByClass(self):
+        for text in SAMPLES:
+            set_text(self.view, text)
+            snapshot = WordSnapshot(self.view)
+            for pt in range(len(text) + 1):
+                for classes in CLASSES:
+                    for forward in (True, False):
+                        self.assertEqual(snapshot.find_by_class(pt, forward, classes),
+                                         self.view.find_by_class(pt, forward, classes),
+                                         (text, pt, classes, forward))
+
+    def testFindByClassWithoutSeparators(self):
+        for text in SAMPLES:
+            set_text(self.view, text)
+            snapshot = WordSnapshot(self.view)
+            for pt in range(len(text) + 1):
+                self.assertEqual(snapshot.find_by_class(pt, True, CLASSES[-1], separators=''),
+                                 self.view.find_by_class(pt, True, CLASSES[-1], separators=''),
+                                 (text, pt))
+
+    def testSubstrAndLine(self):
+        set_text(self.view, SAMPLES[4])
+        snapshot = WordSnapshot(self.view)
+        for pt in range(-1, len(SAMPLES[4]) + 2):
+            self.assertEqual(snapshot.substr(pt), self.view.substr(pt), pt)
+        for pt in range(len(SAMPLES[4]) + 1):
+            self.assertEqual(snapshot.line(pt), self.view.line(pt), pt)
+
+
+class Test_WordSnapshot_Window(BufferTest):
+    def setUp(self):
+        super().setUp()
+        set_text(self.view, 'foo bar\n' * 1000)
+
+    def tearDown(self):
+        set_text(self.view, '')
+        super().tearDown()
+
+    @mock.patch('Vintageous.vi.words.WINDOW_SIZE', 16)
+    def testWidensWindowAsNeeded(self):
+        snapshot = WordSnapshot(self.view)
+        self.assertEqual(snapshot.find_by_class(7990, True, sublime.CLASS_LINE_END), 7991)
+        self.assertEqual(snapshot.find_by_class(7990, False, sublime.CLASS_LINE_START), 7984)
+        self.assertEqual(snapshot.line(4004), self.view.line(4004))
+        self.assertEqual(snapshot.find_by_class(0, True, sublime.CLASS_EMPTY_LINE), 8000)
+
+    @mock.patch('Vintageous.vi.words.WINDOW_SIZE', 16)
+    def testPrefetchesWindowAroundEachRegion(self):
+        snapshot = WordSnapshot(self.view)
+        with mock.patch.object(self.view, 'substr', wraps=self.view.substr) as substr:
+            snapshot.prefetch([sublime.Region(10), sublime.Region(4000, 4002),
+                               sublime.Region(7000), sublime.Region(7004)])
+            # The last two regions share a window.
+            self.assertEqual(substr.call_count, 3)
+            # Text between the windows isn't fetched.
+            fetched = sum(call[0][0].size() for call in substr.call_args_list)
+            self.assertLess(fetched, 200)
+
+        with mock.patch.object(self.view, 'substr') as substr:
+            self.assertEqual(snapshot.full_line(10), sublime.Region(8, 16))
+            self.assertEqual(snapshot.substr(sublime.Region(4000, 4003)), 'foo')
+            self.assertEqual(snapshot.line(7000), sublime.Region(7000, 7007))
+            self.assertEqual(substr.call_count, 0)
+
+    @mock.patch('Vintageous.vi.words.WINDOW_SIZE', 16)
+    def testMergesWindowsThatGrowIntoEachOther(self):
+        snapshot = WordSnapshot(self.view)
+        snapshot.prefetch([sublime.Region(100), sublime.Region(200)])
+        self.assertEqual(snapshot.substr(sublime.Region(96, 208)), self.view.substr(sublime.Region(96, 208)))
+        self.assertEqual(len(snapshot._windows), 1)
+
+    def testIsReusedUntilTheBufferChanges(self):
+        snapshot = words.get_word_snapshot(self.view)
+        self.assertIs(words.get_word_snapshot(self.view), snapshot)
+        set_text(self.view, 'foo')
+        self.assertIsNot(words.get_word_snapshot(self.view), snapshot)
+        words.drop_word_snapshot(self.view)
@@ -10,6 +10,7 @@ from Vintageous.vi.constants import MODE_VISUAL
 from Vintageous.vi.constants import MODE_VISUAL_LINE
 from Vintageous.vi.constants import MODE_VISUAL_BLOCK
 from Vintageous.vi.constants import regions_transformer
+from Vintageous.vi.lines import get_line_index
 from Vintageous.vi.text_objects import get_text_object_region
 
 
@@ -612,6 +613,8 @@ class _vi_big_x_motion(sublime_plugin.TextCommand):
 
 
 class _vi_l(sublime_plugin.TextCommand):
+    takes_count = True
+
     def run(self, edit, mode=None, count=None):
         def f(view, s):
             if mode == MODE_NORMAL:
@@ -648,6 +651,8 @@ class _vi_l(sublime_plugin.TextCommand):
 
 
 class _vi_h(sublime_plugin.TextCommand, AntonymAwarenessMixin):
+    takes_count = True
+
     def run(self, edit, count=None, mode=None):
         def f(view, s):
             if mode == _MODE_INTERNAL_NORMAL:
@@ -702,12 +707,15 @@ class _vi_h(sublime_plugin.TextCommand, AntonymAwarenessMixin):
 
 
 class _vi_j(sublime_plugin.TextCommand):
+    takes_count = True
+
     def folded_rows(self, pt):
         folds = self.view.folded_regions()
         try:
             fold = [f for f in folds if f.contains(pt)][0]
-            fold_row_a = self.view.rowcol(fold.a)[0]
-            fold_row_b = self.view.rowcol(fold.b - 1)[0]
+            lines = get_line_index(self.view)
+            fold_row_a = lines.row(fold.a)
+            fold_row_b = lines.row(fold.b - 1)
             # Return no. of hidden lines.
             return (fold_row_b - fold_row_a)
         except IndexError:
@@ -719,92 +727,95 @@ class _vi_j(sublime_plugin.TextCommand):
         folds = self.view.folded_regions()
         try:
             fold = [f for f in folds if f.contains(pt)][0]
-            non_folded_row = self.view.rowcol(self.view.full_line(fold.b).b)[0]
-            pt = self.view.text_point(non_folded_row, 0)
+            lines = get_line_index(self.view)
+            non_folded_row = lines.row(lines.full_line(fold.b).b)
+            pt = lines.text_point(non_folded_row, 0)
         except IndexError:
             pass
         return pt
 
     def run(self, edit, count=None, mode=None, xpos=0):
+        lines = get_line_index(self.view)
+
         def f(view, s):
             if mode == MODE_NORMAL:
-                current_row = view.rowcol(s.b)[0]
-                target_row = min(current_row + count, view.rowcol(view.size())[0])
-                invisible_rows = self.folded_rows(view.line(s.b).b + 1)
-                target_pt = view.text_point(target_row + invisible_rows, 0)
+                current_row = lines.rowcol(s.b)[0]
+                target_row = min(current_row + count, lines.last_row)
+                invisible_rows = self.folded_rows(lines.line(s.b).b + 1)
+                target_pt = lines.text_point(target_row + invisible_rows, 0)
                 target_pt = self.next_non_folded_pt(target_pt)
 
-                if view.line(target_pt).empty():
+                if lines.line(target_pt).empty():
                     return sublime.Region(target_pt, target_pt)
 
-                target_pt = min(target_pt + xpos, view.line(target_pt).b - 1)
+                target_pt = min(target_pt + xpos, lines.line(target_pt).b - 1)
                 return sublime.Region(target_pt, target_pt)
 
             if mode == _MODE_INTERNAL_NORMAL:
-                current_row = view.rowcol(s.b)[0]
-                target_row = min(current_row + count, view.rowcol(view.size())[0])
-                target_pt = view.text_point(target_row, 0)
-                return sublime.Region(view.line(s.a).a, view.full_line(target_pt).b)
+                current_row = lines.rowcol(s.b)[0]
+                target_row = min(current_row + count, lines.last_row)
+                target_pt = lines.text_point(target_row, 0)
+                return sublime.Region(lines.line(s.a).a, lines.full_line(target_pt).b)
 
             if mode == MODE_VISUAL:
                 exact_position = s.b - 1 if (s.a < s.b) else s.b
-                current_row = view.rowcol(exact_position)[0]
-                target_row = min(current_row + count, view.rowcol(view.size())[0])
-                target_pt = view.text_point(target_row, 0)
-                is_long_enough = view.full_line(target_pt).size() > xpos
+                current_row = lines.rowcol(exact_position)[0]
+                target_row = min(current_row + count, lines.last_row)
+                target_pt = lines.text_point(target_row, 0)
+                is_long_enough = lines.full_line(target_pt).size() > xpos
 
                 # We're crossing over to the other side of .a; we need to modify .a.
                 crosses_a = False
-                if (s.a > s.b) and (view.rowcol(s.a)[0] < target_row):
+                if (s.a > s.b) and (lines.rowcol(s.a)[0] < target_row):
                     crosses_a = True
 
-                if view.line(s.begin()) == view.line(s.end() - 1):
+                if lines.line(s.begin()) == lines.line(s.end() - 1):
                     if s.a > s.b:
                         if is_long_enough:
-                            return sublime.Region(s.a - 1, view.text_point(target_row, xpos) + 1)
+                            return sublime.Region(s.a - 1, lines.text_point(target_row, xpos) + 1)
                         else:
-                            return sublime.Region(s.a - 1, view.full_line(target_pt).b)
+                            return sublime.Region(s.a - 1, lines.full_line(target_pt).b)
 
                 # Returning to the same line...
-                if not crosses_a and abs(view.rowcol(s.begin())[0] - view.rowcol(s.end())[0]) == 1:
+                if not crosses_a and abs(lines.rowcol(s.begin())[0] - lines.rowcol(s.end())[0]) == 1:
                     if s.a > s.b:
                         if is_long_enough:
-                            if view.rowcol(s.a - 1)[1] <= view.rowcol(s.b)[1]:
-                                return sublime.Region(s.a - 1, view.text_point(target_row, xpos) + 1)
+                            if lines.rowcol(s.a - 1)[1] <= lines.rowcol(s.b)[1]:
+                                return sublime.Region(s.a - 1, lines.text_point(target_row, xpos) + 1)
 
                 if is_long_enough:
                     if s.a < s.b:
-                        return sublime.Region(s.a, view.text_point(target_row, xpos) + 1)
+                        return sublime.Region(s.a, lines.text_point(target_row, xpos) + 1)
                     elif s.a > s.b:
                         start = s.a if not crosses_a else s.a - 1
-                        end = view.text_point(target_row, xpos)
+                        end = lines.text_point(target_row, xpos)
                         end = end if (end < s.a) else end + 1
                         return sublime.Region(start, end)
                 else:
                     if s.a < s.b:
-                        return sublime.Region(s.a, view.full_line(target_pt).b)
+                        return sublime.Region(s.a, lines.full_line(target_pt).b)
                     elif s.a > s.b:
-                        end = view.full_line(target_pt).b
+                        end = lines.full_line(target_pt).b
                         end = end - 1 if not crosses_a else end
                         return sublime.Region(s.a, end)
 
             if mode == MODE_VISUAL_LINE:
                 if s.a < s.b:
-                    current_row = view.rowcol(s.b - 1)[0]
-                    target_row = min(current_row + count, view.rowcol(view.size())[0])
+                    current_row = lines.rowcol(s.b - 1)[0]
+                    target_row = min(current_row + count, lines.last_row)
 
-                    target_pt = view.text_point(target_row, 0)
-                    return sublime.Region(s.a, view.full_line(target_pt).b)
+                    target_pt = lines.text_point(target_row, 0)
+                    return sublime.Region(s.a, lines.full_line(target_pt).b)
 
                 elif s.a > s.b:
-                    current_row = view.rowcol(s.b)[0]
-                    target_row = min(current_row + count, view.rowcol(view.size())[0])
-                    target_pt = view.text_point(target_row, 0)
+                    current_row = lines.rowcol(s.b)[0]
+                    target_row = min(current_row + count, lines.last_row)
+                    target_pt = lines.text_point(target_row, 0)
 
-                    if target_row > view.rowcol(s.a - 1)[0]:
-                        return sublime.Region(view.line(s.a - 1).a, view.full_line(target_pt).b)
+                    if target_row > lines.rowcol(s.a - 1)[0]:
+                        return sublime.Region(lines.line(s.a - 1).a, lines.full_line(target_pt).b)
 
-                    return sublime.Region(s.a, view.full_line(target_pt).a)
+                    return sublime.Region(s.a, lines.full_line(target_pt).a)
 
             return s
 
@@ -836,65 +847,70 @@ class _vi_j(sublime_plugin.TextCommand):
 
 
 class _vi_k(sublime_plugin.TextCommand, AntonymAwarenessMixin):
+    takes_count = True
+
     def previous_non_folded_pt(self, pt):
         # FIXME: If we have two contiguous folds, this method will fail.
         # Handle folded regions.
         folds = self.view.folded_regions()
         try:
             fold = [f for f in folds if f.contains(pt)][0]
-            non_folded_row = self.view.rowcol(fold.a - 1)[0]
-            pt = self.view.text_point(non_folded_row, 0)
+            lines = get_line_index(self.view)
+            non_folded_row = lines.row(fold.a - 1)
+            pt = lines.text_point(non_folded_row, 0)
         except IndexError:
             pass
         return pt
 
     def run(self, edit, count=None, mode=None, xpos=0):
+        lines = get_line_index(self.view)
+
         def f(view, s):
             if mode == MODE_NORMAL:
-                current_row = view.rowcol(s.b)[0]
-                target_row = min(current_row - count, view.rowcol(view.size())[0])
-                target_pt = view.text_point(target_row, 0)
+                current_row = lines.rowcol(s.b)[0]
+                target_row = min(current_row - count, lines.last_row)
+                target_pt = lines.text_point(target_row, 0)
                 target_pt = self.previous_non_folded_pt(target_pt)
 
-                if view.line(target_pt).empty():
+                if lines.line(target_pt).empty():
                     return sublime.Region(target_pt, target_pt)
 
-                target_pt = min(target_pt + xpos, view.line(target_pt).b - 1)
+                target_pt = min(target_pt + xpos, lines.line(target_pt).b - 1)
                 return sublime.Region(target_pt, target_pt)
 
             if mode == _MODE_INTERNAL_NORMAL:
-                current_row = view.rowcol(s.b)[0]
-                target_row = min(current_row - count, view.rowcol(view.size())[0])
-                target_pt = view.text_point(target_row, 0)
-                return sublime.Region(view.full_line(s.a).b, view.line(target_pt).a)
+                current_row = lines.rowcol(s.b)[0]
+                target_row = min(current_row - count, lines.last_row)
+                target_pt = lines.text_point(target_row, 0)
+                return sublime.Region(lines.full_line(s.a).b, lines.line(target_pt).a)
 
             if mode == MODE_VISUAL:
                 exact_position = s.b - 1 if (s.a < s.b) else s.b
-                current_row = view.rowcol(exact_position)[0]
+                current_row = lines.rowcol(exact_position)[0]
                 target_row = max(current_row - count, 0)
-                target_pt = view.text_point(target_row, 0)
-                is_long_enough = view.full_line(target_pt).size() > xpos
+                target_pt = lines.text_point(target_row, 0)
+                is_long_enough = lines.full_line(target_pt).size() > xpos
 
                 # We're crossing over to the other side of .a; we need to modify .a.
                 crosses_a = False
-                if (s.a < s.b) and (view.rowcol(s.a)[0] > target_row):
+                if (s.a < s.b) and (lines.rowcol(s.a)[0] > target_row):
                     crosses_a = True
 
-                if view.line(s.begin()) == view.line(s.end() - 1):
+                if lines.line(s.begin()) == lines.line(s.end() - 1):
                     if s.a < s.b:
                         if is_long_enough:
-                            return sublime.Region(s.a + 1, view.text_point(target_row, xpos))
+                            return sublime.Region(s.a + 1, lines.text_point(target_row, xpos))
                         else:
-                            return sublime.Region(s.a + 1, view.line(target_pt).b)
+                            return sublime.Region(s.a + 1, lines.line(target_pt).b)
 
                 # Returning to the same line...
-                if not crosses_a and abs(view.rowcol(s.begin())[0] - view.rowcol(s.end() - 1)[0]) == 1:
+                if not crosses_a and abs(lines.rowcol(s.begin())[0] - lines.rowcol(s.end() - 1)[0]) == 1:
                     if s.a < s.b:
                         if is_long_enough:
-                            if view.rowcol(s.a)[1] <= view.rowcol(s.b - 1)[1]:
-                                return sublime.Region(s.a, view.text_point(target_row, xpos) + 1)
+                            if lines.rowcol(s.a)[1] <= lines.rowcol(s.b - 1)[1]:
+                                return sublime.Region(s.a, lines.text_point(target_row, xpos) + 1)
                             else:
-                                r = sublime.Region(s.a + 1, view.text_point(target_row, xpos))
+                                r = sublime.Region(s.a + 1, lines.text_point(target_row, xpos))
                                 return r
 
                 if is_long_enough:
@@ -908,34 +924,34 @@ class _vi_k(sublime_plugin.TextCommand, AntonymAwarenessMixin):
                         else:
                             offset = 1
                         start = s.a if not crosses_a else s.a + 1
-                        return sublime.Region(start, view.text_point(target_row, xpos + offset))
+                        return sublime.Region(start, lines.text_point(target_row, xpos + offset))
                     elif s.a > s.b:
-                        return sublime.Region(s.a, view.text_point(target_row, xpos))
+                        return sublime.Region(s.a, lines.text_point(target_row, xpos))
                 else:
                     if s.a < s.b:
-                        end = view.full_line(target_pt).b
+                        end = lines.full_line(target_pt).b
                         end = end if not crosses_a else end - 1
                         return sublime.Region(s.a, end)
                     elif s.a > s.b:
-                        return sublime.Region(s.a, view.line(target_pt).b)
+                        return sublime.Region(s.a, lines.line(target_pt).b)
 
             if mode == MODE_VISUAL_LINE:
                 if s.a < s.b:
-                    current_row = view.rowcol(s.b - 1)[0]
-                    target_row = min(current_row - count, view.rowcol(view.size())[0])
-                    target_pt = view.text_point(target_row, 0)
+                    current_row = lines.rowcol(s.b - 1)[0]
+                    target_row = min(current_row - count, lines.last_row)
+                    target_pt = lines.text_point(target_row, 0)
 
-                    if target_row < view.rowcol(s.begin())[0]:
-                        return sublime.Region(view.full_line(s.a).b, view.full_line(target_pt).a)
+                    if target_row < lines.rowcol(s.begin())[0]:
+                        return sublime.Region(lines.full_line(s.a).b, lines.full_line(target_pt).a)
 
-                    return sublime.Region(s.a, view.full_line(target_pt).b)
+                    return sublime.Region(s.a, lines.full_line(target_pt).b)
 
                 elif s.a > s.b:
-                    current_row = view.rowcol(s.b)[0]
+                    current_row = lines.rowcol(s.b)[0]
                     target_row = max(current_row - count, 0)
-                    target_pt = view.text_point(target_row, 0)
+                    target_pt = lines.text_point(target_row, 0)
 
-                    return sublime.Region(s.a, view.full_line(target_pt).a)
+                    return sublime.Region(s.a, lines.full_line(target_pt).a)
 
         if self.must_run_antonym(mode=mode):
             self.view.run_command('_vi_j', {'count': count,
@@ -404,6 +404,7 @@ def vi_y(vi_cmd_data):
     vi_cmd_data['motion_required'] = True
     vi_cmd_data['has_training_wheels'] = True
     vi_cmd_data['can_yank'] = True
+    vi_cmd_data['is_yank'] = True
     vi_cmd_data['restore_original_carets'] = True
     # The yanked text will be put in the clipboard if needed. This command shouldn't do any action.
     vi_cmd_data['action']['command'] = 'no_op'
@@ -438,6 +439,7 @@ def vi_yy(vi_cmd_data):
 
     vi_cmd_data['count'] = vi_cmd_data['count'] - 1
     vi_cmd_data['can_yank'] = True
+    vi_cmd_data['is_yank'] = True
 
     # The yanked text will be put in the clipboard if needed. This command shouldn't do any action.
     vi_cmd_data['action']['command'] = 'no_op'
@@ -0,0 +1,132 @@
+"""Per-view index of paragraph and sentence boundaries.
+
+   The buffer is scanned lazily in blocks, starting where the caret is and moving outward as far
+   as a motion needs, so repeated or counted {, }, ( and ) don't rescan the buffer. An index is
+   valid while the view's change count stays the same.
+"""
+
+import re
+
+from bisect import bisect_left
+from bisect import bisect_right
+
+import sublime
+
+
+BLOCK_SIZE = 64 * 1024
+
+# Minimum number of non-blank characters to read before a block to get its boundaries right.
+CONTEXT = 16
+
+# First empty line after a non-empty line.
+_PARAGRAPH_START_RX = re.compile(r'(?<=[^\n]\n)\n')
+# Last empty line before a non-empty line.
+_PARAGRAPH_END_RX = re.compile(r'(?<=\n)\n(?=[^\n])')
+# A sentence begins after a sentence end and some white space, or after empty lines.
+_SENTENCE_START_RX = re.compile(r'''(?:[.!?][)\]"']*[ \t\n]|\n\n)[ \t\n]*(?=[^ \t\n])''')
+
+PARAGRAPH_STARTS = 0
+PARAGRAPH_ENDS = 1
+SENTENCE_STARTS = 2
+
+_BOUNDARY_INDEXES = {}
+
+
+class BoundaryIndex(object):
+    """Sorted boundary offsets for a buffer snapshot, kept per block of text.
+    """
+    __slots__ = ('view', 'change_count', 'size', 'blocks')
+
+    def __init__(self, view):
+        self.view = view
+        self.change_count = view.change_count()
+        self.size = view.size()
+        # Block number -> (paragraph starts, paragraph ends, sentence starts).
+        self.blocks = {}
+
+    def _block(self, n):
+        try:
+            return self.blocks[n]
+        except KeyError:
+            pass
+
+        a = n * BLOCK_SIZE
+        b = min(a + BLOCK_SIZE, self.size)
+
+        # Read back far enough to see what precedes any leading white space.
+        context = CONTEXT * 4
+        while True:
+            start = max(0, a - context)
+            text = self.view.substr(sublime.Region(start, min(b + 1, self.size)))
+            if start == 0 or len(text[:a - start].rstrip(' \t\n')) >= CONTEXT:
+                break
+            context *= 2
+
+        def collect(rx, group_end=False):
+            found = []
+            for match in rx.finditer(text):
+                pt = start + (match.end() if group_end else match.start())
+                if a <= pt < b:
+                    found.append(pt)
+            return found
+
+        paragraph_starts = collect(_PARAGRAPH_START_RX)
+        sentence_starts = sorted(set(collect(_SENTENCE_START_RX, group_end=True) +
+                                     paragraph_starts))
+        block = self.blocks[n] = (paragraph_starts,
+                                  collect(_PARAGRAPH_END_RX),
+                                  sentence_starts)
+        return block
+
+    def _next(self, kind, pt, count):
+        n = max(pt, 0) // BLOCK_SIZE
+        while n * BLOCK_SIZE < self.size:
+            items = self._block(n)[kind]
+            i = bisect_right(items, pt)
+            if i + count <= len(items):
+                return items[i + count - 1]
+            count -= len(items) - i
+            n += 1
+
+    def _previous(self, kind, pt, count):
+        n = min(pt, self.size - 1) // BLOCK_SIZE
+        while n >= 0:
+            items = self._block(n)[kind]
+            i = bisect_left(items, pt)
+            if count <= i:
+                return items[i - count]
+            count -= i
+            n -= 1
+
+    def next_paragraph(self, pt, count=1):
+        """Returns the `count`th empty line after `pt` that follows a non-empty line, or `None`.
+        """
+        return self._next(PARAGRAPH_STARTS, pt, count)
+
+    def previous_paragraph(self, pt, count=1):
+        """Returns the `count`th empty line before `pt` that precedes a non-empty line, or `None`.
+        """
+        return self._previous(PARAGRAPH_ENDS, pt, count)
+
+    def next_sentence(self, pt, count=1):
+        """Returns the start of the `count`th sentence after `pt`, or `None`.
+        """
+        return self._next(SENTENCE_STARTS, pt, count)
+
+    def previous_sentence(self, pt, count=1):
+        """Returns the start of the `count`th sentence before `pt`, or `None`.
+        """
+        return self._previous(SENTENCE_STARTS, pt, count)
+
+
+def get_boundary_index(view):
+    """Returns the boundary index for `view`, starting a new one if the buffer has changed.
+    """
+    index = _BOUNDARY_INDEXES.get(view.id())
+    if index is None or index.change_count != view.change_count():
+        index = _BOUNDARY_INDEXES[view.id()] = BoundaryIndex(view)
+    return index
+
+
+def drop_boundary_index(view):
+    _BOUNDARY_INDEXES.pop(view.id(), None)
@@ -0,0 +1,135 @@
+"""Per-view index of matching brackets.
+
+   Pairs up (), [] and {} in a single pass over the buffer, so % and the bracket text objects
+   don't have to search back and forth for balanced brackets. An index is valid while the view's
+   change count stays the same.
+"""
+
+import re
+
+from bisect import bisect_left
+from bisect import bisect_right
+
+import sublime
+
+
+PAIRS = (
+    ('(', ')'),
+    ('[', ']'),
+    ('{', '}'),
+)
+
+OPENING = dict(PAIRS)
+CLOSING = dict((b, a) for (a, b) in PAIRS)
+
+# Brackets inside regions matching this selector are ignored if the user wants so.
+SKIP_SELECTOR = 'string, comment'
+
+_BRACKETS_RX = re.compile(r'[()\[\]{}]')
+
+_BRACKET_INDEXES = {}
+
+
+def _skipped_regions(view):
+    return sorted((r.a, r.b) for r in view.find_by_selector(SKIP_SELECTOR))
+
+
+class BracketIndex(object):
+    """Bracket positions for a buffer snapshot. Each kind of bracket is balanced on its own, like
+       Vim does.
+    """
+    __slots__ = ('change_count', 'skip', 'positions', 'partners', 'parents')
+
+    def __init__(self, view, skip=False):
+        self.change_count = view.change_count()
+        self.skip = skip
+        # Opening bracket -> positions of all brackets of its kind, in order.
+        self.positions = dict((a, []) for (a, b) in PAIRS)
+        # Bracket position -> position of its matching bracket. Unbalanced brackets are missing.
+        self.partners = {}
+        # Bracket position -> position of the innermost opening bracket of the same kind that
+        # encloses the text right after it, or None.
+        self.parents = {}
+
+        text = view.substr(sublime.Region(0, view.size()))
+        skipped = _skipped_regions(view) if skip else []
+        stacks = dict((a, []) for (a, b) in PAIRS)
+        partners = self.partners
+        parents = self.parents
+        i = 0
+
+        for match in _BRACKETS_RX.finditer(text):
+            pt = match.start()
+            while i < len(skipped) and skipped[i][1] <= pt:
+                i += 1
+            if i < len(skipped) and skipped[i][0] <= pt:
+                continue
+
+            bracket = match.group()
+            kind = bracket if bracket in OPENING else CLOSING[bracket]
+            stack = stacks[kind]
+            self.positions[kind].append(pt)
+
+            if bracket == kind:
+                parents[pt] = stack[-1] if stack else None
+                stack.append(pt)
+            else:
+                if stack:
+                    opening = stack.pop()
+                    partners[opening] = pt
+                    partners[pt] = opening
+                parents[pt] = stack[-1] if stack else None
+
+    def partner(self, pt):
+        """Returns the position of the bracket matching the one at `pt`, or `None`.
+        """
+        return self.partners.get(pt)
+
+    def first(self, start, end):
+        """Returns the position of the first bracket between `start` and `end` that isn't
+           skipped, or `None`.
+        """
+        found = None
+        for positions in self.positions.values():
+            i = bisect_left(positions, start)
+            if i < len(positions) and positions[i] < end:
+                if found is None or positions[i] < found:
+                    found = positions[i]
+        return found
+
+    def enclosing(self, pt, opening):
+        """Returns the positions of the innermost pair of `opening` brackets around `pt` as a
+           tuple, or `None`. Brackets at `pt` count as being around it.
+        """
+        positions = self.positions[opening]
+        i = bisect_right(positions, pt) - 1
+        if i < 0:
+            return
+
+        found = positions[i]
+        other = self.partners.get(found)
+        if other is not None and (other > found or found == pt):
+            return (min(found, other), max(found, other))
+
+        parent = self.parents[found]
+        # Opening brackets without a match can't enclose anything.
+        while parent is not None and parent not in self.partners:
+            parent = self.parents[parent]
+        if parent is None:
+            return
+        return (parent, self.partners[parent])
+
+
+def get_bracket_index(view):
+    """Returns the bracket index for `view`, rebuilding it if the buffer or the relevant settings
+       have changed.
+    """
+    skip = view.settings().get('vintageous_ignore_brackets_in_strings') == True
+    index = _BRACKET_INDEXES.get(view.id())
+    if index is None or index.change_count != view.change_count() or index.skip != skip:
+        index = _BRACKET_INDEXES[view.id()] = BracketIndex(view, skip)
+    return index
+
+
+def drop_bracket_index(view):
+    _BRACKET_INDEXES.pop(view.id(), None)
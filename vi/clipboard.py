@@ -0,0 +1,71 @@
+"""Deferred access to the system clipboard.
+
+   Writes are debounced: only the last text set within DELAY milliseconds is pushed to the
+   clipboard, so bursts of yanks or deletes (like a macro running dd many times) don't wait on the
+   OS. Reads are served from the last known contents until Sublime Text loses the focus, which is
+   when other applications may change the clipboard, or until a command from outside Vintageous
+   runs. Pending writes are pushed before such commands run, so that their own writes win.
+"""
+
+import sublime
+
+
+# Milliseconds to wait for more writes before pushing the latest text to the clipboard.
+DELAY = 100
+
+# Text waiting to be pushed to the clipboard, or None.
+_pending = None
+# Increased with every write so that only the latest scheduled push goes ahead.
+_generation = 0
+# Last known clipboard contents, or None if they have to be read again.
+_contents = None
+
+
+def set_clipboard(text):
+    """Sets the clipboard contents to `text` after a short delay.
+    """
+    global _pending, _generation, _contents
+    _generation += 1
+    _pending = _contents = text
+    generation = _generation
+    sublime.set_timeout(lambda: _push(generation), DELAY)
+
+
+def _push(generation):
+    if generation == _generation:
+        flush()
+
+
+def get_clipboard():
+    """Returns the clipboard contents, including any text still waiting to be pushed.
+    """
+    global _contents
+    if _contents is None:
+        _contents = sublime.get_clipboard()
+    return _contents
+
+
+def flush():
+    """Pushes any pending text to the clipboard right away.
+    """
+    global _pending
+    if _pending is not None:
+        text, _pending = _pending, None
+        sublime.set_clipboard(text)
+
+
+def invalidate():
+    """Pushes any pending text and forgets the clipboard contents. Call it when other applications
+       may change the clipboard.
+    """
+    global _contents
+    flush()
+    _contents = None
+
+
+def reset():
+    """Drops any pending text and forgets the clipboard contents.
+    """
+    global _pending, _generation, _contents
+    _generation += 1
+    _pending = _contents = None
@@ -1,119 +1,188 @@
 from Vintageous.vi.constants import MODE_NORMAL
 
 
+# Shared, read-only defaults for every CmdData key. CmdData instances only store the keys whose
+# values differ from these, so don't ever mutate this table.
+CMD_DATA_DEFAULTS = {
+    'pre_motion': None,
+    'motion': {},
+    # Whether the user needs to provide a motion. If there was no user-provided motion, a
+    # motion specified by an action could still be run before the action.
+    'motion_required': True,
+    'action': {},
+    'post_action': None,
+    'count': 1,
+    # Helps to disambiguate between invocations that behave differently depending on whether
+    # the user provided a count or not (for example, %).
+    '_user_provided_count': None,
+    'pre_every_motion': None,
+    'post_every_motion': None,
+    # This is the only hook that takes a list of commands to execute.
+    # Specify commands as a list of [command, args] elements (but don't use tuples).
+    'post_motion': [],
+    # Set to True if the command must populate the registers. This will cause
+    # Vintageous to propagate copied text to the unnamed register as needed.
+    'can_yank': False,
+    # Set to True if the command only copies text, like y. Other commands that populate the
+    # registers are deletes, which Vintageous remembers in the numbered registers.
+    'is_yank': False,
+    # Some commands operate CHARACTERWISE but always yank LINEWISE, so we need this.
+    'yanks_linewise': False,
+    # We set this to the user-supplied information.
+    'register': None,
+    'mode': MODE_NORMAL,
+    'reposition_caret': None,
+    'follow_up_mode': None,
+    # Some digraphs can be computed on their own, like cc and dd, but others require an
+    # explicit "wait for next command name" status, like gU, gu, etc. This property helps
+    # with that.
+    'is_digraph_start': False,
+    # User input, such as arguments to the t and f commands.
+    # TODO: Try to unify user-input collection (both for registers and this kind of
+    # argument).
+    'user_input': '',
+    'user_motion_input': None,
+    'user_action_input': None,
+    # TODO: Interim solution to avoid problems with this step. Many commands don't need
+    # this and it's causing quite some trouble. Let commands specify an explicit command
+    # to reorient the caret as occurs with other hooks.
+    '__reorient_caret': False,
+    # Indicates if the motion is to be considered a jump.
+    'is_jump': False,
+    # Indicates whether the motion creates a jump entry at the current position.
+    'creates_jump_at_current_position': False,
+    # Some actions must be cancelled if the selections didn't change after the motion.
+    # Others, on the contrary, must always go ahead.
+    'cancel_action_if_motion_fails': False,
+    # Some commands that don't take motions need to be repeated, but currently ViRun only
+    # repeats the motion, so tell global state to repeat the action. An example would be
+    # the J command.
+    '_repeat_action': False,
+    # Search string used last to find text in the buffer (like the / command).
+    'last_buffer_search': None,
+    # Search character used last to find text in the line (like the f command).
+    'last_character_search': None,
+    # Search direction used last to find a character in the line (like the f command).
+    'last_character_search_forward': None,
+    # Whether we want to save the original selections to restore them after the command.
+    'restore_original_carets': False,
+    # We keep track of the caret's x position so vertical motions like j, k can restore it
+    # as needed. This item must not ever be reset. All horizontal motions must update it.
+    # Vertical motions must adjust the selections .b end to factor in this data.
+    'xpos': None,
+    # Indicates whether xpos needs to be updated. Only vertical motions j and k need not
+    # update xpos.
+    'must_update_xpos': True,
+    # Whether we should make sure to show the first selection.
+    'scroll_into_view': True,
+    # TODO: This one should be used instead of the above AND this one. Set this to a command
+    # that will decide whether to scroll or not. Format: ['cmd_name', {"arg1": 100}]
+    'scroll_command': None,
+    # If not None, the corresponding mode will be entered before runnig ViRun.
+    # It's basically used as a way to change to NORMALMODE and be able to capture further
+    # key strokes for INSERTMODE chords. Use sparingly.
+    # Used, for example, by CTRL+R,= in INSERTMODE.
+    '_change_mode_to': None,
+    # If not None, the corresponding mode will be entered during the full run of a command, in
+    # some cases. Used to determine which mode to transition to after a failed composite command.
+    # Note: This is mainly useful to exit from bad corrupted states; successful commands should
+    # instead specify their 'follow_up_mode' hook.
+    # For example, in INSERTMODE, Ctrl+r,j would cause VintageState to use this.
+    '_exit_mode': None,
+    '_exit_mode_command': None,
+    'must_blink_on_error': False,
+    # Mode to transition to on success.
+    'next_mode': MODE_NORMAL,
+    # Command to modify the selection after the motion+command have run, and before
+    # follow_up_mode is run.
+    'selection_modifier': None,
+    # Related to selection_modifier. After modiying the selections, the new selections might
+    # still be aligned with xpos. This is the case with 3yk, for instance, where the linewise
+    # motion will leave .b at BOL, while Vim keeps the starting xpos. In this case, we need
+    # to request xpos to be readjusted.
+    'align_with_xpos': False,
+    # Overrides the last iteration of a motion. Helps avoid swallowing the new line character
+    # in commands like dw. The difference between this hook and 'post_every_motion' (which
+    # knows about the last iteration) is that 'last_motion' is able to override the current
+    # motion command.
+    'last_motion': None,
+    # Needed, for example, by yy at EOF to ensure that we add a new line character to the
+    # last line when copied.
+    'synthetize_new_line_at_eof': False,
+    # Some commands, like yy, should not mark groups for gluing to avoid polluting the redo
+    # stack. (XXX This is mainly due to an [unconfirmed] issue with
+    # 'maybe_mark_undo_groups_for_gluing'.)
+    '_mark_groups_for_gluing': True,
+    'populates_small_delete_register': False,
+    # Commands like the non-standard gk and gl use window commands.
+    'is_window_command': False,
+    # Instructs Vintageous to briefly hihglight the region an action will operate on.
+    'has_training_wheels': False,
+}
+
+# Keys whose defaults are containers that hooks fill in place. They're copied on first access.
+_MUTABLE_DEFAULTS = frozenset(k for (k, v) in CMD_DATA_DEFAULTS.items()
+                              if isinstance(v, (dict, list)))
+
+_MISSING = object()
+
+
 class CmdData(dict):
     # CmdData is a key data structure that drives the action/motion execution.
     # Keys and values must be valid JSON data types, because the whole data structure ends up
     # being an argument to a Sublime Text command.
-    def __init__(self, state):
-        self['pre_motion'] = None
-        self['motion'] = {}
-        # Whether the user needs to provide a motion. If there was no user-provided motion, a
-        # motion specified by an action could still be run before the action.
-        self['motion_required'] = True
-        self['action'] = {}
-        self['post_action'] = None
+    #
+    # Only values that differ from CMD_DATA_DEFAULTS are stored; the rest are looked up in the
+    # shared table when read. Use .serialize() to obtain the arguments for 'vi_run', and
+    # .from_args() to rebuild the full data from them.
+    __slots__ = ()
+
+    def __init__(self, state=None):
+        if state is None:
+            return
+
+        vi_settings = state.settings.vi
         self['count'] = state.count
-        # Helps to disambiguate between invocations that behave differently depending on whether
-        # the user provided a count or not (for example, %).
         self['_user_provided_count'] = state.user_provided_count
-        self['pre_every_motion'] = None
-        self['post_every_motion'] = None
-        # This is the only hook that takes a list of commands to execute.
-        # Specify commands as a list of [command, args] elements (but don't use tuples).
-        self['post_motion'] = []
-        # Set to True if the command must populate the registers. This will cause
-        # Vintageous to propagate copied text to the unnamed register as needed.
-        self['can_yank'] = False
-        # Some commands operate CHARACTERWISE but always yank LINEWISE, so we need this.
-        self['yanks_linewise'] = False
-        # We set this to the user-supplied information.
         self['register'] = state.register
         self['mode'] = state.mode
-        self['reposition_caret'] = None
-        self['follow_up_mode'] = None
-        # Some digraphs can be computed on their own, like cc and dd, but others require an
-        # explicit "wait for next command name" status, like gU, gu, etc. This property helps
-        # with that.
-        self['is_digraph_start'] = False
-        # User input, such as arguments to the t and f commands.
-        # TODO: Try to unify user-input collection (both for registers and this kind of
-        # argument).
         self['user_input'] = state.user_input
-        self['user_motion_input'] = state.settings.vi['user_motion_input']
-        self['user_action_input'] = state.settings.vi['user_action_input']
-        # TODO: Interim solution to avoid problems with this step. Many commands don't need
-        # this and it's causing quite some trouble. Let commands specify an explicit command
-        # to reorient the caret as occurs with other hooks.
-        self['__reorient_caret'] = False
-        # Indicates if the motion is to be considered a jump.
-        self['is_jump'] = False
-        # Indicates whether the motion creates a jump entry at the current position.
-        self['creates_jump_at_current_position'] = False
-        # Some actions must be cancelled if the selections didn't change after the motion.
-        # Others, on the contrary, must always go ahead.
-        self['cancel_action_if_motion_fails'] = False
-        # Some commands that don't take motions need to be repeated, but currently ViRun only
-        # repeats the motion, so tell global state to repeat the action. An example would be
-        # the J command.
-        self['_repeat_action'] = False
-        # Search string used last to find text in the buffer (like the / command).
+        self['user_motion_input'] = vi_settings['user_motion_input']
+        self['user_action_input'] = vi_settings['user_action_input']
         self['last_buffer_search'] = state.last_buffer_search
-        # Search character used last to find text in the line (like the f command).
         self['last_character_search'] = state.last_character_search
-        # Search direction used last to find a character in the line (like the f command).
         self['last_character_search_forward'] = state.last_character_search_forward
-        # Whether we want to save the original selections to restore them after the command.
-        self['restore_original_carets'] = False
-        # We keep track of the caret's x position so vertical motions like j, k can restore it
-        # as needed. This item must not ever be reset. All horizontal motions must update it.
-        # Vertical motions must adjust the selections .b end to factor in this data.
         self['xpos'] = state.xpos
-        # Indicates whether xpos needs to be updated. Only vertical motions j and k need not
-        # update xpos.
-        self['must_update_xpos'] = True
-        # Whether we should make sure to show the first selection.
-        self['scroll_into_view'] = True
-        # TODO: This one should be used instead of the above AND this one. Set this to a command
-        # that will decide whether to scroll or not. Format: ['cmd_name', {"arg1": 100}]
-        self['scroll_command'] = None
-        # If not None, the corresponding mode will be entered before runnig ViRun.
-        # It's basically used as a way to change to NORMALMODE and be able to capture further
-        # key strokes for INSERTMODE chords. Use sparingly.
-        # Used, for example, by CTRL+R,= in INSERTMODE.
-        self['_change_mode_to'] = None
-        # If not None, the corresponding mode will be entered during the full run of a command, in
-        # some cases. Used to determine which mode to transition to after a failed composite command.
-        # Note: This is mainly useful to exit from bad corrupted states; successful commands should
-        # instead specify their 'follow_up_mode' hook.
-        # For example, in INSERTMODE, Ctrl+r,j would cause VintageState to use this.
-        self['_exit_mode'] = None
-        self['_exit_mode_command'] = None
-        self['must_blink_on_error'] = False
-        # Mode to transition to on success.
-        self['next_mode'] = MODE_NORMAL
-        # Command to modify the selection after the motion+command have run, and before
-        # follow_up_mode is run.
-        self['selection_modifier'] = None
-        # Related to selection_modifier. After modiying the selections, the new selections might
-        # still be aligned with xpos. This is the case with 3yk, for instance, where the linewise
-        # motion will leave .b at BOL, while Vim keeps the starting xpos. In this case, we need
-        # to request xpos to be readjusted.
-        self['align_with_xpos'] = False
-        # Overrides the last iteration of a motion. Helps avoid swallowing the new line character
-        # in commands like dw. The difference between this hook and 'post_every_motion' (which
-        # knows about the last iteration) is that 'last_motion' is able to override the current
-        # motion command.
-        self['last_motion'] = None
-        # Needed, for example, by yy at EOF to ensure that we add a new line character to the
-        # last line when copied.
-        self['synthetize_new_line_at_eof'] = False
-        # Some commands, like yy, should not mark groups for gluing to avoid polluting the redo
-        # stack. (XXX This is mainly due to an [unconfirmed] issue with
-        # 'maybe_mark_undo_groups_for_gluing'.)
-        self['_mark_groups_for_gluing'] = True
-        self['populates_small_delete_register'] = False
-        # Commands like the non-standard gk and gl use window commands.
-        self['is_window_command'] = False
-        # Instructs Vintageous to briefly hihglight the region an action will operate on.
-        self['has_training_wheels'] = False
+
+    @classmethod
+    def from_args(cls, args):
+        """Rebuilds CmdData from the arguments produced by .serialize().
+        """
+        cmd_data = cls()
+        cmd_data.update(args)
+        return cmd_data
+
+    def __missing__(self, key):
+        default = CMD_DATA_DEFAULTS[key]
+        if key in _MUTABLE_DEFAULTS:
+            # Copy on first access, since callers modify these in place.
+            default = self[key] = type(default)()
+        return default
+
+    def __contains__(self, key):
+        return key in CMD_DATA_DEFAULTS or dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def serialize(self):
+        """Returns the smallest dict from which .from_args() can rebuild this data.
+        """
+        args = {}
+        for k, v in self.items():
+            default = CMD_DATA_DEFAULTS.get(k, _MISSING)
+            if v != default or type(v) is not type(default):
+                args[k] = v
+        return args
@@ -0,0 +1,72 @@
+"""Lookup of Vintageous text commands that ViRunCommand can call directly with its own edit
+object instead of going through View.run_command(), and of the commands Vintageous defines.
+"""
+
+import sublime_plugin
+
+
+# Maps command names to TextCommand subclasses. Built on first use.
+_DIRECT_COMMANDS = None
+# Names of all commands defined in this package. Built on first use.
+_OWN_COMMANDS = None
+
+
+def command_name(cls):
+    """Returns the name Sublime Text derives for the command class `cls`.
+    """
+    clsname = cls.__name__
+    name = clsname[0].lower()
+    last_upper = False
+    for c in clsname[1:]:
+        if c.isupper() and not last_upper:
+            name += '_'
+            name += c.lower()
+        else:
+            name += c
+        last_upper = c.isupper()
+    if name.endswith('_command'):
+        name = name[:-8]
+    return name
+
+
+def can_call_directly(cls):
+    """Only plain text commands defined in this package can be called directly. Commands that
+       customize .run_() (like IrreversibleTextCommand) or .is_enabled() rely on Sublime Text's
+       dispatching.
+    """
+    return (cls.__module__.startswith('Vintageous.') and
+            cls.run_ is sublime_plugin.TextCommand.run_ and
+            cls.is_enabled is sublime_plugin.TextCommand.is_enabled)
+
+
+def find_direct_command(name):
+    """Returns the command class for `name` if it can be called directly, or `None`.
+    """
+    global _DIRECT_COMMANDS
+    if _DIRECT_COMMANDS is None:
+        _DIRECT_COMMANDS = dict((command_name(cls), cls)
+                                for cls in sublime_plugin.text_command_classes
+                                if can_call_directly(cls))
+    return _DIRECT_COMMANDS.get(name)
+
+
+def is_own_command(name):
+    """Returns whether `name` is a command defined in this package.
+    """
+    global _OWN_COMMANDS
+    if _OWN_COMMANDS is None:
+        _OWN_COMMANDS = frozenset(command_name(cls)
+                                  for classes in (sublime_plugin.application_command_classes,
+                                                  sublime_plugin.window_command_classes,
+                                                  sublime_plugin.text_command_classes)
+                                  for cls in classes
+                                  if cls.__module__.startswith('Vintageous.'))
+    return name in _OWN_COMMANDS
+
+
+def drop_direct_commands():
+    """Forgets known command classes. Must be called whenever plugins are (re)loaded.
+    """
+    global _DIRECT_COMMANDS, _OWN_COMMANDS
+    _DIRECT_COMMANDS = None
+    _OWN_COMMANDS = None
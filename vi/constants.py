@@ -169,6 +169,32 @@ def mode_to_str(mode):
     return "<unknown>"
 
 
+def replace_sels(view, regions):
+    """
+    Replaces the selections in ``view`` with ``regions`` in a single call.
+    """
+    view.sel().clear()
+    view.sel().add_all(regions)
+
+
+def _holds_regions(view, regions):
+    # Compare against the live selections: ``f`` may edit the buffer, which
+    # moves the selections, and then return the regions it was given.
+    current = sorted((r.a, r.b) for r in view.sel())
+    return current == sorted((r.a, r.b) for r in regions)
+
+
+def _transform_regions(view, f, sels):
+    # Shared engine for the transformers below. The selections are only
+    # rewritten if they don't hold the new regions already.
+    new_sels = [None] * len(sels)
+    for i, s in enumerate(sels):
+        new_sels[i] = f(view, s)
+
+    if not _holds_regions(view, new_sels):
+        replace_sels(view, new_sels)
+
+
 # TODO: Move this to somewhere where it's easy to import from and use it for
 # transformers.
 def regions_transformer(view, f):
@@ -176,27 +202,25 @@ def regions_transformer(view, f):
     Applies ``f`` to every selection region in ``view`` and replaces the
     existing selections.
     """
-    sels = list(view.sel())
-
-    new_sels = []
-    for s in sels:
-        new_sels.append(f(view, s))
+    _transform_regions(view, f, list(view.sel()))
 
-    view.sel().clear()
-    for s in new_sels:
-        view.sel().add(s)
 
 def regions_transformer_reversed(view, f):
     """
-    Applies ``f`` to every selection region in ``view`` and replaces the
-    existing selections.
+    Applies ``f`` to every selection region in ``view``, last to first, and
+    replaces the existing selections.
     """
-    sels = reversed(list(view.sel()))
+    sels = list(view.sel())
+    sels.reverse()
+    _transform_regions(view, f, sels)
 
-    new_sels = []
-    for s in sels:
-        new_sels.append(f(view, s))
 
-    view.sel().clear()
-    for ns in new_sels:
-        view.sel().add(ns)
+def regions_transformer_batch(view, f):
+    """
+    Applies ``f`` to all selection regions in ``view`` at once and replaces the
+    existing selections. ``f`` receives the view and a list with all regions,
+    and returns a list with the new ones.
+    """
+    new_sels = f(view, list(view.sel()))
+    if not _holds_regions(view, new_sels):
+        replace_sels(view, new_sels)
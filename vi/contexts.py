@@ -1,10 +1,70 @@
 import sublime
 
+from collections import namedtuple
+
 from Vintageous.vi.constants import MODE_NORMAL, MODE_NORMAL_INSERT, MODE_INSERT, ACTIONS_EXITING_TO_INSERT_MODE, MODE_VISUAL_LINE, MODE_VISUAL, MODE_SELECT
 from Vintageous.vi.constants import MODE_VISUAL_BLOCK
 from Vintageous.vi import constants
 from Vintageous.vi import utils
 from Vintageous.vi.constants import action_to_namespace
+from Vintageous.vi.settings import vintage_settings_revision
+
+
+KEYMAP_RESOURCE = 'Packages/Vintageous/Default.sublime-keymap'
+
+# Context keys that only depend on the current mode, mapped to the modes they match. Checking any
+# of them, composite or not, comes down to a single bitwise AND against the current mode.
+MODE_CONTEXTS = {
+    'vi_mode_normal': MODE_NORMAL,
+    'vi_mode_normal_insert': MODE_NORMAL_INSERT,
+    'vi_mode_insert': MODE_INSERT,
+    'vi_mode_select': MODE_SELECT,
+    'vi_mode_visual': MODE_VISUAL,
+    'vi_mode_visual_line': MODE_VISUAL_LINE,
+    'vi_mode_visual_block': MODE_VISUAL_BLOCK,
+    'vi_mode_visual_any': MODE_VISUAL | MODE_VISUAL_LINE | MODE_VISUAL_BLOCK,
+    'vi_mode_normal_or_visual': MODE_NORMAL | MODE_VISUAL | MODE_VISUAL_BLOCK,
+    'vi_mode_normal_or_any_visual': (MODE_NORMAL | MODE_VISUAL | MODE_VISUAL_LINE |
+                                     MODE_VISUAL_BLOCK),
+}
+
+OPERATORS = {
+    'equal': sublime.OP_EQUAL,
+    'not_equal': sublime.OP_NOT_EQUAL,
+}
+
+
+# The parts of VintageState that key contexts look at.
+ContextSnapshot = namedtuple('ContextSnapshot', 'revision mode action motion motion_digits '
+                                                'action_digits register expecting_user_input '
+                                                'expecting_register')
+
+# Sublime Text queries every candidate key binding on each key press, so we capture the state
+# once per view and keep answering from that snapshot until the state changes again.
+_SNAPSHOTS = {}
+
+
+def get_snapshot(state):
+    revision = vintage_settings_revision(state.view)
+    snapshot = _SNAPSHOTS.get(state.view.id())
+    if snapshot and snapshot.revision == revision:
+        return snapshot
+
+    snapshot = ContextSnapshot(revision=revision,
+                               mode=state.mode,
+                               action=state.action,
+                               motion=state.motion,
+                               motion_digits=tuple(state.motion_digits),
+                               action_digits=tuple(state.action_digits),
+                               register=state.register,
+                               expecting_user_input=state.expecting_user_input,
+                               expecting_register=state.expecting_register)
+    _SNAPSHOTS[state.view.id()] = snapshot
+    return snapshot
+
+
+def drop_snapshot(view):
+    _SNAPSHOTS.pop(view.id(), None)
 
 
 class KeyContext(object):
@@ -14,7 +74,7 @@ class KeyContext(object):
 
     def vi_must_change_mode(self, key, operator, operand, match_all):
         is_normal_mode = self.state.settings.view['command_mode']
-        is_exit_mode_insert = (self.state.action in ACTIONS_EXITING_TO_INSERT_MODE)
+        is_exit_mode_insert = (self.snapshot.action in ACTIONS_EXITING_TO_INSERT_MODE)
         if (is_normal_mode and is_exit_mode_insert):
             return self._check(True, operator, operand, match_all)
 
@@ -27,19 +87,20 @@ class KeyContext(object):
             return False
 
         # If we have primed counts, we have to clear the state.
-        if self.state.user_provided_count or self.state.motion or self.state.action:
+        has_count = self.snapshot.motion_digits or self.snapshot.action_digits
+        if has_count or self.snapshot.motion or self.snapshot.action:
             return True
 
         # TODO: Simplify comparisons.
-        if self.state.mode == MODE_NORMAL_INSERT:
+        if self.snapshot.mode == MODE_NORMAL_INSERT:
             return True
 
-        if self.state.mode == MODE_INSERT:
+        if self.snapshot.mode == MODE_INSERT:
             return True
 
         # check if we are NOT in normal mode -- if NOT, we need to change modes
         # This covers, for example, SELECT_MODE.
-        if self.state.mode != MODE_NORMAL:
+        if self.snapshot.mode != MODE_NORMAL:
             return True
 
         # Clear non-empty selections if there any.
@@ -63,7 +124,7 @@ class KeyContext(object):
     def vi_must_exit_to_insert_mode(self, key, operator, operand, match_all):
         # XXX: This conext most likely not needed any more.
         is_normal_mode = self.state.settings.view['command_mode']
-        is_exit_mode_insert = (self.state.action in ACTIONS_EXITING_TO_INSERT_MODE)
+        is_exit_mode_insert = (self.snapshot.action in ACTIONS_EXITING_TO_INSERT_MODE)
         value = (is_normal_mode and is_exit_mode_insert)
         return self._check(value, operator, operand, match_all)
 
@@ -80,89 +141,76 @@ class KeyContext(object):
         return self._check(value, operator, operand, match_all)
 
     def vi_has_incomplete_action(self, key, operator, operand, match_all):
-        value = any(x for x in (self.state.action, self.state.motion) if
+        value = any(x for x in (self.snapshot.action, self.snapshot.motion) if
                           x in constants.INCOMPLETE_ACTIONS)
         return self._check(value, operator, operand, match_all)
 
     def vi_has_action(self, key, operator, operand, match_all):
-        value = self.state.action
+        value = self.snapshot.action
         value = value and (value not in constants.INCOMPLETE_ACTIONS)
         return self._check(value, operator, operand, match_all)
 
     def vi_has_motion_count(self, key, operator, operand, match_all):
-        value = self.state.motion_digits
+        value = self.snapshot.motion_digits
         return self._check(value, operator, operand, match_all)
 
     def vi_mode_normal_insert(self, key, operator, operand, match_all):
-        value = self.state.mode == MODE_NORMAL_INSERT
-        return self._check(value, operator, operand, match_all)
+        return self._check_mode(key, operator, operand, match_all)
 
     def vi_mode_visual_block(self, key, operator, operand, match_all):
-        value = self.state.mode == MODE_VISUAL_BLOCK
-        return self._check(value, operator, operand, match_all)
+        return self._check_mode(key, operator, operand, match_all)
 
     def vi_mode_cannot_push_zero(self, key, operator, operand, match_all):
         value = False
         if operator == sublime.OP_EQUAL:
-            value = not (self.state.motion_digits or
-                             self.state.action_digits)
+            value = not (self.snapshot.motion_digits or
+                             self.snapshot.action_digits)
 
         return self._check(value, operator, operand, match_all)
 
     def vi_mode_visual_any(self, key, operator, operand, match_all):
-        value = self.state.mode in (MODE_VISUAL_LINE, MODE_VISUAL, MODE_VISUAL_BLOCK)
-        return self._check(value, operator, operand, match_all)
+        return self._check_mode(key, operator, operand, match_all)
 
     def vi_mode_select(self, key, operator, operand, match_all):
-        value = self.state.mode == MODE_SELECT
-        return self._check(value, operator, operand, match_all)
+        return self._check_mode(key, operator, operand, match_all)
 
     def vi_mode_visual_line(self, key, operator, operand, match_all):
-        value = self.state.mode == MODE_VISUAL_LINE
-        return self._check(value, operator, operand, match_all)
+        return self._check_mode(key, operator, operand, match_all)
 
     def vi_mode_insert(self, key, operator, operand, match_all):
-        value = self.state.mode == MODE_INSERT
-        return self._check(value, operator, operand, match_all)
+        return self._check_mode(key, operator, operand, match_all)
 
     def vi_mode_visual(self, key, operator, operand, match_all):
-        value = self.state.mode == MODE_VISUAL
-        return self._check(value, operator, operand, match_all)
+        return self._check_mode(key, operator, operand, match_all)
 
     def vi_mode_normal(self, key, operator, operand, match_all):
-        value = self.state.mode == MODE_NORMAL
-        return self._check(value, operator, operand, match_all)
+        return self._check_mode(key, operator, operand, match_all)
 
     def vi_mode_normal_or_visual(self, key, operator, operand, match_all):
         # XXX: This context is used to disable some keys for VISUALLINE.
         # However, this is hiding some problems in visual transformers that might not be dealing
         # correctly with VISUALLINE.
-        normal = self.vi_mode_normal(key, operator, operand, match_all)
-        visual = self.vi_mode_visual(key, operator, operand, match_all)
-        visual = visual or self.vi_mode_visual_block(key, operator, operand, match_all)
-        return self._check((normal or visual), operator, operand, match_all)
+        return self._check_mode(key, operator, operand, match_all)
 
     def vi_mode_normal_or_any_visual(self, key, operator, operand, match_all):
-        normal_or_visual = self.vi_mode_normal_or_visual(key, operator, operand, match_all)
-        visual_line = self.vi_mode_visual_line(key, operator, operand, match_all)
-        return self._check((normal_or_visual or visual_line), operator, operand, match_all)
+        return self._check_mode(key, operator, operand, match_all)
 
     def vi_state_next_character_is_user_input(self, key, operator, operand, match_all):
-        value = (self.state.expecting_user_input or
-                 self.state.expecting_register)
+        value = (self.snapshot.expecting_user_input or
+                 self.snapshot.expecting_register)
         return self._check(value, operator, operand, match_all)
 
     def vi_state_expecting_user_input(self, key, operator, operand, match_all):
-        value = self.state.expecting_user_input
+        value = self.snapshot.expecting_user_input
         return self._check(value, operator, operand, match_all)
 
     def vi_state_expecting_register(self, key, operator, operand, match_all):
-        value = self.state.expecting_register
+        value = self.snapshot.expecting_register
         return self._check(value, operator, operand, match_all)
 
     def vi_mode_can_push_digit(self, key, operator, operand, match_all):
-        motion_digits = not self.state.motion
-        action_digits = self.state.motion
+        motion_digits = not self.snapshot.motion
+        action_digits = self.snapshot.motion
         value = motion_digits or action_digits
         return self._check(value, operator, operand, match_all)
 
@@ -175,7 +223,7 @@ class KeyContext(object):
         if not has_incomplete_action:
             return False
 
-        value = action_to_namespace(self.state.action) or action_to_namespace(self.state.motion)
+        value = action_to_namespace(self.snapshot.action) or action_to_namespace(self.snapshot.motion)
         if not value:
             return False
         value = value == operand
@@ -198,12 +246,21 @@ class KeyContext(object):
         return self._check(rv, operator, operand, match_all)
 
     def check(self, key, operator, operand, match_all):
-        func = getattr(self, key, None)
+        self.snapshot = get_snapshot(self.state)
+        try:
+            func = _DISPATCH[key]
+        except KeyError:
+            func = _DISPATCH[key] = compile_context(key)
+
         if func:
-            return func(key, operator, operand, match_all)
+            return func(self, operator, operand, match_all)
         else:
             return None
 
+    def _check_mode(self, key, operator, operand, match_all):
+        value = bool((self.snapshot.mode or 0) & MODE_CONTEXTS[key])
+        return self._check(value, operator, operand, match_all)
+
     def _check(self, value, operator, operand, match_all):
         if operator == sublime.OP_EQUAL:
             if operand == True:
@@ -215,3 +272,62 @@ class KeyContext(object):
                 return not value
             elif operand == False:
                 return value
+
+
+# Context key => function(key_context, operator, operand, match_all).
+_DISPATCH = {}
+
+
+def compile_context(key):
+    """Returns a function that evaluates the context `key` against a KeyContext, or `None` if
+       `key` isn't a Vintageous context.
+    """
+    if key in MODE_CONTEXTS:
+        mask = MODE_CONTEXTS[key]
+
+        def check_mode(context, operator, operand, match_all):
+            value = bool((context.snapshot.mode or 0) & mask)
+            return context._check(value, operator, operand, match_all)
+
+        return check_mode
+
+    method = getattr(KeyContext, key, None) if key.startswith('vi_') else None
+    if method is None:
+        return None
+
+    def check(context, operator, operand, match_all):
+        return method(context, key, operator, operand, match_all)
+
+    return check
+
+
+def compile_binding(contexts):
+    """Returns a predicate that evaluates all the Vintageous context keys in a key binding's
+       `contexts` list against a KeyContext. Other keys (like 'setting.command_mode') are left out;
+       Sublime Text evaluates those on its own.
+    """
+    checks = []
+    for item in contexts:
+        func = _DISPATCH.get(item['key']) or compile_context(item['key'])
+        if func is None:
+            continue
+        checks.append((func, OPERATORS[item.get('operator', 'equal')],
+                       item.get('operand', True), item.get('match_all', False)))
+
+    def predicate(context):
+        return all(func(context, operator, operand, match_all)
+                   for (func, operator, operand, match_all) in checks)
+
+    return predicate
+
+
+def load_keymap(resource=KEYMAP_RESOURCE):
+    """Reads the key map and precompiles every context key it uses. Returns the key bindings.
+    """
+    bindings = sublime.decode_value(sublime.load_resource(resource))
+    for binding in bindings:
+        for item in binding.get('context', []):
+            key = item['key']
+            if key not in _DISPATCH:
+                _DISPATCH[key] = compile_context(key)
+    return bindings
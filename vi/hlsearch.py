@@ -0,0 +1,131 @@
+"""Highlighting of buffer search matches ('hlsearch').
+
+   Matches around the visible region are highlighted right away. The rest of the buffer is
+   searched in chunks in the background, so large buffers don't block the UI. Matches are found
+   with View.find(), like /, ?, n and N, so that highlights always agree with them.
+"""
+
+import sublime
+
+
+REGIONS_KEY = 'vi_search'
+
+# Characters searched on either side of the visible region before highlighting.
+MARGIN = 4000
+# Characters searched per background step.
+CHUNK_SIZE = 256 * 1024
+
+# Maps view ids to the id of their current highlighting job.
+_JOBS = {}
+_last_job = 0
+
+
+def find_all_in_range(view, pattern, start, end, flags=0, first=None):
+    """Returns all matches of `pattern` beginning between `start` and `end`, and the first match
+       beginning at or after `end` if it was found on the way: an empty region at -1 if there is
+       none, or None if it's not known yet. Passing that match back as `first` for the range
+       beginning at `end` saves a search.
+    """
+    regs = []
+    pt = start
+    match = first
+    while pt < end:
+        if match is None:
+            match = view.find(pattern, pt, flags)
+        if match is None or match.a == -1:
+            return (regs, sublime.Region(-1, -1))
+        if match.a >= end:
+            return (regs, match)
+        regs.append(match)
+        # Don't get stuck on empty matches.
+        pt = match.b if not match.empty() else match.b + 1
+        match = None
+    return (regs, None)
+
+
+def _chunks(start, end):
+    return [(a, min(a + CHUNK_SIZE, end)) for a in range(start, end, CHUNK_SIZE)]
+
+
+def _new_job(view):
+    global _last_job
+    _last_job += 1
+    _JOBS[view.id()] = _last_job
+    return _last_job
+
+
+def _is_current(view, job, change_count):
+    return _JOBS.get(view.id()) == job and view.change_count() == change_count
+
+
+def _finish(view, job):
+    if _JOBS.get(view.id()) == job:
+        del _JOBS[view.id()]
+
+
+def cancel(view):
+    """Stops any pending background highlighting for `view`.
+    """
+    _JOBS.pop(view.id(), None)
+
+
+def clear(view):
+    cancel(view)
+    view.erase_regions(REGIONS_KEY)
+
+
+def _add_regions(view, regs):
+    view.add_regions(REGIONS_KEY, regs, 'comment', '', sublime.DRAW_NO_FILL)
+
+
+def highlight(view, pattern, flags=0):
+    """Highlights matches of `pattern` near the visible region now and schedules the rest of the
+       buffer. Calling this again for the same view cancels the previous job.
+    """
+    job = _new_job(view)
+    size = view.size()
+    visible = view.visible_region()
+    near = sublime.Region(max(0, visible.begin() - MARGIN), min(size, visible.end() + MARGIN))
+
+    regs, ahead = find_all_in_range(view, pattern, near.a, near.b, flags)
+    if regs:
+        _add_regions(view, regs)
+    else:
+        view.erase_regions(REGIONS_KEY)
+
+    # Below the visible region first, then wrap around.
+    pending = _chunks(near.b, size) + _chunks(0, near.a)
+    if not pending:
+        _finish(view, job)
+        return
+
+    change_count = view.change_count()
+    # Matches are only sent to the view once all chunks have been searched.
+    found = []
+    # The search that ends a chunk finds the first match of the next one, if they're contiguous.
+    last = {'end': near.b, 'ahead': ahead}
+
+    def step():
+        if not _is_current(view, job, change_count):
+            return
+
+        start, end = pending.pop(0)
+        first = last['ahead'] if start == last['end'] else None
+        if first is not None and first.a == -1:
+            # No more matches up to the end of the buffer; go on from the top.
+            pending[:] = [(a, b) for (a, b) in pending if a < start]
+            chunk, ahead = [], None
+        else:
+            chunk, ahead = find_all_in_range(view, pattern, start, end, flags, first)
+        found.extend(chunk)
+        last['end'], last['ahead'] = end, ahead
+
+        if pending:
+            sublime.set_timeout_async(step, 0)
+            return
+
+        _finish(view, job)
+        if found:
+            _add_regions(view, sorted(regs + found, key=lambda r: r.a))
+
+    sublime.set_timeout_async(step, 0)
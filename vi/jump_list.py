@@ -1,11 +1,26 @@
+from Vintageous.vi import session
+
+
 _jump_list = []
 _jump_list_index = -1
 _current_latest = 1
+# Whether the jumps saved in the previous session have been restored.
+_restored = False
+
+
+def _restore():
+    global _restored
+    if _restored or not session.enabled():
+        return
+    _restored = True
+    # Jumps made before restoring come first.
+    _jump_list.extend(session.get('jumps').get('list', [])[:100 - len(_jump_list)])
 
 
 class JumpList(object):
     def __init__(self, state):
         self.state = state
+        _restore()
 
     def add(self, data):
         # data: [filename, line, column, length]
@@ -15,6 +30,8 @@ class JumpList(object):
         if len(_jump_list) > 100:
             _jump_list.pop()
 
+        session.put('jumps', 'list', list(_jump_list))
+
     def reset(self):
         _jump_list_index = -1
         _jump_list = []
@@ -0,0 +1,84 @@
+"""Per-view index of line start offsets.
+
+   Converts between points and rows with a bisect over the line starts instead of calling into
+   the Sublime Text API each time. An index is valid while the view's change count stays the same.
+"""
+
+import sublime
+
+from bisect import bisect_right
+
+
+_LINE_INDEXES = {}
+
+
+class LineIndex(object):
+    """Sorted line start offsets for a buffer snapshot. Mirrors the parts of the View API that
+       deal with rows and lines.
+    """
+    __slots__ = ('change_count', 'size', 'starts')
+
+    def __init__(self, view):
+        self.change_count = view.change_count()
+        self.size = view.size()
+
+        text = view.substr(sublime.Region(0, self.size))
+        starts = [0]
+        find = text.find
+        pt = find('\n')
+        while pt != -1:
+            starts.append(pt + 1)
+            pt = find('\n', pt + 1)
+        self.starts = starts
+
+    @property
+    def last_row(self):
+        return len(self.starts) - 1
+
+    def row(self, pt):
+        pt = min(max(pt, 0), self.size)
+        return bisect_right(self.starts, pt) - 1
+
+    def rowcol(self, pt):
+        pt = min(max(pt, 0), self.size)
+        row = bisect_right(self.starts, pt) - 1
+        return (row, pt - self.starts[row])
+
+    def line_end(self, row):
+        """Returns the point at the end of `row`, excluding its new line character.
+        """
+        if row < self.last_row:
+            return self.starts[row + 1] - 1
+        return self.size
+
+    def text_point(self, row, col):
+        """Like View.text_point(). Rows past the last one map to the end of the buffer, and
+           columns beyond the end of the line are clamped to the end of the line.
+        """
+        row = max(int(row), 0)
+        if row > self.last_row:
+            return self.size
+        return min(self.starts[row] + col, self.line_end(row))
+
+    def line(self, pt):
+        row = self.row(pt)
+        return sublime.Region(self.starts[row], self.line_end(row))
+
+    def full_line(self, pt):
+        row = self.row(pt)
+        if row < self.last_row:
+            return sublime.Region(self.starts[row], self.starts[row + 1])
+        return sublime.Region(self.starts[row], self.size)
+
+
+def get_line_index(view):
+    """Returns the line index for `view`, rebuilding it if the buffer has changed.
+    """
+    index = _LINE_INDEXES.get(view.id())
+    if index is None or index.change_count != view.change_count():
+        index = _LINE_INDEXES[view.id()] = LineIndex(view)
+    return index
+
+
+def drop_line_index(view):
+    _LINE_INDEXES.pop(view.id(), None)
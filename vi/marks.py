@@ -1,5 +1,7 @@
 import sublime
 
+from Vintageous.vi import session
+
 # store: window, view, rowcol
 
 _MARKS = {}
@@ -14,6 +16,9 @@ class Marks(object):
         # TODO: Use id attribute; references might change.
         win, view, rowcol = view.window(), view, view.rowcol(view.sel()[0].b)
         _MARKS[name] = win, view, rowcol
+        # Only marks in files can be restored in later sessions.
+        fname = view.file_name()
+        session.put('marks', name, [fname, list(rowcol)] if fname else None)
 
     def get_as_encoded_address(self, name):
         if name == "'":
@@ -36,3 +41,9 @@ class Marks(object):
                 else:
                     return "<untitled {0}>:{1}".format(view.buffer_id(), rowcol_encoded)
 
+        # Marks set in a previous session.
+        saved = session.get('marks').get(name)
+        if saved:
+            fname, rowcol = saved
+            return "{0}:{1}".format(fname, ':'.join(str(i) for i in rowcol))
+
@@ -0,0 +1,86 @@
+"""Per-view index of search matches.
+
+   Answers n, N and counted searches with a bisect over the matches found by a single scan of
+   the buffer. An index is rebuilt whenever the pattern, the flags or the buffer change.
+
+   The scan only finds matches that don't overlap. Searching forward from inside one of them can
+   find a match the scan skipped, so the buffer is searched from there instead.
+"""
+
+from bisect import bisect_left
+from bisect import bisect_right
+
+
+_MATCH_INDEXES = {}
+
+
+class MatchIndex(object):
+    """All matches of a pattern in a buffer snapshot, sorted by position.
+    """
+    __slots__ = ('view', 'key', 'regions', 'starts', 'ends')
+
+    def __init__(self, view, pattern, flags=0):
+        self.view = view
+        self.key = (pattern, flags, view.change_count())
+        self.regions = view.find_all(pattern, flags)
+        self.starts = [r.a for r in self.regions]
+        self.ends = [r.b for r in self.regions]
+
+    def next(self, pt, times=1):
+        """Returns the `times`th match beginning at or after `pt`, wrapping around the end of the
+           buffer, or `None`.
+        """
+        if not self.regions:
+            return
+        while True:
+            i = bisect_left(self.starts, pt)
+            if i == 0 or self.ends[i - 1] <= pt:
+                # Searching from `pt` finds the same matches as the scan from here on.
+                return self.regions[(i + times - 1) % len(self.regions)]
+
+            # `pt` is inside a match; the search from `pt` may find one overlapping it.
+            pattern, flags = self.key[:2]
+            match = self.view.find(pattern, pt, flags)
+            if match is None or match.a == -1:
+                # Wrap around to the first match.
+                return self.regions[(times - 1) % len(self.regions)]
+            if times == 1:
+                return match
+            times -= 1
+            pt = match.b
+
+    def previous(self, pt, times=1):
+        """Returns the `times`th match ending at or before `pt`, wrapping around the beginning of
+           the buffer, or `None`.
+        """
+        if not self.regions:
+            return
+        i = bisect_right(self.ends, pt) - times
+        return self.regions[i % len(self.regions)]
+
+
+def get_match_index(view, pattern, flags=0):
+    """Returns the match index for `pattern` in `view`. Only the latest index per view is kept,
+       and it's rebuilt whenever the buffer changes.
+    """
+    index = _MATCH_INDEXES.get(view.id())
+    if index is None or index.key != (pattern, flags, view.change_count()):
+        index = _MATCH_INDEXES[view.id()] = MatchIndex(view, pattern, flags)
+    return index
+
+
+def drop_match_index(view):
+    _MATCH_INDEXES.pop(view.id(), None)
+
+
+def find_next(view, term, start, flags=0, times=1):
+    """Like find_wrapping(), but looks up the match index instead of searching the buffer.
+    """
+    return get_match_index(view, term, flags).next(start, times)
+
+
+def find_previous(view, term, end, flags=0, times=1):
+    """Like reverse_find_wrapping(), but looks up the match index instead of searching the
+       buffer.
+    """
+    return get_match_index(view, term, flags).previous(end, times)
@@ -0,0 +1,143 @@
+"""Cache of search patterns.
+
+   Patterns are kept in a bounded LRU cache, keyed on the pattern, the flags, the engine that runs
+   them (Python's re module for :substitute and :global, Sublime Text's own engine for /, ?, *
+   and #) and whether they use Vim's syntax. Use cache_info() to see how well the cache is doing.
+
+   By default, patterns are passed to the engine as they are. With the vintageous_vim_regex
+   setting on, these parts of Vim's syntax are translated once, when a pattern is first cached:
+
+       \\< \\>         start and end of word (Python's engine only; Sublime Text's has them)
+       \\{-} \\{-n,m}   non-greedy repetition
+       \\=            zero or one
+       \\c \\C         ignore case, match case
+
+   Most of them mean something else to the engines, so the translation must be asked for.
+"""
+
+import re
+
+from functools import lru_cache
+
+import sublime
+
+
+ENGINE_PYTHON = 'python'
+ENGINE_SUBLIME = 'sublime'
+
+MAX_SIZE = 256
+
+# Characters with a special meaning in patterns.
+_SPECIAL_CHARS = frozenset('\\.^$*+?{}[]|()')
+
+
+def escape(text):
+    """Escapes the characters in `text` with a special meaning in patterns. Unlike re.escape(),
+       leaves alone characters that Vim's syntax would give a special meaning once escaped.
+    """
+    return ''.join(('\\' + c) if c in _SPECIAL_CHARS else c for c in text)
+
+
+def uses_vim_syntax(view):
+    """Returns whether search patterns in `view` are written in Vim's syntax.
+    """
+    return view.settings().get('vintageous_vim_regex') == True
+
+
+def translate(pattern, engine=ENGINE_PYTHON):
+    """Translates Vim-only syntax in `pattern` for `engine`. Returns the new pattern and whether
+       it asks to ignore case (True), to match case (False) or neither (None).
+    """
+    out = []
+    ignore_case = None
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if in_class:
+            if c == '\\':
+                out.append(pattern[i:i + 2])
+                i += 2
+                continue
+            if c == ']':
+                in_class = False
+            out.append(c)
+            i += 1
+            continue
+
+        if c == '[':
+            in_class = True
+            out.append(c)
+            i += 1
+            # A closing bracket right after the opening one (or after ^) is a literal.
+            if pattern.startswith('^', i):
+                out.append('^')
+                i += 1
+            if pattern.startswith(']', i):
+                out.append(']')
+                i += 1
+            continue
+
+        if c != '\\' or i + 1 == len(pattern):
+            out.append(c)
+            i += 1
+            continue
+
+        n = pattern[i + 1]
+        if n in '<>':
+            out.append(r'\b' if engine == ENGINE_PYTHON else pattern[i:i + 2])
+        elif n == '=':
+            out.append('?')
+        elif n == 'c':
+            ignore_case = True
+        elif n == 'C':
+            ignore_case = False
+        elif n == '{' and pattern.startswith('-', i + 2) and pattern.find('}', i + 3) != -1:
+            end = pattern.find('}', i + 3)
+            bounds = pattern[i + 3:end]
+            out.append('{' + bounds + '}?' if bounds else '*?')
+            i = end + 1
+            continue
+        else:
+            out.append(pattern[i:i + 2])
+        i += 2
+
+    return ''.join(out), ignore_case
+
+
+@lru_cache(maxsize=MAX_SIZE)
+def _get_pattern(pattern, flags, engine, vim_syntax):
+    if engine == ENGINE_SUBLIME:
+        if not vim_syntax or flags & sublime.LITERAL:
+            return (pattern, flags)
+        pattern, ignore_case = translate(pattern, engine)
+        if ignore_case is not None:
+            flags = (flags | sublime.IGNORECASE) if ignore_case else (flags & ~sublime.IGNORECASE)
+        return (pattern, flags)
+
+    if vim_syntax:
+        pattern, ignore_case = translate(pattern, engine)
+        if ignore_case is not None:
+            flags = (flags | re.IGNORECASE) if ignore_case else (flags & ~re.IGNORECASE)
+    return re.compile(pattern, flags)
+
+
+def get_pattern(pattern, flags=0, engine=ENGINE_PYTHON, vim_syntax=False):
+    """Returns `pattern` ready to be run by `engine`. For Python's engine, that's a compiled
+       regular expression; `flags` are the re module's flags. For Sublime Text's engine, that's the
+       pattern and the flags to pass to View.find() and friends as a tuple. If `vim_syntax` is
+       true, `pattern` is translated from Vim's syntax first.
+
+       Raises re.error if Python's engine can't compile the pattern.
+    """
+    return _get_pattern(pattern, flags, engine, vim_syntax)
+
+
+def cache_info():
+    """Returns the hits, misses, maximum size and current size of the pattern cache.
+    """
+    return _get_pattern.cache_info()
+
+
+def clear_cache():
+    _get_pattern.cache_clear()
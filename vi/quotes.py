@@ -0,0 +1,68 @@
+"""Quote pairs for the quote text objects.
+
+   Like Vim, quote text objects only look at the current line. Quote positions are computed once
+   per line and quote character and cached until the buffer changes.
+"""
+
+from bisect import bisect_left
+
+
+# Maps view ids to a (change_count, {(line_start, quote): positions}) tuple.
+_QUOTE_POSITIONS = {}
+
+
+def find_quotes(text, quote):
+    """Returns the offsets of all `quote` characters in `text` that aren't escaped with a
+       backslash.
+    """
+    # FIXME: Escape sequences like \" are probably syntax-dependant.
+    found = []
+    i = text.find(quote)
+    while i != -1:
+        backslashes = 0
+        while i - backslashes > 0 and text[i - backslashes - 1] == '\\':
+            backslashes += 1
+        if backslashes % 2 == 0:
+            found.append(i)
+        i = text.find(quote, i + 1)
+    return found
+
+
+def quotes_in_line(view, line, quote):
+    """Returns the points of all unescaped `quote` characters in `line`.
+    """
+    cached = _QUOTE_POSITIONS.get(view.id())
+    if cached is None or cached[0] != view.change_count():
+        cached = _QUOTE_POSITIONS[view.id()] = (view.change_count(), {})
+
+    key = (line.a, quote)
+    try:
+        return cached[1][key]
+    except KeyError:
+        positions = cached[1][key] = [line.a + i for i in find_quotes(view.substr(line), quote)]
+        return positions
+
+
+def find_quote_pair(view, pt, quote):
+    """Returns the points of the `quote` characters delimiting the quoted text at `pt` as a tuple,
+       or `None`. If `pt` isn't inside quotes, the next quoted text in the line is used.
+    """
+    positions = quotes_in_line(view, view.line(pt), quote)
+    i = bisect_left(positions, pt)
+
+    if i < len(positions) and positions[i] == pt:
+        # On a quote. Quotes pair up from the beginning of the line.
+        if i % 2 == 0 and i + 1 < len(positions):
+            return (positions[i], positions[i + 1])
+        if i > 0:
+            return (positions[i - 1], positions[i])
+        return
+
+    if 0 < i < len(positions):
+        return (positions[i - 1], positions[i])
+    if i == 0 and len(positions) > 1:
+        return (positions[0], positions[1])
+
+
+def drop_quote_positions(view):
+    _QUOTE_POSITIONS.pop(view.id(), None)
@@ -1,7 +1,11 @@
-import sublime
 import os
 
+import collections.abc
 import itertools
+import tempfile
+
+from Vintageous.vi import clipboard
+from Vintageous.vi import session
 
 
 REG_UNNAMED = '"'
@@ -24,10 +28,312 @@ REG_ALL = REG_SPECIAL + REG_VALID_NUMBERS + REG_VALID_NAMES
 # todo(guillermo): There are more.
 
 
+# Register values larger than this (in characters) are kept in a temporary file instead of in
+# memory, unless the 'vintageous_register_spill_threshold' setting says otherwise.
+DEFAULT_SPILL_THRESHOLD = 16 * 1024 * 1024
+# Characters encoded and written to disk at a time when spilling.
+_SPILL_CHUNK_SIZE = 1024 * 1024
+# Register values larger than this (in characters) aren't saved for later sessions.
+MAX_SAVED_SIZE = 64 * 1024
+
 # Registers must be available globally, so store here the data.
 _REGISTER_DATA = {}
 
 
+class Payload(object):
+    """
+    A piece of text held by one or more registers. Payloads are immutable, so
+    registers holding the same text share the same payload. Text larger than
+    ``spill_threshold`` is written to a temporary file and read back whenever
+    it's requested.
+    """
+    __slots__ = ('size', '_text', '_file')
+
+    def __init__(self, text, spill_threshold=None):
+        self.size = len(text)
+        self._text = text
+        self._file = None
+
+        if spill_threshold is not None and self.size > spill_threshold:
+            self._file = tempfile.TemporaryFile()
+            for i in range(0, self.size, _SPILL_CHUNK_SIZE):
+                self._file.write(text[i:i + _SPILL_CHUNK_SIZE].encode('utf-8'))
+            self._file.flush()
+            self._text = None
+
+    @property
+    def spilled(self):
+        return self._file is not None
+
+    @property
+    def text(self):
+        if self._file is None:
+            return self._text
+        self._file.seek(0)
+        return self._file.read().decode('utf-8')
+
+    def preview(self, length):
+        """
+        Returns up to the first ``length`` characters of the text without
+        reading back all of it.
+        """
+        if self._file is None:
+            return self._text[:length]
+        self._file.seek(0)
+        # UTF-8 takes up to 4 bytes per character.
+        return self._file.read(length * 4).decode('utf-8', 'ignore')[:length]
+
+
+class RegisterValue(collections.abc.Sequence):
+    """
+    The strings held by a register, one per selection. Behaves like a
+    read-only list of strings whose items are only loaded when accessed.
+    """
+    __slots__ = ('payloads', 'session_key')
+
+    def __init__(self, payloads):
+        self.payloads = tuple(payloads)
+        # Key of the value in the session file, if it's been saved.
+        self.session_key = None
+
+    @classmethod
+    def from_strings(cls, values, spill_threshold=None):
+        return cls(Payload(v, spill_threshold) for v in values)
+
+    @property
+    def size(self):
+        return sum(p.size for p in self.payloads)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [p.text for p in self.payloads[index]]
+        return self.payloads[index].text
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def __eq__(self, other):
+        if isinstance(other, RegisterValue) and other.payloads == self.payloads:
+            return True
+        if isinstance(other, (RegisterValue, list, tuple)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'RegisterValue({0!r})'.format(list(self))
+
+
+class NumberedRegisters(object):
+    """
+    The delete history held in registers 1-9. Slots are never moved around;
+    pushing a value just rotates the offset of register 1, so the value in
+    register 9 falls off the end.
+    """
+    SIZE = 9
+
+    __slots__ = ('_slots', '_offset')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._slots = [None] * self.SIZE
+        self._offset = 0
+
+    def restore(self, slots, offset):
+        assert len(slots) == self.SIZE
+        self._slots = list(slots)
+        self._offset = offset
+
+    @property
+    def offset(self):
+        return self._offset
+
+    def push(self, value):
+        self._offset = (self._offset - 1) % self.SIZE
+        self._slots[self._offset] = value
+
+    def slot(self, number):
+        """
+        Returns the index of the slot holding register `number`.
+        """
+        assert 1 <= number <= self.SIZE, "Numbered registers go from 1 to 9."
+        return (self._offset + number - 1) % self.SIZE
+
+    def __getitem__(self, number):
+        return self._slots[self.slot(number)]
+
+    def __setitem__(self, number, value):
+        self._slots[self.slot(number)] = value
+
+    def is_empty(self):
+        return self._slots.count(None) == self.SIZE
+
+    def values(self):
+        return [self[n] for n in range(1, self.SIZE + 1)]
+
+
+# Registers 1-9.
+_NUMBERED_REGISTERS = NumberedRegisters()
+
+# Whether registers saved in the previous session have been restored.
+_restored = False
+# Keys of the values in the session file. Registers refer to values by key, so that a value held
+# by several registers is only saved once.
+_saved_keys = set()
+# Last key given to a value.
+_last_key = 0
+
+
+def _restore():
+    """
+    Restores the registers saved in the previous session, unless they have
+    been set already. Only runs the first time registers are used while
+    sessions are enabled.
+    """
+    global _restored, _last_key
+    if _restored or not session.enabled():
+        return
+    _restored = True
+
+    saved = session.get('values')
+    _saved_keys.update(saved)
+    _last_key = max([_last_key] + [int(key) for key in saved if key.isdigit()])
+
+    restored = {}
+
+    def value_for(key):
+        if not isinstance(key, str) or key not in saved:
+            return None
+        if key not in restored:
+            value = RegisterValue.from_strings(saved[key])
+            value.session_key = key
+            restored[key] = value
+        return restored[key]
+
+    for (name, key) in session.get('registers').items():
+        value = value_for(key)
+        if value is not None:
+            _REGISTER_DATA.setdefault(name, value)
+
+    numbered = session.get('numbered')
+    if numbered and _NUMBERED_REGISTERS.is_empty():
+        slots = [value_for(numbered.get(str(i))) for i in range(NumberedRegisters.SIZE)]
+        _NUMBERED_REGISTERS.restore(slots, numbered.get('offset', 0))
+
+
+def _save_value(value):
+    """
+    Saves `value` unless it's been saved already, and returns its key. Returns
+    `None` for values too large to be saved.
+    """
+    global _last_key
+    if not isinstance(value, RegisterValue):
+        return None
+    if value.size > MAX_SAVED_SIZE or any(p.spilled for p in value.payloads):
+        return None
+
+    if value.session_key is None:
+        _last_key += 1
+        value.session_key = str(_last_key)
+    if value.session_key not in _saved_keys:
+        session.put('values', value.session_key, list(value))
+        _saved_keys.add(value.session_key)
+    return value.session_key
+
+
+def _drop_unused_values():
+    """
+    Removes the saved values that no register holds anymore.
+    """
+    live = set(value.session_key
+               for value in itertools.chain(_REGISTER_DATA.values(), _NUMBERED_REGISTERS.values())
+               if isinstance(value, RegisterValue))
+    for key in _saved_keys - live:
+        session.put('values', key, None)
+    _saved_keys.intersection_update(live)
+
+
+def _save(name, value):
+    """
+    Saves register `name` for later sessions.
+    """
+    if name == REG_EXPRESSION or not session.enabled():
+        return
+
+    if is_numbered_register(name):
+        session.put('numbered', str(_NUMBERED_REGISTERS.slot(int(name))), _save_value(value))
+    else:
+        session.put('registers', name, _save_value(value))
+    _drop_unused_values()
+
+
+def _push_numbered(value):
+    _NUMBERED_REGISTERS.push(value)
+    if session.enabled():
+        session.put('numbered', str(_NUMBERED_REGISTERS.offset), _save_value(value))
+        session.put('numbered', 'offset', _NUMBERED_REGISTERS.offset)
+        _drop_unused_values()
+
+
+def is_numbered_register(name):
+    """
+    Returns `True` if `name` is one of the 1-9 registers that hold the delete
+    history.
+    """
+    return name in REG_VALID_NUMBERS[1:]
+
+
+def next_numbered_register(name):
+    """
+    Returns the register after `name` in the delete history, which is what
+    repeating a put from a numbered register uses. Other names are returned
+    unchanged.
+    """
+    if is_numbered_register(name) and name != REG_VALID_NUMBERS[-1]:
+        return str(int(name) + 1)
+    return name
+
+
+def preview(value, length=80):
+    """
+    Returns up to the first `length` characters of the first string in a
+    register value.
+    """
+    if isinstance(value, RegisterValue):
+        return value.payloads[0].preview(length) if value.payloads else ''
+    return value[0][:length] if value else ''
+
+
+def memory_usage():
+    """
+    Returns the number of characters held by all registers as an
+    ``(in_memory, on_disk)`` tuple. Payloads shared by several registers are
+    only counted once.
+    """
+    seen = set()
+    in_memory = on_disk = 0
+    for value in itertools.chain(_REGISTER_DATA.values(), _NUMBERED_REGISTERS.values()):
+        if not isinstance(value, RegisterValue):
+            in_memory += sum(len(v) for v in value or ())
+            continue
+        for payload in value.payloads:
+            if id(payload) in seen:
+                continue
+            seen.add(id(payload))
+            if payload.spilled:
+                on_disk += payload.size
+            else:
+                in_memory += payload.size
+    return (in_memory, on_disk)
+
+
 # todo(guillermooo): Subclass dict properly.
 class Registers(object):
     """
@@ -72,24 +378,32 @@ class Registers(object):
         # This ensures that we can easiy access the active view.
         # return Registers(instance.view, instance.settings)
 
-    def _set_default_register(self, values):
-        assert isinstance(values, list)
+    def _spill_threshold(self):
+        threshold = self.settings.view['vintageous_register_spill_threshold']
+        if threshold is None:
+            return DEFAULT_SPILL_THRESHOLD
+        return threshold
+
+    def _to_value(self, values):
+        if isinstance(values, RegisterValue):
+            return values
+        assert isinstance(values, list), "Register values must be inside a list."
         # Coerce all values into strings.
-        values = [str(v) for v in values]
+        return RegisterValue.from_strings([str(v) for v in values], self._spill_threshold())
+
+    def _set_default_register(self, values):
+        _restore()
         # todo(guillermo): could be made a decorator.
-        _REGISTER_DATA[REG_UNNAMED] = values
+        _REGISTER_DATA[REG_UNNAMED] = self._to_value(values)
+        _save(REG_UNNAMED, _REGISTER_DATA[REG_UNNAMED])
 
     def _maybe_set_sys_clipboard(self, name, value):
         # We actually need to check whether the option is set to a bool; could
         # be any JSON type.
         if (name in REG_SYS_CLIPBOARD_ALL or
             self.settings.view['vintageous_use_sys_clipboard'] == True):
-                # Make sure Sublime Text does the right thing in the presence of multiple
-                # selections.
-                if len(value) > 1:
-                    self.view.run_command('copy')
-                else:
-                    sublime.set_clipboard(value[0])
+                # Join multiple selections like Sublime Text's copy command does.
+                clipboard.set_clipboard('\n'.join(value))
 
     def set(self, name, values):
         """
@@ -107,9 +421,8 @@ class Registers(object):
         if name == REG_BLACK_HOLE:
             return
 
-        assert isinstance(values, list), "Register values must be inside a list."
-        # Coerce all values into strings.
-        values = [str(v) for v in values]
+        _restore()
+        values = self._to_value(values)
 
         # Special registers and invalid registers won't be set.
         if (not (name.isalpha() or name.isdigit() or
@@ -121,7 +434,11 @@ class Registers(object):
                     # raise Exception("Can only set a-z and 0-9 registers.")
                     return None
 
-        _REGISTER_DATA[name] = values
+        if is_numbered_register(name):
+            _NUMBERED_REGISTERS[int(name)] = values
+        else:
+            _REGISTER_DATA[name] = values
+        _save(name, values)
 
         if not name in (REG_EXPRESSION,):
             self._set_default_register(values)
@@ -134,10 +451,12 @@ class Registers(object):
         assert len(name) == 1, "Register names must be 1 char long."
         assert name in "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "Can only append to A-Z registers."
 
+        _restore()
         existing_values = _REGISTER_DATA.get(name.lower(), '')
         new_values = itertools.zip_longest(existing_values, suffixes, fillvalue='')
-        new_values = [(prefix + suffix) for (prefix, suffix) in new_values]
+        new_values = self._to_value([(prefix + suffix) for (prefix, suffix) in new_values])
         _REGISTER_DATA[name.lower()] = new_values
+        _save(name.lower(), new_values)
         self._set_default_register(new_values)
         self._maybe_set_sys_clipboard(name, new_values)
 
@@ -146,6 +465,8 @@ class Registers(object):
         name = str(name)
         assert len(str(name)) == 1, "Register names must be 1 char long."
 
+        _restore()
+
         # Did we request a special register?
         if name == REG_BLACK_HOLE:
             return
@@ -155,13 +476,13 @@ class Registers(object):
             except AttributeError:
                 return ''
         elif name in REG_SYS_CLIPBOARD_ALL:
-            return [sublime.get_clipboard()]
+            return [clipboard.get_clipboard()]
         elif name not in (REG_UNNAMED, REG_SMALL_DELETE) and name in REG_SPECIAL:
             return
         # Special case lumped among these --user always wants the sys
         # clipboard.
         elif name == REG_UNNAMED and self.settings.view['vintageous_use_sys_clipboard'] == True:
-            return [sublime.get_clipboard()]
+            return [clipboard.get_clipboard()]
 
         # If the expression register holds a value and we're requesting the unnamed register,
         # return the expression register and clear it aftwerwards.
@@ -170,7 +491,10 @@ class Registers(object):
             _REGISTER_DATA[REG_EXPRESSION] = ''
             return value
 
-        # We requested an [a-z0-9"] register.
+        elif is_numbered_register(name):
+            return _NUMBERED_REGISTERS[int(name)]
+
+        # We requested an [a-z0"] register.
         try:
             # In Vim, "A and "a seem to be synonyms, so accept either.
             return _REGISTER_DATA[name.lower()]
@@ -179,18 +503,32 @@ class Registers(object):
             pass
 
     def yank(self, vi_cmd_data):
+        # The selected text is only read once, and all registers populated here share it.
+        value = None
+
         # Populate registers if we have to.
         if vi_cmd_data['can_yank']:
+            fragments = self.get_selected_text(vi_cmd_data)
+            value = self._to_value(fragments)
             if vi_cmd_data['register']:
-                self[vi_cmd_data['register']] = self.get_selected_text(vi_cmd_data)
+                self[vi_cmd_data['register']] = value
             else:
-                self[REG_UNNAMED] = self.get_selected_text(vi_cmd_data)
+                self[REG_UNNAMED] = value
+                # Like Vim, "0 holds the latest yank and "1-"9 the latest deletes spanning lines.
+                if vi_cmd_data.get('is_yank'):
+                    _REGISTER_DATA[REG_VALID_NUMBERS[0]] = value
+                    _save(REG_VALID_NUMBERS[0], value)
+                elif (vi_cmd_data.get('yanks_linewise') or
+                      any('\n' in f for f in fragments)):
+                        _push_numbered(value)
 
         # # XXX: Small register delete. Improve this implementation.
         if vi_cmd_data['populates_small_delete_register']:
             is_same_line = lambda r: self.view.line(r.begin()) == self.view.line(r.end() - 1)
             if all(is_same_line(x) for x in list(self.view.sel())):
-                self[REG_SMALL_DELETE] = self.get_selected_text(vi_cmd_data)
+                if value is None:
+                    value = self._to_value(self.get_selected_text(vi_cmd_data))
+                self[REG_SMALL_DELETE] = value
 
     def get_selected_text(self, vi_cmd_data):
         """Inspect settings and populate registers as needed.
@@ -1,9 +1,13 @@
 import sublime
 import sublime_plugin
 
-import re
-
 from Vintageous.state import VintageState
+from Vintageous.vi import hlsearch
+from Vintageous.vi.lines import get_line_index
+from Vintageous.vi.patterns import ENGINE_SUBLIME
+from Vintageous.vi.patterns import escape
+from Vintageous.vi.patterns import get_pattern
+from Vintageous.vi.patterns import uses_vim_syntax
 
 
 def find_in_range(view, term, start, end, flags=0):
@@ -75,22 +79,23 @@ def reverse_search(view, term, start, end, flags=0):
     if start < 0 or end > view.size():
         return None
 
-    lo_line = view.full_line(start)
-    hi_line = view.full_line(end)
+    lines = get_line_index(view)
+    lo_line = lines.full_line(start)
+    hi_line = lines.full_line(end)
 
     while True:
-        low_row, hi_row = view.rowcol(lo_line.a)[0], view.rowcol(hi_line.a)[0]
+        low_row, hi_row = lines.row(lo_line.a), lines.row(hi_line.a)
         middle_row = (low_row + hi_row) // 2
 
-        middle_line = view.full_line(view.text_point(middle_row, 0))
+        middle_line = lines.full_line(lines.text_point(middle_row, 0))
 
         lo_region = sublime.Region(lo_line.a, middle_line.b)
         hi_region = sublime.Region(middle_line.b, min(hi_line.b, end))
 
         if find_in_range(view, term, hi_region.a, hi_region.b, flags):
-            lo_line = view.full_line(middle_line.b)
+            lo_line = lines.full_line(middle_line.b)
         elif find_in_range(view, term, lo_region.a, lo_region.b, flags):
-            hi_line = view.full_line(middle_line.a)
+            hi_line = lines.full_line(middle_line.a)
         else:
             return None
 
@@ -109,22 +114,23 @@ def reverse_search_by_pt(view, term, start, end, flags=0):
     if start < 0 or end > view.size():
         return None
 
-    lo_line = view.full_line(start)
-    hi_line = view.full_line(end)
+    lines = get_line_index(view)
+    lo_line = lines.full_line(start)
+    hi_line = lines.full_line(end)
 
     while True:
-        low_row, hi_row = view.rowcol(lo_line.a)[0], view.rowcol(hi_line.a)[0]
+        low_row, hi_row = lines.row(lo_line.a), lines.row(hi_line.a)
         middle_row = (low_row + hi_row) // 2
 
-        middle_line = view.full_line(view.text_point(middle_row, 0))
+        middle_line = lines.full_line(lines.text_point(middle_row, 0))
 
         lo_region = sublime.Region(lo_line.a, middle_line.b)
         hi_region = sublime.Region(middle_line.b, min(hi_line.b, end))
 
         if find_in_range(view, term, hi_region.a, hi_region.b, flags):
-            lo_line = view.full_line(middle_line.b)
+            lo_line = lines.full_line(middle_line.b)
         elif find_in_range(view, term, lo_region.a, lo_region.b, flags):
-            hi_line = view.full_line(middle_line.a)
+            hi_line = lines.full_line(middle_line.a)
         else:
             return None
 
@@ -152,19 +158,20 @@ class BufferSearchBase(sublime_plugin.TextCommand):
     def build_pattern(self, query):
         return query
 
-    def hilite(self, query):
-        flags = self.calculate_flags()
-        regs = self.view.find_all(self.build_pattern(query), flags)
-
-        if not regs:
-            self.view.erase_regions('vi_search')
-            return
+    def search_pattern(self, query):
+        """Returns the term and flags to search the buffer for `query` with.
+        """
+        return get_pattern(self.build_pattern(query), self.calculate_flags(), ENGINE_SUBLIME,
+                           uses_vim_syntax(self.view))
 
+    def hilite(self, query):
         if VintageState(self.view).settings.vi['hlsearch'] == False:
+            hlsearch.clear(self.view)
             return
 
-        self.view.add_regions('vi_search', regs, 'comment', '',
-                              sublime.DRAW_NO_FILL)
+        # Matches on screen are highlighted right away; the rest are found in the background.
+        term, flags = self.search_pattern(query)
+        hlsearch.highlight(self.view, term, flags)
 
 
 # TODO: Test me.
@@ -183,4 +190,4 @@ class ExactWordBufferSearchBase(BufferSearchBase):
         return query
 
     def build_pattern(self, query):
-        return r'\b{0}\b'.format(re.escape(query))
+        return r'\b{0}\b'.format(escape(query))
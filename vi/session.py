@@ -0,0 +1,238 @@
+"""Vintageous state kept across sessions, like Vim's viminfo file.
+
+   Every change is appended to the session file as a JSON record of the form
+   [kind, key, value], where a `null` value removes the key. The latest record for a key wins.
+   Once most records in the file are out of date, the file is rewritten with the live ones only.
+
+   Changes are written in the background after a short delay, and only the latest change to each
+   key is written, so bursts of changes cost a single write off the UI thread.
+
+   Nothing is read at startup. The session file is loaded the first time any state is requested.
+"""
+
+import json
+import os
+import threading
+
+import sublime
+
+
+FILE_NAME = 'Vintageous.session'
+
+# The session file is compacted when it holds this many times more records than live entries...
+COMPACT_RATIO = 4
+# ...and at least this many records.
+MIN_RECORDS_TO_COMPACT = 512
+
+# Milliseconds to wait for more changes before writing them.
+DELAY = 2000
+
+# Kind -> {key: value}, or None if the session file hasn't been read yet.
+_data = None
+# Number of records in the session file.
+_records = 0
+# (kind, key) -> value for changes not written yet.
+_pending = {}
+# Whether a write is scheduled.
+_scheduled = False
+# Guards the state above, which the write in the background shares with the UI thread.
+_lock = threading.Lock()
+# Held while writing to the session file. Never taken while holding _lock.
+_write_lock = threading.RLock()
+
+
+def enabled():
+    prefs = sublime.load_settings('Preferences.sublime-settings')
+    return prefs.get('vintageous_persist_session') == True
+
+
+def _path():
+    return os.path.join(sublime.cache_path(), 'Vintageous', FILE_NAME)
+
+
+def _apply(data, kind, key, value):
+    if value is None:
+        data.get(kind, {}).pop(key, None)
+    else:
+        data.setdefault(kind, {})[key] = value
+
+
+def _load():
+    global _data, _records
+    with _lock:
+        if _data is not None:
+            return _data
+
+        data = {}
+        records = 0
+        try:
+            with open(_path(), encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        kind, key, value = json.loads(line)
+                    except ValueError:
+                        # Probably a record cut short by a crash.
+                        continue
+                    _apply(data, kind, key, value)
+                    records += 1
+        except IOError:
+            pass
+        _data = data
+        _records = records
+        return _data
+
+
+def _dump(record):
+    return json.dumps(record, separators=(',', ':')) + '\n'
+
+
+def get(kind):
+    """Returns the saved entries of the given kind as a dictionary. Don't modify it; use `put()`
+       instead.
+    """
+    if not enabled():
+        return {}
+    return _load().get(kind, {})
+
+
+def put(kind, key, value):
+    """Saves `value` under `key`. Values must be JSON-serializable and must not be modified
+       afterwards. A `None` value removes `key`.
+    """
+    global _scheduled
+    if not enabled():
+        return
+
+    data = _load()
+    with _lock:
+        _apply(data, kind, key, value)
+        _pending[(kind, key)] = value
+        if _scheduled:
+            return
+        _scheduled = True
+    sublime.set_timeout_async(flush, DELAY)
+
+
+def flush():
+    """Writes any pending changes to the session file right away.
+    """
+    global _pending, _scheduled, _records
+    with _write_lock:
+        with _lock:
+            pending, _pending = _pending, {}
+            _scheduled = False
+        if not pending:
+            return
+
+        path = _path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.writelines(_dump([kind, key, value])
+                             for ((kind, key), value) in pending.items())
+        except IOError:
+            return
+
+        with _lock:
+            _records += len(pending)
+            if _data is None:
+                return
+            live = sum(len(entries) for entries in _data.values())
+            if not (_records >= MIN_RECORDS_TO_COMPACT and _records > live * COMPACT_RATIO):
+                return
+        compact()
+
+
+def compact():
+    """Rewrites the session file so that it only holds live entries, pending changes included.
+    """
+    global _records
+    data = _load()
+    with _write_lock:
+        with _lock:
+            records = [[kind, key, value] for (kind, entries) in sorted(data.items())
+                                          for (key, value) in sorted(entries.items())]
+            _pending.clear()
+
+        path = _path()
+        try:
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                f.writelines(_dump(record) for record in records)
+            os.replace(path + '.tmp', path)
+        except (IOError, OSError):
+            return
+
+        with _lock:
+            _records = len(records)
+
+
+def forget():
+    """Writes any pending changes and drops the state read from the session file, so that it's
+       read again when needed.
+    """
+    global _data, _records
+    flush()
+    with _lock:
+        _data = None
+        _records = 0
+
+
+class PersistentDict(dict):
+    """A dictionary whose items are saved to the session file under `kind`. Saved items are only
+       restored the first time the dictionary is used. Values must be replaced, not modified in
+       place, for changes to be saved.
+    """
+
+    def __init__(self, kind, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.kind = kind
+        self._restored = False
+
+    def _restore(self):
+        if self._restored or not enabled():
+            return
+        self._restored = True
+        for (key, value) in get(self.kind).items():
+            dict.__setitem__(self, key, value)
+
+    def __getitem__(self, key):
+        self._restore()
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        self._restore()
+        dict.__setitem__(self, key, value)
+        put(self.kind, key, value)
+
+    def __delitem__(self, key):
+        self._restore()
+        dict.__delitem__(self, key)
+        put(self.kind, key, None)
+
+    def __contains__(self, key):
+        self._restore()
+        return dict.__contains__(self, key)
+
+    def __iter__(self):
+        self._restore()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._restore()
+        return dict.__len__(self)
+
+    def get(self, key, default=None):
+        self._restore()
+        return dict.get(self, key, default)
+
+    def keys(self):
+        self._restore()
+        return dict.keys(self)
+
+    def values(self):
+        self._restore()
+        return dict.values(self)
+
+    def items(self):
+        self._restore()
+        return dict.items(self)
@@ -1,6 +1,7 @@
 import sublime
 
 import collections
+import itertools
 import json
 
 vi_user_setting = collections.namedtuple('vi_editor_setting', 'scope values default parser action noable')
@@ -155,23 +156,100 @@ class SublimeSettings(object):
         self.view.settings().set(key, value)
 
 
+# In-process copies of the 'vintage' settings dicts, keyed by ('view'|'window', id).
+#
+# View.settings().get() and .set() copy and serialize the whole dict on every call, and a single
+# keystroke reads and writes dozens of keys. Instead, VintageSettings works on these copies, which
+# are written back to Sublime Text by flush_vintage_settings() once a command has finished or the
+# view has been deactivated.
+_VINTAGE_CACHE = {}
+# Every write to a cached dict gets a new revision from here, so consumers can tell whether the
+# state has changed since they last looked at it (see vi/contexts.py).
+_REVISIONS = itertools.count()
+
+
+class _CachedSettings(object):
+    """In-process copy of the 'vintage' dict stored in a view's or window's settings.
+    """
+    __slots__ = ('target', 'data', 'dirty', 'revision')
+
+    def __init__(self, target):
+        self.target = target
+        self.data = target.settings().get('vintage')
+        self.dirty = False
+        self.revision = next(_REVISIONS)
+        if not isinstance(self.data, dict):
+            self.data = {}
+            target.settings().set('vintage', {})
+
+    def flush(self):
+        if self.dirty:
+            self.target.settings().set('vintage', self.data)
+            self.dirty = False
+
+
+def _cached_settings(kind, target):
+    key = (kind, target.id())
+    try:
+        return _VINTAGE_CACHE[key]
+    except KeyError:
+        cached = _VINTAGE_CACHE[key] = _CachedSettings(target)
+        return cached
+
+
+def flush_vintage_settings(view):
+    """Writes back to Sublime Text any pending changes to `view`'s (and its window's) state.
+    """
+    cached = _VINTAGE_CACHE.get(('view', view.id()))
+    if cached:
+        cached.flush()
+
+    window = view.window()
+    if window is not None:
+        cached = _VINTAGE_CACHE.get(('window', window.id()))
+        if cached:
+            cached.flush()
+
+
+def vintage_settings_revision(view):
+    """Returns a number that changes every time `view`'s Vintageous state changes.
+    """
+    return _cached_settings('view', view).revision
+
+
+def drop_vintage_settings(view):
+    """Discards the in-process state for `view`. Call this after modifying the 'vintage' setting
+       directly through the Sublime Text API.
+    """
+    _VINTAGE_CACHE.pop(('view', view.id()), None)
+    window = view.window()
+    if window is not None:
+        _VINTAGE_CACHE.pop(('window', window.id()), None)
+
+
+def drop_all_vintage_settings():
+    _VINTAGE_CACHE.clear()
+
+
 class VintageSettings(object):
     """ Helper class for accessing settings related to Vintage. """
 
     def __init__(self, view=None):
         self.view = view
 
-        if view is not None and not isinstance(self.view.settings().get('vintage'), dict):
-            self.view.settings().set('vintage', dict())
-
-        if view is not None and view.window() is not None and not isinstance(self.view.window().settings().get('vintage'), dict):
-            self.view.window().settings().set('vintage', dict())
+        if view is not None:
+            self._view_cache = _cached_settings('view', view)
 
     def __get__(self, instance, owner):
         if instance is not None:
             return VintageSettings(instance.v)
         return VintageSettings()
 
+    def _cache_for(self, key):
+        if key not in WINDOW_SETTINGS:
+            return self._view_cache
+        return _cached_settings('window', self.view.window())
+
     def __getitem__(self, key):
 
         # Vi editor options.
@@ -180,22 +258,16 @@ class VintageSettings(object):
 
         # Vintageous settings.
         try:
-            if key not in WINDOW_SETTINGS:
-                value = self.view.settings().get('vintage').get(key)
-            else:
-                value = self.view.window().settings().get('vintage').get(key)
+            value = self._cache_for(key).data.get(key)
         except (KeyError, AttributeError):
             value = None
         return value
 
     def __setitem__(self, key, value):
-        if key not in WINDOW_SETTINGS:
-            setts, target = self.view.settings().get('vintage'), self.view
-        else:
-            setts, target = self.view.window().settings().get('vintage'), self.view.window()
-
-        setts[key] = value
-        target.settings().set('vintage', setts)
+        cached = self._cache_for(key)
+        cached.data[key] = value
+        cached.dirty = True
+        cached.revision = next(_REVISIONS)
 
 
 # TODO: Make this a descriptor; avoid instantiation.
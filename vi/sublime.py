@@ -2,15 +2,15 @@
 
 from contextlib import contextmanager
 
+from Vintageous.vi.constants import replace_sels
+
 
 @contextmanager
 def restoring_sels(view):
     old_sels = list(view.sel())
     yield
-    view.sel().clear()
-    for s in old_sels:
-        # XXX: If the buffer has changed in the meantime, this won't work well.
-        view.sel().add(s)
+    # XXX: If the buffer has changed in the meantime, this won't work well.
+    replace_sels(view, old_sels)
 
 
 def has_dirty_buffers(window):
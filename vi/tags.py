@@ -0,0 +1,121 @@
+"""Per-view index of HTML/XML elements.
+
+   Tags are tokenized in a single pass over the buffer and paired up into a tree of element
+   spans, so the tag text objects become lookups. An index is valid while the view's change count
+   stays the same.
+"""
+
+import re
+
+from bisect import bisect_right
+
+import sublime
+
+
+_TAG_RX = re.compile(r'''
+    <!--.*?-->                      # comment
+    | <!\[CDATA\[.*?\]\]>           # cdata section
+    | <[!?][^>]*>                   # doctype, processing instruction
+    | <(?P<closing>/?)
+       (?P<name>[A-Za-z][^\s/>]*)
+       (?:[^>"']|"[^"]*"|'[^']*')*?
+       (?P<empty>/?)>
+    ''', re.DOTALL | re.VERBOSE)
+
+# The content of these elements isn't markup.
+RAW_TEXT_ELEMENTS = ('script', 'style')
+
+_TAG_INDEXES = {}
+
+
+class TagIndex(object):
+    """Element spans for a buffer snapshot, in document order. For each element, `starts` and
+       `ends` hold the bounds of the whole element and `inner_starts` and `inner_ends` the bounds
+       of its content. Elements never closed have `None` as their end.
+    """
+    __slots__ = ('change_count', 'starts', 'inner_starts', 'inner_ends', 'ends', 'parents')
+
+    def __init__(self, view):
+        self.change_count = view.change_count()
+        self.starts = []
+        self.inner_starts = []
+        self.inner_ends = []
+        self.ends = []
+        # Index of the element each element was opened in, or None.
+        self.parents = []
+
+        text = view.substr(sublime.Region(0, view.size()))
+        names = []
+        stack = []
+        pt = 0
+
+        while True:
+            match = _TAG_RX.search(text, pt)
+            if not match:
+                break
+            pt = match.end()
+
+            name = match.group('name')
+            if not name or match.group('empty'):
+                continue
+            name = name.lower()
+
+            if not match.group('closing'):
+                self.parents.append(stack[-1] if stack else None)
+                stack.append(len(self.starts))
+                names.append(name)
+                self.starts.append(match.start())
+                self.inner_starts.append(match.end())
+                self.inner_ends.append(None)
+                self.ends.append(None)
+
+                if name in RAW_TEXT_ELEMENTS:
+                    closing = re.compile('</' + name + r'\b', re.IGNORECASE).search(text, pt)
+                    if closing:
+                        pt = closing.start()
+                continue
+
+            # Closing a tag implicitly closes any elements left open inside it, like <p> or <br>
+            # in HTML. Closing tags that don't match any open element are ignored.
+            for i in range(len(stack) - 1, -1, -1):
+                if names[stack[i]] == name:
+                    element = stack[i]
+                    del stack[i:]
+                    self.inner_ends[element] = match.start()
+                    self.ends[element] = match.end()
+                    break
+
+    def element(self, pt, count=1):
+        """Returns the index of the `count`th innermost element around `pt`, or `None`. Tags at
+           `pt` count as being part of their element.
+        """
+        element = bisect_right(self.starts, pt) - 1
+        if element < 0:
+            return
+
+        while element is not None:
+            end = self.ends[element]
+            if end is not None and end > pt:
+                count -= 1
+                if count == 0:
+                    return element
+            element = self.parents[element]
+
+    def outer(self, element):
+        return sublime.Region(self.starts[element], self.ends[element])
+
+    def inner(self, element):
+        return sublime.Region(self.inner_starts[element], self.inner_ends[element])
+
+
+def get_tag_index(view):
+    """Returns the tag index for `view`, rebuilding it if the buffer has changed.
+    """
+    index = _TAG_INDEXES.get(view.id())
+    if index is None or index.change_count != view.change_count():
+        index = _TAG_INDEXES[view.id()] = TagIndex(view)
+    return index
+
+
+def drop_tag_index(view):
+    _TAG_INDEXES.pop(view.id(), None)
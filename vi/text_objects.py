@@ -7,9 +7,11 @@ from sublime import CLASS_PUNCTUATION_END
 from sublime import CLASS_LINE_END
 from sublime import CLASS_LINE_START
 
-from Vintageous.vi.search import reverse_search_by_pt
-from Vintageous.vi.search import find_in_range
 from Vintageous.vi import units
+from Vintageous.vi.boundaries import get_boundary_index
+from Vintageous.vi.brackets import get_bracket_index
+from Vintageous.vi.quotes import find_quote_pair
+from Vintageous.vi.tags import get_tag_index
 
 
 ANCHOR_NEXT_WORD_BOUNDARY = CLASS_WORD_START | CLASS_PUNCTUATION_START | CLASS_LINE_END
@@ -30,12 +32,12 @@ PAIRS = {
     '"': (('"', '"'), QUOTE),
     "'": (("'", "'"), QUOTE),
     '`': (('`', '`'), QUOTE),
-    '(': (('\\(', '\\)'), BRACKET),
-    ')': (('\\(', '\\)'), BRACKET),
-    '[': (('\\[', '\\]'), BRACKET),
-    ']': (('\\[', '\\]'), BRACKET),
-    '{': (('\\{', '\\}'), BRACKET),
-    '}': (('\\{', '\\}'), BRACKET),
+    '(': (('(', ')'), BRACKET),
+    ')': (('(', ')'), BRACKET),
+    '[': (('[', ']'), BRACKET),
+    ']': (('[', ']'), BRACKET),
+    '{': (('{', '}'), BRACKET),
+    '}': (('{', '}'), BRACKET),
     't': (None, TAG),
     'w': (None, WORD),
     'W': (None, BIG_WORD),
@@ -187,40 +189,30 @@ def get_text_object_region(view, s, text_object, inclusive=False, count=1):
         return s
 
     if type_ == TAG:
-        return find_tag_text_object(view, s, inclusive)
+        return find_tag_text_object(view, s, inclusive, count)
 
     if type_ == BRACKET:
-        opening = find_prev_lone_bracket(view, s.b, delims)
-        closing = find_next_lone_bracket(view, s.b, delims)
+        pair = get_bracket_index(view).enclosing(s.b, delims[0])
 
-        if not (opening and closing):
+        if not pair:
             return s
 
+        opening, closing = pair
         if inclusive:
-            return sublime.Region(opening.a, closing.b)
-        return sublime.Region(opening.a + 1, closing.b - 1)
+            return sublime.Region(opening, closing + 1)
+        return sublime.Region(opening + 1, closing)
 
     if type_ == QUOTE:
         # Vim only operates on the current line.
-        line = view.line(s)
-        # FIXME: Escape sequences like \" are probably syntax-dependant.
-        prev_quote = reverse_search_by_pt(view, '(?<!\\\\)' + delims[0],
-                                          start=line.a, end=s.b)
+        pair = find_quote_pair(view, s.b, delims[0])
 
-        next_quote = find_in_range(view, '(?<!\\\\)' + delims[0],
-                                   start=s.b, end=line.b)
-
-        if next_quote and not prev_quote:
-            prev_quote = next_quote
-            next_quote = find_in_range(view, '(?<!\\\\)' + delims[0],
-                                       start=prev_quote.b, end=line.b)
-
-        if not (prev_quote and next_quote):
+        if not pair:
             return s
 
+        opening, closing = pair
         if inclusive:
-            return sublime.Region(prev_quote.a, next_quote.b)
-        return sublime.Region(prev_quote.a + 1, next_quote.b - 1)
+            return sublime.Region(opening, closing + 1)
+        return sublime.Region(opening + 1, closing)
 
     if type_ == WORD:
         w = a_word(view, s.b, inclusive=inclusive, count=count)
@@ -235,120 +227,37 @@ def get_text_object_region(view, s, text_object, inclusive=False, count=1):
         return w
 
     if type_ == SENTENCE:
-        # FIXME: This doesn't work well.
-        # TODO: Improve this.
-        sentence_start = view.find_by_class(s.b,
-                                            forward=False,
-                                            classes=sublime.CLASS_EMPTY_LINE)
-        sentence_start_2 = reverse_search_by_pt(view, "[.?!:]\s+|[.?!:]$",
-                                              start=0,
-                                              end=s.b)
-        if sentence_start_2:
-            sentence_start = sentence_start + 1 if sentence_start > sentence_start_2.b else sentence_start_2.b
-        else:
-            sentence_start = sentence_start + 1
-        sentence_end = find_in_range(view, "[.?!:)](?=\s)|[.?!:)]$",
-                                     start=s.b,
-                                     end=view.size())
-
-        if not (sentence_end):
-            return s
+        boundaries = get_boundary_index(view)
+        sentence_start = boundaries.previous_sentence(s.b + 1)
+        if sentence_start is None:
+            sentence_start = 0
+        sentence_end = boundaries.next_sentence(s.b)
+        if sentence_end is None:
+            sentence_end = view.size()
 
         if inclusive:
-            return sublime.Region(sentence_start, sentence_end.b)
-        else:
-            return sublime.Region(sentence_start, sentence_end.b)
+            return sublime.Region(sentence_start, sentence_end)
 
+        # Leave out the white space separating this sentence from the next one.
+        text = view.substr(sublime.Region(sentence_start, sentence_end))
+        return sublime.Region(sentence_start, sentence_start + len(text.rstrip(' \t\n')))
 
     return s
 
 
-def find_tag_text_object(view, s, inclusive=False):
+def find_tag_text_object(view, s, inclusive=False, count=1):
 
     if (view.score_selector(s.b, 'text.html') == 0 and
         view.score_selector(s.b, 'text.xml') == 0):
             # TODO: What happens with other xml formats?
             return s
 
-    end_tag_patt = "</(.+?)>"
-    begin_tag_patt = "<{0}(\s+.*?)?>"
+    index = get_tag_index(view)
+    element = index.element(s.b, count)
 
-    closing_tag = view.find(end_tag_patt, s.b, sublime.IGNORECASE)
-
-    if not closing_tag:
-        return s
-
-    begin_tag_patt = begin_tag_patt.format(view.substr(closing_tag)[2:-1])
-
-    begin_tag = find_prev_lone_bracket(view, closing_tag.a, (begin_tag_patt, view.substr(closing_tag)))
-
-    if not begin_tag:
+    if element is None:
         return s
 
     if not inclusive:
-        return sublime.Region(begin_tag.b, closing_tag.a)
-    return sublime.Region(begin_tag.a, closing_tag.b)
-
-
-def find_next_lone_bracket(view, start, items, unbalanced=0):
-    # TODO: Extract common functionality from here and the % motion instead of duplicating code.
-    new_start = start
-    for i in range(unbalanced or 1):
-        next_closing_bracket = find_in_range(view, items[1],
-                                                  start=start,
-                                                  end=view.size(),
-                                                  flags=sublime.IGNORECASE)
-        if next_closing_bracket is None:
-            # Unbalanced items; nothing we can do.
-            return
-        new_start = next_closing_bracket.end()
-
-    nested = 0
-    while True:
-        next_opening_bracket = find_in_range(view, items[0],
-                                              start=start,
-                                              end=next_closing_bracket.b,
-                                              flags=sublime.IGNORECASE)
-        if not next_opening_bracket:
-            break
-        nested += 1
-        start = next_opening_bracket.end()
-
-    if nested > 0:
-        return find_next_lone_bracket(view, next_closing_bracket.end(),
-                                                  items,
-                                                  nested)
-    else:
-        return next_closing_bracket
-
-
-def find_prev_lone_bracket(view, start, tags, unbalanced=0):
-    # TODO: Extract common functionality from here and the % motion instead of duplicating code.
-    new_start = start
-    for i in range(unbalanced or 1):
-        prev_opening_bracket = reverse_search_by_pt(view, tags[0],
-                                                  start=0,
-                                                  end=new_start,
-                                                  flags=sublime.IGNORECASE)
-        if prev_opening_bracket is None:
-            # Unbalanced tags; nothing we can do.
-            return
-        new_start = prev_opening_bracket.begin()
-
-    nested = 0
-    while True:
-        next_closing_bracket = reverse_search_by_pt(view, tags[1],
-                                              start=prev_opening_bracket.a,
-                                              end=start,
-                                              flags=sublime.IGNORECASE)
-        if not next_closing_bracket:
-            break
-        nested += 1
-        start = next_closing_bracket.begin()
-
-    if nested > 0:
-        return find_prev_lone_bracket(view, prev_opening_bracket.begin(),
-                                                  tags,
-                                                  nested)
-    else:
-        return prev_opening_bracket
+        return index.inner(element)
+    return index.outer(element)
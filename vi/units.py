@@ -8,6 +8,7 @@ from sublime import CLASS_LINE_START
 
 
 from Vintageous.vi.utils import next_non_white_space_char
+from Vintageous.vi.words import get_word_snapshot
 
 import re
 
@@ -53,6 +54,7 @@ def at_word(view, pt):
 
 
 def skip_word(view, pt):
+    view = get_word_snapshot(view)
     while True:
         if at_punctuation(view, pt):
             pt = view.find_by_class(pt, forward=True, classes=CLASS_PUNCTUATION_END)
@@ -64,6 +66,7 @@ def skip_word(view, pt):
 
 
 def next_word_start(view, start, internal=False):
+    view = get_word_snapshot(view)
     classes = CLASS_VI_WORD_START if not internal else CLASS_VI_INTERNAL_WORD_START
     pt = view.find_by_class(start, forward=True, classes=classes)
     if internal and at_eol(view, pt):
@@ -73,6 +76,7 @@ def next_word_start(view, start, internal=False):
 
 
 def next_big_word_start(view, start, internal=False):
+    view = get_word_snapshot(view)
     classes = CLASS_VI_WORD_START if not internal else CLASS_VI_INTERNAL_WORD_START
     pt = skip_word(view, start)
     seps = ''
@@ -83,6 +87,7 @@ def next_big_word_start(view, start, internal=False):
 
 
 def next_word_end(view, start, internal=False):
+    view = get_word_snapshot(view)
     classes = CLASS_VI_WORD_END if not internal else CLASS_VI_INTERNAL_WORD_END
     pt = view.find_by_class(start, forward=True, classes=classes)
     if internal and at_eol(view, pt):
@@ -95,6 +100,8 @@ def word_starts(view, start, count=1, internal=False):
     assert start >= 0
     assert count > 0
 
+    view = get_word_snapshot(view)
+
     pt = start
     for i in range(count):
         # On the last motion iteration, we must do some special stuff if we are still on the
@@ -126,6 +133,8 @@ def big_word_starts(view, start, count=1, internal=False):
     assert start >= 0
     assert count > 0
 
+    view = get_word_snapshot(view)
+
     pt = start
     for i in range(count):
         if internal and i == count - 1 and view.line(start) == view.line(pt):
@@ -154,6 +163,8 @@ def word_ends(view, start, count=1, internal=False):
     assert start >= 0
     assert count > 0
 
+    view = get_word_snapshot(view)
+
     pt = start
 
     for i in range(count):
@@ -0,0 +1,308 @@
+"""Word segmentation in Python over a snapshot of the buffer.
+
+   WordSnapshot implements the parts of the View API that word motions need (.classify(),
+   .find_by_class(), .substr(), .line(), .full_line() and .size()). It fetches a window of text
+   once and widens it on demand, so that counted motions or many carets don't call into Sublime
+   Text for every character. Carets far apart get windows of their own. A snapshot is valid while
+   the view's change count stays the same.
+"""
+
+import re
+
+import sublime
+
+from sublime import CLASS_WORD_START
+from sublime import CLASS_WORD_END
+from sublime import CLASS_PUNCTUATION_START
+from sublime import CLASS_PUNCTUATION_END
+from sublime import CLASS_LINE_START
+from sublime import CLASS_LINE_END
+from sublime import CLASS_EMPTY_LINE
+
+
+# Characters fetched around the first point looked at. The window doubles as needed.
+WINDOW_SIZE = 4096
+
+# Characters are mapped to these before searching for boundaries. Anything else is a word char.
+_PUNCTUATION = '\x01'
+_SPACE = '\x02'
+_EOL = '\x03'
+
+_WORD = '[^\x01\x02\x03]'
+
+# Zero-width patterns matching the boundaries between two character classes.
+_BOUNDARIES = (
+    (CLASS_WORD_START, '(?<!{0})(?={0})'.format(_WORD)),
+    (CLASS_WORD_END, '(?<={0})(?!{0})'.format(_WORD)),
+    (CLASS_PUNCTUATION_START, '(?<!\x01)(?=\x01)'),
+    (CLASS_PUNCTUATION_END, '(?<=\x01)(?!\x01)'),
+    (CLASS_LINE_START, '(?<![^\x03])'),
+    (CLASS_LINE_END, '(?![^\x03])'),
+    (CLASS_EMPTY_LINE, '(?<![^\x03])(?![^\x03])'),
+)
+
+SUPPORTED_CLASSES = 0
+for flag, pattern in _BOUNDARIES:
+    SUPPORTED_CLASSES |= flag
+del flag, pattern
+
+# Separators -> translation table.
+_TABLES = {}
+# Classes -> compiled pattern.
+_PATTERNS = {}
+
+_SNAPSHOTS = {}
+
+
+def _table(separators):
+    try:
+        return _TABLES[separators]
+    except KeyError:
+        table = {ord(_PUNCTUATION): 'w', ord(_SPACE): 'w', ord(_EOL): 'w'}
+        table.update((ord(c), _PUNCTUATION) for c in separators)
+        table.update((ord(c), _SPACE) for c in ' \t\r\f\v')
+        table[ord('\n')] = _EOL
+        _TABLES[separators] = table
+        return table
+
+
+def _pattern(classes):
+    try:
+        return _PATTERNS[classes]
+    except KeyError:
+        rx = _PATTERNS[classes] = re.compile('|'.join(pattern for (flag, pattern) in _BOUNDARIES
+                                                      if classes & flag))
+        return rx
+
+
+def _classify(before, after):
+    """Returns the classes of the boundary between two mapped characters. Either can be `None`
+       at the edges of the buffer.
+    """
+    word_before = before is not None and before not in (_PUNCTUATION, _SPACE, _EOL)
+    word_after = after is not None and after not in (_PUNCTUATION, _SPACE, _EOL)
+
+    classes = 0
+    if word_after and not word_before:
+        classes |= CLASS_WORD_START
+    if word_before and not word_after:
+        classes |= CLASS_WORD_END
+    if after == _PUNCTUATION and before != _PUNCTUATION:
+        classes |= CLASS_PUNCTUATION_START
+    if before == _PUNCTUATION and after != _PUNCTUATION:
+        classes |= CLASS_PUNCTUATION_END
+    if before in (None, _EOL):
+        classes |= CLASS_LINE_START
+    if after in (None, _EOL):
+        classes |= CLASS_LINE_END
+    if before in (None, _EOL) and after in (None, _EOL):
+        classes |= CLASS_EMPTY_LINE
+    return classes
+
+
+class WordSnapshot(object):
+    __slots__ = ('view', 'change_count', 'separators', '_size', 'begin', 'end', 'text',
+                 '_mapped', '_windows')
+
+    def __init__(self, view):
+        self.view = view
+        self.change_count = view.change_count()
+        self.separators = view.settings().get('word_separators') or ''
+        self._size = view.size()
+        self.begin = self.end = 0
+        self.text = None
+        # Separators -> window text mapped to character classes.
+        self._mapped = {}
+        # All windows fetched so far as [begin, end, text, mapped] lists, sorted and apart from
+        # each other. The current window is one of them.
+        self._windows = []
+
+    def _use(self, window):
+        self.begin, self.end, self.text, self._mapped = window
+
+    def _fetch(self, a, b):
+        """Fetches the text between `a` and `b` into a window, merged with any windows it touches,
+           and makes it the current window.
+        """
+        windows = []
+        for window in self._windows:
+            if window[0] <= b and a <= window[1]:
+                a = min(a, window[0])
+                b = max(b, window[1])
+            else:
+                windows.append(window)
+        window = [a, b, self.view.substr(sublime.Region(a, b)), {}]
+        windows.append(window)
+        windows.sort(key=lambda w: w[0])
+        self._windows = windows
+        self._use(window)
+
+    def _cover(self, a, b):
+        """Makes sure the current window holds the text between `a` and `b`.
+        """
+        a = max(0, a)
+        b = min(self._size, b)
+        if self.text is not None and self.begin <= a and b <= self.end:
+            return
+
+        touched = None
+        for window in self._windows:
+            if window[0] <= a and b <= window[1]:
+                self._use(window)
+                return
+            if touched is None and window[0] <= b and a <= window[1]:
+                touched = window
+
+        if touched is None:
+            a = max(0, a - WINDOW_SIZE // 4)
+            b = min(self._size, b + WINDOW_SIZE)
+        else:
+            begin, end = touched[0], touched[1]
+            span = max(WINDOW_SIZE, end - begin)
+            if a < begin:
+                a = max(0, min(a, begin - span))
+            if b > end:
+                b = min(self._size, max(b, end + span))
+
+        self._fetch(a, b)
+
+    def _classes(self, separators):
+        try:
+            return self._mapped[separators]
+        except KeyError:
+            mapped = self._mapped[separators] = self.text.translate(_table(separators))
+            return mapped
+
+    def _mapped_char(self, pt, separators):
+        if not (0 <= pt < self._size):
+            return
+        self._cover(pt, pt + 1)
+        return self._classes(separators)[pt - self.begin]
+
+    def size(self):
+        return self._size
+
+    def substr(self, x):
+        if isinstance(x, sublime.Region):
+            a = max(0, x.begin())
+            b = min(self._size, x.end())
+            if a >= b:
+                return ''
+            self._cover(a, b)
+            return self.text[a - self.begin:b - self.begin]
+
+        # Like the API, return a null character for points outside the buffer.
+        if not (0 <= x < self._size):
+            return '\x00'
+        self._cover(x, x + 1)
+        return self.text[x - self.begin]
+
+    def line(self, x):
+        pt = x.begin() if isinstance(x, sublime.Region) else x
+        pt = min(max(pt, 0), self._size)
+
+        self._cover(pt - 1, pt + 1)
+        while True:
+            a = self.text.rfind('\n', 0, pt - self.begin)
+            if a != -1 or self.begin == 0:
+                a += 1 + self.begin
+                break
+            self._cover(self.begin - 1, pt)
+
+        while True:
+            b = self.text.find('\n', pt - self.begin)
+            if b != -1:
+                b += self.begin
+                break
+            if self.end == self._size:
+                b = self._size
+                break
+            self._cover(pt, self.end + 1)
+
+        return sublime.Region(a, b)
+
+    def full_line(self, x):
+        line = self.line(x)
+        if line.b < self._size:
+            return sublime.Region(line.a, line.b + 1)
+        return line
+
+    def prefetch(self, regions):
+        """Fetches the text around all `regions`, with one call for each group of regions close
+           enough to share a window.
+        """
+        spans = sorted((max(0, r.begin() - 1 - WINDOW_SIZE // 4),
+                        min(self._size, r.end() + 1 + WINDOW_SIZE)) for r in regions)
+        merged = []
+        for (a, b) in spans:
+            if merged and a <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], b)
+            else:
+                merged.append([a, b])
+
+        for (a, b) in merged:
+            if not any(w[0] <= a and b <= w[1] for w in self._windows):
+                self._fetch(a, b)
+
+    def classify(self, pt):
+        pt = min(max(pt, 0), self._size)
+        return _classify(self._mapped_char(pt - 1, self.separators),
+                         self._mapped_char(pt, self.separators))
+
+    def find_by_class(self, pt, forward, classes, separators=None):
+        if classes & ~SUPPORTED_CLASSES:
+            if separators is None:
+                return self.view.find_by_class(pt, forward, classes)
+            return self.view.find_by_class(pt, forward, classes, separators)
+
+        if separators is None:
+            separators = self.separators
+
+        if forward:
+            return self._find_forward(pt + 1, classes, separators)
+        return self._find_backward(pt - 1, classes, separators)
+
+    def _find_forward(self, pt, classes, separators):
+        if pt >= self._size:
+            return self._size
+
+        pt = max(pt, 0)
+        rx = _pattern(classes)
+        self._cover(pt - 1, pt + 1)
+        while True:
+            match = rx.search(self._classes(separators), pt - self.begin)
+            # Boundaries at the end of the window depend on text not fetched yet.
+            if match and (match.start() + self.begin < self.end or self.end == self._size):
+                return match.start() + self.begin
+            if self.end == self._size:
+                return self._size
+            self._cover(pt - 1, self.end + 1)
+
+    def _find_backward(self, pt, classes, separators):
+        while pt > 0:
+            if _classify(self._mapped_char(pt - 1, separators),
+                         self._mapped_char(pt, separators)) & classes:
+                return pt
+            pt -= 1
+        return 0
+
+    def __getattr__(self, name):
+        return getattr(self.view, name)
+
+
+def get_word_snapshot(view):
+    """Returns a word snapshot for `view`, reusing the last one if the buffer hasn't changed.
+       Snapshots are passed through as they are.
+    """
+    if isinstance(view, WordSnapshot):
+        return view
+
+    snapshot = _SNAPSHOTS.get(view.id())
+    if (snapshot is None or snapshot.change_count != view.change_count() or
+        snapshot.separators != (view.settings().get('word_separators') or '')):
+            snapshot = _SNAPSHOTS[view.id()] = WordSnapshot(view)
+    return snapshot
+
+
+def drop_word_snapshot(view):
+    _SNAPSHOTS.pop(view.id(), None)